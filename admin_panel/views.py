@@ -1,5 +1,12 @@
+from sqlalchemy import inspect, select
 from starlette.requests import Request
 from starlette_admin.contrib.sqla import ModelView
+
+from bot.db.redis import (
+    bump_org_directory_version,
+    bump_task_versions,
+    bump_work_calendar_versions,
+)
 from bot.db.models.models import (
     User,
     HierarchyLevel,
@@ -14,7 +21,20 @@ from bot.db.models.models import (
 )
 
 
-class UserView(ModelView):
+class OrgDirectoryView(ModelView):
+    """Зміни користувачів, посад і рівнів ієрархії інвалідовують довідник у боті."""
+
+    async def after_create(self, request: Request, obj) -> None:
+        await bump_org_directory_version()
+
+    async def after_edit(self, request: Request, obj) -> None:
+        await bump_org_directory_version()
+
+    async def after_delete(self, request: Request, obj) -> None:
+        await bump_org_directory_version()
+
+
+class UserView(OrgDirectoryView):
     exclude_fields_from_list = [
         "work_schedules",
         "created_tasks",
@@ -32,15 +52,101 @@ class UserView(ModelView):
         return obj.full_name or obj.full_name_tg
 
 
+class WorkScheduleView(ModelView):
+    """Зміни графіків інвалідовують робочі календарі їх користувачів у боті."""
+
+    # Згенерована колонка shift (TSTZRANGE) не має конвертера в starlette-admin
+    fields = ["id", "user_id", "start_time", "end_time", "date", "user"]
+
+    async def after_create(self, request: Request, obj: WorkSchedule) -> None:
+        await bump_work_calendar_versions([obj.user_id])
+
+    async def before_edit(self, request: Request, data, obj: WorkSchedule) -> None:
+        # Графік могли передати іншому користувачу - застаріває і календар попереднього
+        request.state.work_schedule_user_ids = {
+            obj.user_id,
+            *inspect(obj).attrs.user_id.history.deleted,
+        }
+
+    async def after_edit(self, request: Request, obj: WorkSchedule) -> None:
+        await bump_work_calendar_versions(
+            {obj.user_id, *request.state.work_schedule_user_ids}
+        )
+
+    async def after_delete(self, request: Request, obj: WorkSchedule) -> None:
+        await bump_work_calendar_versions([obj.user_id])
+
+
+class TaskCacheView(ModelView):
+    """Зміни завдань, їх контрольних точок і звітів інвалідовують кеш завдань у боті."""
+
+    # Атрибут з ID завдання, до якого належить запис
+    task_id_field = "task_id"
+
+    async def task_ids(self, request: Request, obj) -> set[int]:
+        return {getattr(obj, self.task_id_field)}
+
+    async def after_create(self, request: Request, obj) -> None:
+        await bump_task_versions(await self.task_ids(request, obj))
+
+    async def before_edit(self, request: Request, data, obj) -> None:
+        # Запис могли перенести до іншого завдання - застаріває і кеш попереднього
+        request.state.task_ids = {
+            *await self.task_ids(request, obj),
+            *inspect(obj).attrs[self.task_id_field].history.deleted,
+        }
+
+    async def after_edit(self, request: Request, obj) -> None:
+        await bump_task_versions(
+            {*await self.task_ids(request, obj), *request.state.task_ids}
+        )
+
+    async def after_delete(self, request: Request, obj) -> None:
+        await bump_task_versions(await self.task_ids(request, obj))
+
+
+class TaskView(TaskCacheView):
+    task_id_field = "id"
+    # Відбиток обчислює БД, а пакет імпорту задає лише імпорт CSV:
+    # значення з форми потрапили б в INSERT/UPDATE
+    exclude_fields_from_create = ["fingerprint", "import_batch_id"]
+    exclude_fields_from_edit = ["fingerprint", "import_batch_id"]
+
+
+class TaskReportContentView(TaskCacheView):
+    """Вміст звіту пов'язаний із завданням через звіт."""
+
+    @staticmethod
+    async def report_task_ids(request: Request, report_ids) -> set[int]:
+        task_ids = await request.state.session.scalars(
+            select(TaskReport.task_id).where(TaskReport.id.in_(set(report_ids)))
+        )
+        return set(task_ids)
+
+    async def task_ids(self, request: Request, obj: TaskReportContent) -> set[int]:
+        return await self.report_task_ids(request, [obj.report_id])
+
+    async def before_edit(self, request: Request, data, obj: TaskReportContent) -> None:
+        request.state.task_ids = await self.report_task_ids(
+            request,
+            [obj.report_id, *inspect(obj).attrs.report_id.history.deleted],
+        )
+
+
+class RegularTaskView(ModelView):
+    exclude_fields_from_create = ["import_batch_id"]
+    exclude_fields_from_edit = ["import_batch_id"]
+
+
 model_views = [
     UserView(User, icon="fa fa-user"),
-    ModelView(HierarchyLevel, icon="fa fa-sitemap"),
-    ModelView(Positions, icon="fa fa-briefcase"),
-    ModelView(WorkSchedule, icon="fa fa-calendar"),
+    OrgDirectoryView(HierarchyLevel, icon="fa fa-sitemap"),
+    OrgDirectoryView(Positions, icon="fa fa-briefcase"),
+    WorkScheduleView(WorkSchedule, icon="fa fa-calendar"),
     ModelView(TaskCategory, icon="fa fa-tasks"),
-    ModelView(Task, icon="fa fa-clipboard-list"),
-    ModelView(TaskControlPoints, icon="fa fa-map-marker-alt"),
-    ModelView(TaskReport, icon="fa fa-file-alt"),
-    ModelView(TaskReportContent, icon="fa fa-file-text"),
-    ModelView(RegularTask, icon="fa fa-clock",),
+    TaskView(Task, icon="fa fa-clipboard-list"),
+    TaskCacheView(TaskControlPoints, icon="fa fa-map-marker-alt"),
+    TaskCacheView(TaskReport, icon="fa fa-file-alt"),
+    TaskReportContentView(TaskReportContent, icon="fa fa-file-text"),
+    RegularTaskView(RegularTask, icon="fa fa-clock"),
 ]
@@ -1,12 +1,12 @@
 import asyncio
 import logging
 
+import uvicorn
 from aiogram import Bot, Dispatcher, Router
 from aiogram.client.default import DefaultBotProperties
 from aiogram.fsm.storage.base import DefaultKeyBuilder
 from aiogram.fsm.storage.redis import RedisEventIsolation, RedisStorage
 from aiogram_dialog import setup_dialogs
-from aiogram_i18n.cores import FluentRuntimeCore
 from arq import create_pool
 from langchain_openai import ChatOpenAI
 
@@ -14,13 +14,16 @@ from bot.dialogs import dialog_routers
 from bot.db.base import create_all
 from bot.db.redis import redis
 from bot.handlers import routers_list
-from bot.i18n.utils.i18n_format import make_i18n_middleware
+from bot.i18n.utils.catalog import FluentCatalogCore
+from bot.i18n.utils.i18n_format import get_l10ns
 from bot.middleware.db import DbSessionMiddleware
 from bot.middleware.i18n_dialog import RedisI18nMiddleware
 from bot.middleware.log_middleware import LogMiddleware
 from bot.services.startup import on_startup
 
+from bot.utils.documents import DocumentMessageManager, RedisMediaIdStorage
 from bot.utils.set_bot_commands import set_default_commands
+from bot.webhook import WebhookServer, create_webhook_app
 from configreader import config, RedisConfig
 
 
@@ -53,9 +56,8 @@ dp = Dispatcher(storage=storage, events_isolation=event_isolation)
 router = Router(name=__name__)
 
 # I18n Settings
-core = FluentRuntimeCore(path=config.path_to_locales)
-i18n_middleware = RedisI18nMiddleware(core=core, redis=redis)
-i18n_dialog_middleware = make_i18n_middleware(config.path_to_locales)
+core = FluentCatalogCore(path=config.path_to_locales)
+i18n_middleware = RedisI18nMiddleware(core=core, redis=redis, l10ns=get_l10ns())
 
 llm = ChatOpenAI(
     # model_name="gpt-3.5-turbo",
@@ -72,29 +74,62 @@ llm = ChatOpenAI(
 
 def include_middlewares():
     dp.update.middleware(i18n_middleware)
-    dp.update.middleware(i18n_dialog_middleware)
-    dp.update.middleware(RedisI18nMiddleware(core=core, redis=redis))
     dp.update.middleware(DbSessionMiddleware())
     dp.update.middleware(LogMiddleware())
 
 
-async def main():
+ALLOWED_UPDATES = ["message", "callback_query"]
+
+
+async def setup_dispatcher():
     redis_pool = await create_pool(RedisConfig.pool_settings)
 
-    await bot.delete_webhook(drop_pending_updates=True)
     await set_default_commands(bot)
     include_middlewares()
     await core.startup()
     router.include_routers(*routers_list)
     router.include_routers(*dialog_routers)
-    setup_dialogs(dp)
+    setup_dialogs(
+        dp,
+        message_manager=DocumentMessageManager(),
+        media_id_storage=RedisMediaIdStorage(),
+    )
     dp.include_router(router)
     dp["redis"] = redis
     dp["arq"] = redis_pool
     dp["llm"] = llm
     await create_all()
     await on_startup()
-    await dp.start_polling(bot, allowed_updates=["message", "callback_query"])
+
+
+async def run_webhook():
+    webhook_config = config.webhook_config
+    app = create_webhook_app(dp, bot, webhook_config, ALLOWED_UPDATES)
+    server = WebhookServer(
+        uvicorn.Config(
+            app,
+            host=webhook_config.host,
+            port=webhook_config.port,
+            timeout_graceful_shutdown=int(webhook_config.drain_timeout),
+        ),
+        processor=app.state.update_processor,
+    )
+    await server.serve()
+    await bot.session.close()
+
+
+async def main():
+    await setup_dispatcher()
+    if config.webhook_config.enabled:
+        await run_webhook()
+        return
+    await bot.delete_webhook(drop_pending_updates=True)
+    # Той самий ліміт одночасних обробок, що і для webhook
+    await dp.start_polling(
+        bot,
+        allowed_updates=ALLOWED_UPDATES,
+        tasks_concurrency_limit=config.webhook_config.max_concurrent_updates,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""
+Скільки запитів, рядків і байтів читає кожен профіль task_loader_options.
+
+    python -m bot.db.measure_loaders --limit 50
+
+Для кожного профілю вибираються --limit останніх завдань з опціями профілю.
+Кожен SQL запит, який при цьому виконує ORM (основний і selectinload), повторюється
+як SELECT count(*), sum(pg_column_size(t.*)) FROM (<запит>) t: рядки та байти
+рахуються в Postgres, до передачі по мережі та розбору в asyncpg.
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import get_args
+
+from sqlalchemy import event, select
+
+from bot.db.base import engine
+from bot.db.models.models import Task
+from bot.db.repositories.repo import TASK_LOAD_PROFILE, task_loader_options
+from bot.utils.unitofwork import UnitOfWork
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def measure_loader_profile(
+    profile: TASK_LOAD_PROFILE, limit: int
+) -> tuple[int, int, int]:
+    """
+    :return: Кількість запитів, рядків і байтів для завантаження limit завдань.
+    """
+    statements: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, tuple(parameters or ())))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with UnitOfWork() as uow:
+            stmt = (
+                select(Task)
+                .options(*task_loader_options(profile))
+                .order_by(Task.id.desc())
+                .limit(limit)
+            )
+            res = await uow.session.execute(stmt)
+            res.unique().scalars().all()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    rows = size = 0
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        for statement, parameters in statements:
+            count, total = await raw.driver_connection.fetchrow(
+                "SELECT count(*), coalesce(sum(pg_column_size(t.*)), 0)"
+                f" FROM ({statement}) AS t",
+                *parameters,
+            )
+            rows += count
+            size += total
+    return len(statements), rows, size
+
+
+async def measure_loader_profiles(limit: int) -> None:
+    for profile in get_args(TASK_LOAD_PROFILE):
+        queries, rows, size = await measure_loader_profile(profile, limit)
+        logger.info(
+            "%-9s queries=%s rows=%s bytes=%s", profile, queries, rows, size
+        )
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rows and bytes read by each task loader profile"
+    )
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(measure_loader_profiles(args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,26 @@ from aiogram.enums import ContentType
 from sqlalchemy import (
     BIGINT,
     BOOLEAN,
+    DDL,
+    Computed,
+    Index,
+    event,
     ForeignKey,
     func,
     VARCHAR,
     INTEGER,
     TEXT,
     UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import (
+    ENUM,
+    TIME,
+    TIMESTAMP,
+    DATE,
+    DOUBLE_PRECISION,
+    TSTZRANGE,
 )
-from sqlalchemy.dialects.postgresql import ENUM, TIME, TIMESTAMP, DATE
 from sqlalchemy.orm import Mapped, mapped_column, Relationship
 
 from bot.db.base import Base
@@ -131,14 +143,41 @@ class WorkSchedule(Base):
     start_time = mapped_column(TIME, nullable=False)
     end_time = mapped_column(TIME, nullable=False)
     date = mapped_column(DATE, nullable=False)
+    # Зміна як інтервал часу за Києвом; end_time < start_time - зміна через північ
+    shift = mapped_column(
+        TSTZRANGE,
+        Computed(
+            "tstzrange("
+            "timezone('Europe/Kyiv', date + start_time), "
+            "timezone('Europe/Kyiv', date + end_time + CASE WHEN end_time < start_time "
+            "THEN interval '1 day' ELSE interval '0 days' END), "
+            "'[]')",
+            persisted=True,
+        ),
+        nullable=False,
+    )
 
     user: Mapped["User"] = Relationship(back_populates="work_schedules")
 
     __table_args__ = (
         UniqueConstraint("user_id", "date", name="unique_user_id_date_work_schedule"),
+        # user_id в GiST індексі потребує розширення btree_gist
+        Index(
+            "ix_work_schedules_user_id_shift",
+            "user_id",
+            "shift",
+            postgresql_using="gist",
+        ),
     )
 
 
+event.listen(
+    WorkSchedule.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"),
+)
+
+
 class TaskCategory(Base):
     __tablename__ = "task_categories"
 
@@ -195,6 +234,26 @@ class Task(Base):
     video_required: Mapped[bool] = mapped_column(BOOLEAN, default=False)
     file_required: Mapped[bool] = mapped_column(BOOLEAN, default=False)
     status = mapped_column(ENUM(TaskStatus), nullable=False, default=TaskStatus.NEW)
+    # Пакет імпорту CSV, яким створено завдання (для скасування імпорту одним запитом)
+    import_batch_id: Mapped[str | None] = mapped_column(
+        VARCHAR(32), nullable=True, index=True
+    )
+    # Відбиток для пошуку дублікатів: виконавець, початок і кінець (з точністю до секунди),
+    # назва, опис, категорія. Те саме в Python обчислює task_fingerprint() з repo.py
+    fingerprint: Mapped[str] = mapped_column(
+        VARCHAR(32),
+        Computed(
+            "md5("
+            "executor_id::text || E'\\x1f' || "
+            "floor(extract(epoch FROM timezone('UTC', start_datetime)))::bigint::text || E'\\x1f' || "
+            "floor(extract(epoch FROM timezone('UTC', end_datetime)))::bigint::text || E'\\x1f' || "
+            "title || E'\\x1f' || "
+            "coalesce(description, '') || E'\\x1f' || "
+            "coalesce(category_id::text, ''))",
+            persisted=True,
+        ),
+        nullable=False,
+    )
     created_at: Mapped[str] = mapped_column(
         TIMESTAMP(timezone=True),
         server_default=func.now(),
@@ -215,6 +274,16 @@ class Task(Base):
         cascade="all, delete-orphan",
     )
 
+    __table_args__ = (
+        # Скасоване завдання не заважає створити таке саме ще раз
+        Index(
+            "uq_tasks_fingerprint",
+            "fingerprint",
+            unique=True,
+            postgresql_where=text("status <> 'CANCELED'"),
+        ),
+    )
+
 
 class RegularTask(Base):
     __tablename__ = "regular_tasks"
@@ -252,6 +321,9 @@ class RegularTask(Base):
     photo_required: Mapped[bool] = mapped_column(BOOLEAN, default=False)
     video_required: Mapped[bool] = mapped_column(BOOLEAN, default=False)
     file_required: Mapped[bool] = mapped_column(BOOLEAN, default=False)
+    import_batch_id: Mapped[str | None] = mapped_column(
+        VARCHAR(32), nullable=True, index=True
+    )
     created_at: Mapped[str] = mapped_column(
         TIMESTAMP(timezone=True),
         server_default=func.now(),
@@ -345,3 +417,34 @@ class TaskReportContent(Base):
         nullable=False,
     )
     content_type = mapped_column(ENUM(ContentType), nullable=False)
+
+
+class TaskDailyStats(Base):
+    """
+    Денна агрегація завдань по виконавцю та категорії (за датою початку завдання, київський час).
+    Оновлюється інкрементально воркером, див. scheduler.func.refresh_task_daily_stats.
+    """
+
+    __tablename__ = "task_daily_stats"
+
+    day = mapped_column(DATE, primary_key=True)
+    executor_id: Mapped[int] = mapped_column(
+        BIGINT,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # 0 - завдання без категорії, щоб ключ лишався в первинному ключі без NULL
+    category_id: Mapped[int] = mapped_column(INTEGER, primary_key=True, default=0)
+    total: Mapped[int] = mapped_column(INTEGER, nullable=False, default=0)
+    new: Mapped[int] = mapped_column(INTEGER, nullable=False, default=0)
+    in_progress: Mapped[int] = mapped_column(INTEGER, nullable=False, default=0)
+    completed: Mapped[int] = mapped_column(INTEGER, nullable=False, default=0)
+    completed_late: Mapped[int] = mapped_column(INTEGER, nullable=False, default=0)
+    canceled: Mapped[int] = mapped_column(INTEGER, nullable=False, default=0)
+    overdue: Mapped[int] = mapped_column(INTEGER, nullable=False, default=0)
+    completion_delay_minutes_sum = mapped_column(
+        DOUBLE_PRECISION, nullable=False, default=0
+    )
+    refreshed_at = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
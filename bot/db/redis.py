@@ -86,6 +86,74 @@ def redis_cache(expiration=3600):
     return decorator
 
 
+def task_version_key(task_id: int) -> str:
+    return f"task:{task_id}:version"
+
+
+async def get_task_version(task_id: int) -> int:
+    """Поточна версія завдання. Змінюється при кожному коміті, що зачіпає завдання."""
+    version = await redis.get(task_version_key(task_id))
+    return int(version) if version else 0
+
+
+async def bump_task_versions(task_ids) -> None:
+    """Інвалідовує кеш завдань, збільшуючи їх версії одним pipeline."""
+    if not task_ids:
+        return
+    async with redis.pipeline(transaction=False) as pipe:
+        for task_id in task_ids:
+            pipe.incr(task_version_key(task_id))
+        await pipe.execute()
+
+
+def work_calendar_version_key(user_id: int) -> str:
+    return f"work_schedule:{user_id}:version"
+
+
+async def get_work_calendar_version(user_id: int) -> int:
+    """Поточна версія робочого календаря користувача. Змінюється при зміні графіку."""
+    version = await redis.get(work_calendar_version_key(user_id))
+    return int(version) if version else 0
+
+
+async def bump_work_calendar_versions(user_ids) -> None:
+    """Інвалідовує кеш робочих календарів, збільшуючи їх версії одним pipeline."""
+    if not user_ids:
+        return
+    async with redis.pipeline(transaction=False) as pipe:
+        for user_id in user_ids:
+            pipe.incr(work_calendar_version_key(user_id))
+        await pipe.execute()
+
+
+ORG_DIRECTORY_VERSION_KEY = "org_directory:version"
+
+
+async def get_org_directory_version() -> int:
+    """Версія довідника користувачів, посад і рівнів ієрархії."""
+    version = await redis.get(ORG_DIRECTORY_VERSION_KEY)
+    return int(version) if version else 0
+
+
+async def bump_org_directory_version() -> None:
+    await redis.incr(ORG_DIRECTORY_VERSION_KEY)
+
+
+TASK_DAILY_STATS_WATERMARK_KEY = "task_daily_stats:watermark"
+
+
+async def get_task_daily_stats_watermark() -> datetime.datetime | None:
+    """Час, до якого зміни завдань вже враховані в task_daily_stats."""
+    watermark = await redis.get(TASK_DAILY_STATS_WATERMARK_KEY)
+    if watermark:
+        return datetime.datetime.fromisoformat(watermark.decode())
+    return None
+
+
+async def set_task_daily_stats_watermark(watermark: datetime.datetime) -> None:
+    await redis.set(TASK_DAILY_STATS_WATERMARK_KEY, watermark.isoformat())
+
+
 async def get_user_locale(user_id: int):
     user_locale = await redis.get(f"user:{user_id}:locale")
     if user_locale:
@@ -1,14 +1,44 @@
 import datetime
+import hashlib
+import json
 import logging
+import math
+from typing import Literal, TypeAlias
 
-from sqlalchemy import func, select, and_
-from sqlalchemy.orm import joinedload, selectinload, with_loader_criteria
+from sqlalchemy import (
+    BIGINT,
+    INTEGER,
+    VARCHAR,
+    and_,
+    any_,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TIMESTAMP
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    joinedload,
+    noload,
+    selectinload,
+    with_loader_criteria,
+)
 
 from bot.db.models.models import (
     Positions,
     Task,
     TaskCategory,
     TaskControlPoints,
+    TaskDailyStats,
     TaskReport,
     TaskReportContent,
     User,
@@ -16,17 +46,227 @@ from bot.db.models.models import (
     HierarchyLevel,
     RegularTask,
 )
-from bot.db.redis import redis_cache
-from bot.entities.shared import TaskReadExtended
+from bot.db.redis import (
+    get_task_version,
+    get_work_calendar_version,
+    json_serializer,
+    redis,
+    redis_cache,
+)
+from bot.entities.analytics import (
+    TREND_BUCKET,
+    CategoryStatsRead,
+    ExecutorStatsRead,
+    TaskStatsRead,
+    TaskTrendRead,
+)
+from bot.entities.shared import TaskDetailRead, TaskReadExtended
 from bot.entities.task import TaskRead
 from bot.utils.enum import TaskStatus
 from bot.utils.repository import SQLAlchemyRepository
 from configreader import KYIV
 
+TASK_DETAIL_CACHE_TTL = 60 * 60
+# Користувачі з рівнем ієрархії до цього включно керують будь-якими завданнями
+TASK_MANAGER_MAX_LEVEL = 3
+# Поля, які змінює TaskRepo.update_many
+TASK_UPDATABLE_COLUMNS = (
+    "title",
+    "description",
+    "start_datetime",
+    "end_datetime",
+    "category_id",
+    "photo_required",
+    "video_required",
+    "file_required",
+)
+WORK_CALENDAR_CACHE_TTL = 24 * 60 * 60
+
+# 4 параметри на рядок, asyncpg обмежує запит 32767 параметрами
+WORK_SCHEDULE_UPSERT_BATCH = 1000
+
+TASK_LOAD_PROFILE: TypeAlias = Literal["list", "detail", "analytics"]
+
+
+def _task_user_loader(relationship):
+    """creator/executor -> position -> hierarchy_level без великих TEXT колонок з промптами."""
+    return (
+        joinedload(relationship)
+        .joinedload(User.position)
+        .joinedload(Positions.hierarchy_level)
+        .load_only(HierarchyLevel.id, HierarchyLevel.level)
+    )
+
+
+def task_loader_options(profile: TASK_LOAD_PROFILE) -> list:
+    """
+    Loader options for Task by use case.
+
+    Many-to-one relations (creator, executor, category) are joined, collections are
+    loaded with selectinload, so control points and reports never multiply task rows.
+
+    - list: control points and reports, without report contents.
+    - detail: control points, reports and report contents.
+    - analytics: control points only, reports are not loaded.
+    """
+    options = [
+        _task_user_loader(Task.creator),
+        _task_user_loader(Task.executor),
+        joinedload(Task.category),
+        selectinload(Task.control_points),
+    ]
+    if profile == "list":
+        options.append(selectinload(Task.reports))
+    elif profile == "detail":
+        options.append(selectinload(Task.reports).selectinload(TaskReport.content))
+    elif profile == "analytics":
+        options.append(noload(Task.reports))
+    return options
+
+
+def mark_tasks_changed(session: AsyncSession, *task_ids: int | None) -> None:
+    """Запам'ятовує змінені завдання, щоб UnitOfWork.commit інвалідовував їх кеш."""
+    session.info.setdefault("changed_task_ids", set()).update(
+        task_id for task_id in task_ids if task_id is not None
+    )
+
+
+def mark_work_schedules_changed(session: AsyncSession, *user_ids: int | None) -> None:
+    """Запам'ятовує користувачів зі зміненим графіком для інвалідації їх календарів."""
+    session.info.setdefault("changed_work_schedule_user_ids", set()).update(
+        user_id for user_id in user_ids if user_id is not None
+    )
+
+
+def mark_org_directory_changed(session: AsyncSession) -> None:
+    """Після коміту UnitOfWork збільшить версію довідника користувачів."""
+    session.info["org_directory_changed"] = True
+
+
+def as_kyiv(moment: datetime.datetime) -> datetime.datetime:
+    """Naive datetime в боті - київський час."""
+    return moment.replace(tzinfo=KYIV) if moment.tzinfo is None else moment
+
+
+def shift_moment(moment: datetime.datetime):
+    """Момент часу для порівняння з WorkSchedule.shift."""
+    return literal(as_kyiv(moment), TIMESTAMP(timezone=True))
+
+
+def shift_interval(start: datetime.datetime, end: datetime.datetime):
+    """Інтервал [start, end] для порівняння з WorkSchedule.shift."""
+    return func.tstzrange(shift_moment(start), shift_moment(end), "[]")
+
+
+def task_fingerprint(
+    executor_id: int,
+    start_datetime: datetime.datetime,
+    end_datetime: datetime.datetime,
+    title: str,
+    description: str | None,
+    category_id: int | None,
+) -> str:
+    """Відбиток завдання - те саме значення, що обчислює колонка Task.fingerprint."""
+    parts = (
+        str(executor_id),
+        str(math.floor(as_kyiv(start_datetime).timestamp())),
+        str(math.floor(as_kyiv(end_datetime).timestamp())),
+        title,
+        description or "",
+        "" if category_id is None else str(category_id),
+    )
+    return hashlib.md5("\x1f".join(parts).encode()).hexdigest()
+
+
+def task_managed_by(user_id: int):
+    """Умова: користувач може змінювати та видаляти завдання (автор або керівник)."""
+    user_level = (
+        select(HierarchyLevel.level)
+        .join(Positions, Positions.hierarchy_level_id == HierarchyLevel.id)
+        .join(User, User.position_id == Positions.id)
+        .where(User.id == user_id)
+        .scalar_subquery()
+    )
+    return or_(Task.creator_id == user_id, user_level <= TASK_MANAGER_MAX_LEVEL)
+
+
+def task_day_column():
+    """Дата початку завдання за київським часом - ключ денних агрегацій."""
+    return func.date(func.timezone(KYIV.key, Task.start_datetime))
+
+
+def task_late_condition():
+    return and_(
+        Task.status == TaskStatus.COMPLETED,
+        Task.completed_datetime > Task.end_datetime,
+    )
+
+
+def task_delay_minutes():
+    return func.extract("epoch", Task.completed_datetime - Task.end_datetime) / 60
+
+
+def task_count_columns() -> list:
+    """Counters by status shared by live analytics and the daily rollup."""
+    is_open = Task.status.in_([TaskStatus.NEW, TaskStatus.IN_PROGRESS])
+    return [
+        func.count().label("total"),
+        func.count().filter(Task.status == TaskStatus.NEW).label("new"),
+        func.count().filter(Task.status == TaskStatus.IN_PROGRESS).label("in_progress"),
+        func.count().filter(Task.status == TaskStatus.COMPLETED).label("completed"),
+        func.count().filter(Task.status == TaskStatus.CANCELED).label("canceled"),
+        func.count()
+        .filter(
+            or_(
+                Task.status == TaskStatus.OVERDUE,
+                and_(is_open, Task.end_datetime < func.now()),
+            )
+        )
+        .label("overdue"),
+        func.count().filter(task_late_condition()).label("completed_late"),
+    ]
+
 
-class UserRepo(SQLAlchemyRepository):
+class OrgDirectoryRepository(SQLAlchemyRepository):
+    """Репозиторій таблиці, з якої будується довідник користувачів (OrgDirectory)."""
+
+    async def add_one(self, data: dict) -> int:
+        mark_org_directory_changed(self.session)
+        return await super().add_one(data)
+
+    async def edit_one(self, id: int, data: dict):
+        mark_org_directory_changed(self.session)
+        return await super().edit_one(id, data)
+
+    async def delete_one(self, id: int):
+        mark_org_directory_changed(self.session)
+        await super().delete_one(id)
+
+
+class UserRepo(OrgDirectoryRepository):
     model = User
 
+    async def get_org_directory_rows(self):
+        """
+        Users with a position and a hierarchy level, one row per user:
+        (id, name, position_title, level).
+        """
+        stmt = (
+            select(
+                self.model.id,
+                func.coalesce(self.model.full_name, self.model.full_name_tg).label(
+                    "name"
+                ),
+                Positions.title.label("position_title"),
+                HierarchyLevel.level,
+            )
+            .join(Positions, Positions.id == self.model.position_id)
+            .join(HierarchyLevel, HierarchyLevel.id == Positions.hierarchy_level_id)
+            .order_by(HierarchyLevel.level, "name")
+        )
+        res = await self.session.execute(stmt)
+        return res.all()
+
     async def get_users_without_me(self, my_user_id: int, my_hierarchy_level: int):
         """Get users without the current user."""
         stmt = (
@@ -62,18 +302,10 @@ class UserRepo(SQLAlchemyRepository):
                     )
                 ),
                 self.model.work_schedules.any(
-                    and_(
-                        WorkSchedule.date == start_datetime.date(),
-                        WorkSchedule.start_time <= start_datetime.time(),
-                        WorkSchedule.end_time >= start_datetime.time(),
-                    )
+                    WorkSchedule.shift.contains(shift_moment(start_datetime))
                 ),
                 self.model.work_schedules.any(
-                    and_(
-                        WorkSchedule.date == end_datetime.date(),
-                        WorkSchedule.start_time <= end_datetime.time(),
-                        WorkSchedule.end_time >= end_datetime.time(),
-                    )
+                    WorkSchedule.shift.contains(shift_moment(end_datetime))
                 ),
             )
             .options(
@@ -94,6 +326,14 @@ class UserRepo(SQLAlchemyRepository):
         res = await self.session.execute(stmt)
         return res.scalars().all()
 
+    async def get_users_by_ids(self, user_ids: list[int]):
+        """Get users by a list of IDs in one query."""
+        if not user_ids:
+            return []
+        stmt = select(self.model).where(self.model.id.in_(user_ids))
+        res = await self.session.execute(stmt)
+        return res.scalars().all()
+
     async def get_user_by_id(self, user_id: int) -> model | None:
         stmt = (
             select(self.model)
@@ -185,6 +425,72 @@ class UserRepo(SQLAlchemyRepository):
 class WorkScheduleRepo(SQLAlchemyRepository):
     model = WorkSchedule
 
+    async def add_one(self, data: dict) -> int:
+        mark_work_schedules_changed(self.session, data.get("user_id"))
+        return await super().add_one(data)
+
+    async def edit_one(self, id: int, data: dict):
+        stmt = (
+            update(self.model)
+            .values(**data)
+            .filter_by(id=id)
+            .returning(self.model.id, self.model.user_id)
+        )
+        res = await self.session.execute(stmt)
+        row = res.one_or_none()
+        if row is None:
+            return None
+        mark_work_schedules_changed(self.session, row.user_id)
+        return row.id
+
+    async def delete_one(self, id: int):
+        stmt = (
+            delete(self.model)
+            .where(self.model.id == id)
+            .returning(self.model.user_id)
+        )
+        res = await self.session.execute(stmt)
+        mark_work_schedules_changed(self.session, *res.scalars().all())
+
+    async def get_work_calendar(
+        self,
+        user_id: int,
+        date_from: datetime.date,
+        date_to: datetime.date,
+    ) -> dict[str, list[str]]:
+        """
+        Робочі зміни користувача за період: {дата ISO: [початок, кінець]}.
+
+        Результат кешується в Redis під версією календаря користувача,
+        яка збільшується при кожному коміті, що змінює його графік.
+        """
+        version = await get_work_calendar_version(user_id)
+        cache_key = (
+            f"work_schedule:{user_id}:calendar:v{version}:"
+            f"{date_from.isoformat()}:{date_to.isoformat()}"
+        )
+        cached_result = await redis.get(cache_key)
+        if cached_result:
+            return json.loads(cached_result)
+        stmt = (
+            select(self.model.date, self.model.start_time, self.model.end_time)
+            .where(
+                self.model.user_id == user_id,
+                self.model.date >= date_from,
+                self.model.date <= date_to,
+            )
+            .order_by(self.model.date, self.model.start_time)
+        )
+        res = await self.session.execute(stmt)
+        calendar: dict[str, list[str]] = {}
+        for day, start_time, end_time in res.all():
+            # Якщо змін на день декілька, береться найраніша, як у get_work_schedule_in_user_by_date
+            calendar.setdefault(
+                day.isoformat(), [start_time.isoformat(), end_time.isoformat()]
+            )
+        await redis.set(cache_key, json.dumps(calendar), ex=WORK_CALENDAR_CACHE_TTL)
+        return calendar
+
     async def get_work_schedule_in_user_by_date(
         self,
         user_id: int,
@@ -223,18 +529,85 @@ class WorkScheduleRepo(SQLAlchemyRepository):
         time_to: datetime.time,
     ):
         """Check if a user is working in this time."""
+        return await self.is_user_on_shift(
+            user_id,
+            datetime.datetime.combine(date, time_from),
+            datetime.datetime.combine(date, time_to),
+        )
+
+    async def is_user_on_shift(
+        self,
+        user_id: int,
+        start: datetime.datetime,
+        end: datetime.datetime | None = None,
+    ) -> bool:
+        """Чи містить одна зміна користувача весь інтервал [start, end] (або момент start)."""
+        target = shift_interval(start, end) if end else shift_moment(start)
+        stmt = select(
+            exists().where(
+                self.model.user_id == user_id,
+                self.model.shift.contains(target),
+            )
+        )
+        res = await self.session.execute(stmt)
+        return res.scalar_one()
+
+    async def get_shifts_overlapping(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        user_ids: list[int] | None = None,
+    ):
+        """Зміни, що перетинаються з інтервалом [start, end] (оператор &&, GiST індекс)."""
         stmt = (
             select(self.model)
-            .where(
-                self.model.user_id == user_id,
-                self.model.date == date,
-                self.model.start_time <= time_from,
-                self.model.end_time >= time_to,
+            .where(self.model.shift.overlaps(shift_interval(start, end)))
+            .order_by(self.model.user_id, self.model.date)
+        )
+        if user_ids is not None:
+            stmt = stmt.where(self.model.user_id.in_(user_ids))
+        res = await self.session.execute(stmt)
+        return res.scalars().all()
+
+    async def check_availability_many(
+        self,
+        intervals: list[tuple[int, datetime.datetime, datetime.datetime]],
+    ) -> list[bool]:
+        """
+        Перевіряє доступність для багатьох пар (користувач, інтервал) одним запитом.
+
+        Пари передаються трьома масивами і розгортаються через unnest,
+        тож кількість параметрів запиту не залежить від кількості пар.
+
+        :param intervals: (user_id, start, end) для кожної перевірки.
+        :return: Для кожної пари - чи містить одна зміна користувача весь інтервал.
+        """
+        if not intervals:
+            return []
+        user_ids = [user_id for user_id, _, _ in intervals]
+        starts = [as_kyiv(start) for _, start, _ in intervals]
+        ends = [as_kyiv(end) for _, _, end in intervals]
+        pairs = (
+            func.unnest(
+                literal(user_ids, ARRAY(BIGINT)),
+                literal(starts, ARRAY(TIMESTAMP(timezone=True))),
+                literal(ends, ARRAY(TIMESTAMP(timezone=True))),
+            )
+            .table_valued("user_id", "starts_at", "ends_at", with_ordinality="idx")
+            .render_derived()
+        )
+        stmt = select(pairs.c.idx).where(
+            exists().where(
+                self.model.user_id == pairs.c.user_id,
+                self.model.shift.contains(
+                    func.tstzrange(pairs.c.starts_at, pairs.c.ends_at, "[]")
+                ),
             )
-            .limit(1)
         )
         res = await self.session.execute(stmt)
-        return res.scalar_one_or_none() is not None
+        available = set(res.scalars().all())
+        # WITH ORDINALITY нумерує з 1
+        return [index in available for index in range(1, len(intervals) + 1)]
 
     async def get_all_work_schedule_in_user(
         self,
@@ -266,6 +639,7 @@ class WorkScheduleRepo(SQLAlchemyRepository):
         date_from: datetime.date,
         date_to: datetime.date,
         user_id: int | None = None,
+        user_ids: list[int] | None = None,
     ):
         """Get all work schedules for a given date range."""
         stmt = (
@@ -275,19 +649,58 @@ class WorkScheduleRepo(SQLAlchemyRepository):
         )
         if user_id is not None:
             stmt = stmt.where(self.model.user_id == user_id)
+        if user_ids is not None:
+            stmt = stmt.where(self.model.user_id.in_(user_ids))
         res = await self.session.execute(stmt)
         return res.scalars().all()
 
-    async def get_count_of_users_on_shift(self):
-        datetime_now = datetime.datetime.now().replace(tzinfo=KYIV)
-        stmt = (
-            select(func.count(self.model.id))
-            .where(
-                self.model.start_time <= datetime_now.time(),
-                self.model.end_time >= datetime_now.time(),
-                self.model.date == datetime_now.date(),
+    async def upsert_many(self, schedules: list[dict]) -> list:
+        """
+        Insert or update work schedules by (user_id, date) with
+        INSERT ... ON CONFLICT DO UPDATE, in batches of WORK_SCHEDULE_UPSERT_BATCH rows.
+
+        :param schedules: dicts with user_id, date, start_time, end_time;
+            (user_id, date) must be unique within the list.
+        :return: Rows (user_id, date, created) - created is False for updated schedules.
+        """
+        mark_work_schedules_changed(
+            self.session, *{schedule["user_id"] for schedule in schedules}
+        )
+        results = []
+        for index in range(0, len(schedules), WORK_SCHEDULE_UPSERT_BATCH):
+            stmt = pg_insert(self.model).values(
+                schedules[index : index + WORK_SCHEDULE_UPSERT_BATCH]
+            )
+            stmt = stmt.on_conflict_do_update(
+                constraint="unique_user_id_date_work_schedule",
+                set_={
+                    "start_time": stmt.excluded.start_time,
+                    "end_time": stmt.excluded.end_time,
+                },
+            ).returning(
+                self.model.user_id,
+                self.model.date,
+                # Вставлений рядок ще не має xmax, оновлений - має
+                literal_column("xmax = 0").label("created"),
             )
-            .group_by(self.model.user_id)
+            res = await self.session.execute(stmt)
+            results.extend(res.all())
+        return results
+
+    async def delete_many(self, ids: list[int]) -> None:
+        """Delete work schedules by IDs with one statement."""
+        if not ids:
+            return
+        res = await self.session.execute(
+            delete(self.model)
+            .where(self.model.id.in_(ids))
+            .returning(self.model.user_id)
+        )
+        mark_work_schedules_changed(self.session, *set(res.scalars().all()))
+
+    async def get_count_of_users_on_shift(self):
+        stmt = select(func.count(self.model.user_id.distinct())).where(
+            self.model.shift.contains(shift_moment(datetime.datetime.now(KYIV)))
         )
         res = await self.session.execute(stmt)
         return res.scalar_one_or_none() or 0
@@ -300,58 +713,209 @@ class TaskCategoryRepo(SQLAlchemyRepository):
 class TaskRepo(SQLAlchemyRepository):
     model = Task
 
+    async def edit_one(self, id: int, data: dict):
+        mark_tasks_changed(self.session, id)
+        return await super().edit_one(id, data)
+
+    async def delete_one(self, id: int):
+        mark_tasks_changed(self.session, id)
+        await super().delete_one(id)
+
+    async def add_one_if_new(self, data: dict) -> int | None:
+        """
+        Додає завдання, якщо серед нескасованих немає такого ж за відбитком.
+
+        :return: ID нового завдання або None, якщо таке завдання вже існує.
+        """
+        stmt = (
+            pg_insert(self.model)
+            .values(**data)
+            .on_conflict_do_nothing(
+                index_elements=[self.model.fingerprint],
+                index_where=self.model.status != TaskStatus.CANCELED,
+            )
+            .returning(self.model.id)
+        )
+        res = await self.session.execute(stmt)
+        return res.scalar_one_or_none()
+
+    async def add_many_if_new(self, data: list[dict]) -> dict[str, int]:
+        """
+        Додає завдання одним запитом; такі ж (за відбитком) як нескасовані існуючі пропускаються.
+
+        :return: Відбиток -> ID для створених завдань.
+        """
+        if not data:
+            return {}
+        stmt = (
+            pg_insert(self.model)
+            .values(data)
+            .on_conflict_do_nothing(
+                index_elements=[self.model.fingerprint],
+                index_where=self.model.status != TaskStatus.CANCELED,
+            )
+            .returning(self.model.fingerprint, self.model.id)
+        )
+        res = await self.session.execute(stmt)
+        return {fingerprint: task_id for fingerprint, task_id in res.all()}
+
+    async def update_many(self, updates: list[dict], user_id: int) -> list:
+        """
+        Оновлює кілька завдань одним UPDATE ... FROM (VALUES ...).
+        У кожному словнику - id та лише ті поля з TASK_UPDATABLE_COLUMNS, які змінюються.
+        Завдання, якими user_id не може керувати (task_managed_by), не змінюються.
+
+        :return: Рядки (id, creator_id, start_datetime, end_datetime) оновлених завдань.
+        """
+        if not updates:
+            return []
+        changes = values(
+            column("id", INTEGER),
+            *(
+                column(name, self.model.__table__.c[name].type)
+                for name in TASK_UPDATABLE_COLUMNS
+            ),
+            name="changes",
+        ).data(
+            [
+                (item["id"], *(item.get(name) for name in TASK_UPDATABLE_COLUMNS))
+                for item in updates
+            ]
+        )
+        # NULL у VALUES - поле не змінюється
+        stmt = (
+            update(self.model)
+            .where(self.model.id == changes.c.id, task_managed_by(user_id))
+            .values(
+                {
+                    name: func.coalesce(changes.c[name], self.model.__table__.c[name])
+                    for name in TASK_UPDATABLE_COLUMNS
+                }
+            )
+            .returning(
+                self.model.id,
+                self.model.creator_id,
+                self.model.start_datetime,
+                self.model.end_datetime,
+            )
+        )
+        res = await self.session.execute(stmt)
+        rows = res.all()
+        mark_tasks_changed(self.session, *(row.id for row in rows))
+        return rows
+
+    async def delete_many(self, task_ids: list[int], user_id: int) -> list[int]:
+        """
+        Видаляє завдання одним DELETE ... WHERE id = ANY(...), крім тих,
+        якими user_id не може керувати (task_managed_by).
+
+        :return: ID видалених завдань.
+        """
+        if not task_ids:
+            return []
+        stmt = (
+            delete(self.model)
+            .where(
+                self.model.id == any_(literal(task_ids, ARRAY(INTEGER))),
+                task_managed_by(user_id),
+            )
+            .returning(self.model.id)
+        )
+        res = await self.session.execute(stmt)
+        deleted_ids = list(res.scalars().all())
+        mark_tasks_changed(self.session, *deleted_ids)
+        return deleted_ids
+
+    async def get_existing_ids(self, task_ids: list[int]) -> set[int]:
+        stmt = select(self.model.id).where(
+            self.model.id == any_(literal(task_ids, ARRAY(INTEGER)))
+        )
+        res = await self.session.execute(stmt)
+        return set(res.scalars().all())
+
+    async def get_tasks_by_ids(self, task_ids: list[int]) -> dict[int, TaskReadExtended]:
+        """Завдання, як у get_task_by_id, для кількох ID одним запитом і без кешу: ID -> завдання."""
+        if not task_ids:
+            return {}
+        stmt = (
+            select(self.model)
+            .where(self.model.id == any_(literal(task_ids, ARRAY(INTEGER))))
+            .options(*task_loader_options("list"))
+        )
+        res = await self.session.execute(stmt)
+        return {
+            task.id: TaskReadExtended.model_validate(task, from_attributes=True)
+            for task in res.unique().scalars().all()
+        }
+
+    async def delete_import_batch(self, import_batch_id: str) -> list[int]:
+        """Видаляє всі завдання пакета імпорту одним запитом; повертає їх ID."""
+        stmt = (
+            delete(self.model)
+            .where(self.model.import_batch_id == import_batch_id)
+            .returning(self.model.id)
+        )
+        res = await self.session.execute(stmt)
+        task_ids = list(res.scalars().all())
+        mark_tasks_changed(self.session, *task_ids)
+        return task_ids
+
+    async def get_ids_by_fingerprints(self, fingerprints: list[str]) -> dict[str, int]:
+        """Нескасовані завдання з такими відбитками: відбиток -> ID, без завантаження зв'язків."""
+        if not fingerprints:
+            return {}
+        stmt = select(self.model.fingerprint, self.model.id).where(
+            self.model.fingerprint == any_(literal(fingerprints, ARRAY(VARCHAR))),
+            self.model.status != TaskStatus.CANCELED,
+        )
+        res = await self.session.execute(stmt)
+        return {fingerprint: task_id for fingerprint, task_id in res.all()}
+
+    async def get_task_detail(self, task_id: int) -> dict | None:
+        """
+        Get a task with control points, reports and report contents.
+
+        Collections are loaded with selectinload, so the number of queries does not
+        depend on the number of reports. The result is cached under the task's version
+        key and is invalidated on every commit that touches the task.
+        """
+        version = await get_task_version(task_id)
+        cache_key = f"task:{task_id}:detail:v{version}"
+        cached_result = await redis.get(cache_key)
+        if cached_result:
+            return json.loads(cached_result)
+        stmt = (
+            select(self.model)
+            .where(self.model.id == task_id)
+            .options(*task_loader_options("detail"))
+        )
+        res = await self.session.execute(stmt)
+        result = res.unique().scalar_one_or_none()
+        if result is None:
+            return None
+        task_detail = TaskDetailRead.model_validate(
+            result, from_attributes=True
+        ).model_dump()
+        await redis.set(
+            cache_key,
+            json.dumps(task_detail, default=json_serializer),
+            ex=TASK_DETAIL_CACHE_TTL,
+        )
+        return task_detail
+
     @redis_cache(expiration=30)
     async def get_task_by_id(self, task_id: int, update_cache: bool | None = None):
         """Get a task by its ID."""
         stmt = (
             select(self.model)
             .where(self.model.id == task_id)
-            .options(
-                joinedload(self.model.creator)
-                .joinedload(User.position)
-                .joinedload(Positions.hierarchy_level),
-                joinedload(self.model.executor)
-                .joinedload(User.position)
-                .joinedload(Positions.hierarchy_level),
-                joinedload(self.model.category),
-                joinedload(self.model.control_points),
-                joinedload(self.model.reports),
-            )
+            .options(*task_loader_options("list"))
         )
         res = await self.session.execute(stmt)
         result = res.unique().scalar_one_or_none()
         if result is None:
             return None
-        logging.info(f"task: {result.start_datetime} - {result.end_datetime}, ")
-        task_model = TaskReadExtended.model_validate(result, from_attributes=True)
-        return (
-            task_model.model_dump(
-                exclude={
-                    "creator": {
-                        "position": {
-                            "hierarchy_level": {
-                                "create_task_prompt",
-                                "work_schedule_prompt",
-                                "category_prompt",
-                                "analytics_prompt",
-                            }
-                        }
-                    },
-                    "executor": {
-                        "position": {
-                            "hierarchy_level": {
-                                "create_task_prompt",
-                                "work_schedule_prompt",
-                                "category_prompt",
-                                "analytics_prompt",
-                            }
-                        }
-                    },
-                },
-            )
-            if task_model
-            else None
-        )
+        return TaskReadExtended.model_validate(result, from_attributes=True).model_dump()
 
     @redis_cache(expiration=30)
     async def get_all_task_simple(
@@ -401,17 +965,7 @@ class TaskRepo(SQLAlchemyRepository):
         end_datetime: datetime.datetime | None = None,
     ):
         """Get all tasks with optional filters."""
-        stmt = select(self.model).options(
-            joinedload(self.model.creator)
-            .joinedload(User.position)
-            .joinedload(Positions.hierarchy_level),
-            joinedload(self.model.executor)
-            .joinedload(User.position)
-            .joinedload(Positions.hierarchy_level),
-            joinedload(self.model.category),
-            selectinload(self.model.control_points),
-            joinedload(self.model.reports),
-        )
+        stmt = select(self.model).options(*task_loader_options("list"))
         if creator_id is not None:
             stmt = stmt.where(self.model.creator_id == creator_id)
 
@@ -446,31 +1000,295 @@ class TaskRepo(SQLAlchemyRepository):
 class TaskControlPointsRepo(SQLAlchemyRepository):
     model = TaskControlPoints
 
+    async def add_one(self, data: dict) -> int:
+        mark_tasks_changed(self.session, data.get("task_id"))
+        return await super().add_one(data)
+
+    async def add_many(self, data: list[dict]) -> list[int]:
+        """Додає контрольні точки (зокрема різних завдань) одним запитом."""
+        if not data:
+            return []
+        mark_tasks_changed(self.session, *(item.get("task_id") for item in data))
+        stmt = insert(self.model).values(data).returning(self.model.id)
+        res = await self.session.execute(stmt)
+        return list(res.scalars().all())
+
+    async def edit_one(self, id: int, data: dict):
+        stmt = (
+            update(self.model)
+            .values(**data)
+            .filter_by(id=id)
+            .returning(self.model.id, self.model.task_id)
+        )
+        res = await self.session.execute(stmt)
+        row = res.one_or_none()
+        if row is None:
+            return None
+        mark_tasks_changed(self.session, row.task_id)
+        return row.id
+
 
 class TaskReportRepo(SQLAlchemyRepository):
     model = TaskReport
 
+    async def add_one(self, data: dict) -> int:
+        mark_tasks_changed(self.session, data.get("task_id"))
+        return await super().add_one(data)
+
 
 class TaskReportContentRepo(SQLAlchemyRepository):
     model = TaskReportContent
 
 
-class PositionRepo(SQLAlchemyRepository):
+class PositionRepo(OrgDirectoryRepository):
     model = Positions
 
 
-class HierarchyLevelRepo(SQLAlchemyRepository):
+class HierarchyLevelRepo(OrgDirectoryRepository):
     model = HierarchyLevel
 
 
 class AnalyticsRepo(SQLAlchemyRepository):
     """
     Repository for analytics-related operations.
-    This is a placeholder for future analytics-related methods.
+
+    Aggregations are computed in Postgres with GROUP BY and FILTER clauses, so only
+    compact result rows leave the database regardless of the task history size.
     """
 
     model = Task
 
+    def _task_stats_columns(self) -> list:
+        """Aggregate columns shared by all live analytics queries."""
+        return [
+            *task_count_columns(),
+            func.avg(task_delay_minutes())
+            .filter(task_late_condition())
+            .label("avg_lateness_minutes"),
+        ]
+
+    @staticmethod
+    def _rollup_stats_columns() -> list:
+        """Aggregate columns over task_daily_stats rows."""
+        return [
+            func.sum(TaskDailyStats.total).label("total"),
+            func.sum(TaskDailyStats.new).label("new"),
+            func.sum(TaskDailyStats.in_progress).label("in_progress"),
+            func.sum(TaskDailyStats.completed).label("completed"),
+            func.sum(TaskDailyStats.canceled).label("canceled"),
+            func.sum(TaskDailyStats.overdue).label("overdue"),
+            func.sum(TaskDailyStats.completed_late).label("completed_late"),
+            (
+                func.sum(TaskDailyStats.completion_delay_minutes_sum)
+                / func.nullif(func.sum(TaskDailyStats.completed_late), 0)
+            ).label("avg_lateness_minutes"),
+        ]
+
+    @staticmethod
+    def _apply_rollup_filters(
+        stmt,
+        executor_id: int | None = None,
+        category_id: int | None = None,
+        start_datetime: datetime.datetime | None = None,
+        end_datetime: datetime.datetime | None = None,
+    ):
+        if executor_id is not None:
+            stmt = stmt.where(TaskDailyStats.executor_id == executor_id)
+        if category_id is not None:
+            stmt = stmt.where(TaskDailyStats.category_id == category_id)
+        if start_datetime is not None:
+            stmt = stmt.where(
+                TaskDailyStats.day >= start_datetime.astimezone(KYIV).date()
+            )
+        if end_datetime is not None:
+            stmt = stmt.where(TaskDailyStats.day <= end_datetime.astimezone(KYIV).date())
+        return stmt
+
+    def _apply_task_filters(
+        self,
+        stmt,
+        creator_id: int | None = None,
+        executor_id: int | None = None,
+        category_id: int | None = None,
+        start_datetime: datetime.datetime | None = None,
+        end_datetime: datetime.datetime | None = None,
+    ):
+        if creator_id is not None:
+            stmt = stmt.where(self.model.creator_id == creator_id)
+        if executor_id is not None:
+            stmt = stmt.where(self.model.executor_id == executor_id)
+        if category_id is not None:
+            stmt = stmt.where(self.model.category_id == category_id)
+        if start_datetime is not None:
+            stmt = stmt.where(self.model.start_datetime >= start_datetime)
+        if end_datetime is not None:
+            stmt = stmt.where(self.model.start_datetime < end_datetime)
+        return stmt
+
+    @staticmethod
+    def _stats_from_row(row) -> dict:
+        data = dict(row._mapping)
+        active = data["total"] - data["canceled"]
+        data["completion_rate"] = (
+            round(data["completed"] / active, 4) if active else 0.0
+        )
+        if data["avg_lateness_minutes"] is not None:
+            data["avg_lateness_minutes"] = round(float(data["avg_lateness_minutes"]), 1)
+        return data
+
+    async def get_task_stats(
+        self,
+        creator_id: int | None = None,
+        executor_id: int | None = None,
+        category_id: int | None = None,
+        start_datetime: datetime.datetime | None = None,
+        end_datetime: datetime.datetime | None = None,
+    ) -> dict:
+        """Get completion rate, overdue counts and average lateness for tasks started in the period."""
+        stmt = self._apply_task_filters(
+            select(*self._task_stats_columns()).select_from(self.model),
+            creator_id=creator_id,
+            executor_id=executor_id,
+            category_id=category_id,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+        )
+        res = await self.session.execute(stmt)
+        return TaskStatsRead.model_validate(
+            self._stats_from_row(res.one())
+        ).model_dump()
+
+    async def get_rollup_task_stats(
+        self,
+        executor_id: int | None = None,
+        category_id: int | None = None,
+        start_datetime: datetime.datetime | None = None,
+        end_datetime: datetime.datetime | None = None,
+    ) -> dict:
+        """
+        Get the same stats as get_task_stats from the task_daily_stats rollup with day
+        granularity, so they add up with the executor and category breakdowns of the period.
+        """
+        # no rollup rows in the period: the sums are NULL
+        columns = [
+            column
+            if column.name == "avg_lateness_minutes"
+            else func.coalesce(column, 0).label(column.name)
+            for column in self._rollup_stats_columns()
+        ]
+        stmt = self._apply_rollup_filters(
+            select(*columns),
+            executor_id=executor_id,
+            category_id=category_id,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+        )
+        res = await self.session.execute(stmt)
+        return TaskStatsRead.model_validate(
+            self._stats_from_row(res.one())
+        ).model_dump()
+
+    async def get_executor_stats(
+        self,
+        category_id: int | None = None,
+        start_datetime: datetime.datetime | None = None,
+        end_datetime: datetime.datetime | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Get task stats grouped by executor, ordered by the number of tasks.
+        Read from the task_daily_stats rollup with day granularity.
+        """
+        stmt = (
+            select(
+                TaskDailyStats.executor_id,
+                func.coalesce(User.full_name, User.full_name_tg).label("full_name"),
+                *self._rollup_stats_columns(),
+            )
+            .join(User, User.id == TaskDailyStats.executor_id)
+            .group_by(TaskDailyStats.executor_id, User.full_name, User.full_name_tg)
+            .order_by(func.sum(TaskDailyStats.total).desc())
+        )
+        stmt = self._apply_rollup_filters(
+            stmt,
+            category_id=category_id,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        res = await self.session.execute(stmt)
+        return [
+            ExecutorStatsRead.model_validate(self._stats_from_row(row)).model_dump()
+            for row in res.all()
+        ]
+
+    async def get_category_stats(
+        self,
+        executor_id: int | None = None,
+        start_datetime: datetime.datetime | None = None,
+        end_datetime: datetime.datetime | None = None,
+    ) -> list[dict]:
+        """
+        Get task stats grouped by category, ordered by the number of tasks.
+        Read from the task_daily_stats rollup with day granularity.
+        """
+        stmt = (
+            select(
+                func.nullif(TaskDailyStats.category_id, 0).label("category_id"),
+                TaskCategory.name.label("category_name"),
+                *self._rollup_stats_columns(),
+            )
+            .outerjoin(TaskCategory, TaskCategory.id == TaskDailyStats.category_id)
+            .group_by(TaskDailyStats.category_id, TaskCategory.name)
+            .order_by(func.sum(TaskDailyStats.total).desc())
+        )
+        stmt = self._apply_rollup_filters(
+            stmt,
+            executor_id=executor_id,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+        )
+        res = await self.session.execute(stmt)
+        return [
+            CategoryStatsRead.model_validate(self._stats_from_row(row)).model_dump()
+            for row in res.all()
+        ]
+
+    async def get_task_trend(
+        self,
+        bucket: TREND_BUCKET = "week",
+        executor_id: int | None = None,
+        category_id: int | None = None,
+        start_datetime: datetime.datetime | None = None,
+        end_datetime: datetime.datetime | None = None,
+    ) -> list[dict]:
+        """
+        Get task stats bucketed by day, week or month of the task start (Kyiv time).
+        Read from the task_daily_stats rollup.
+        """
+        bucket_column = func.date(func.date_trunc(bucket, TaskDailyStats.day)).label(
+            "bucket"
+        )
+        stmt = (
+            select(bucket_column, *self._rollup_stats_columns())
+            # group by the label: bound parameters in the expression would not match
+            .group_by("bucket")
+            .order_by("bucket")
+        )
+        stmt = self._apply_rollup_filters(
+            stmt,
+            executor_id=executor_id,
+            category_id=category_id,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+        )
+        res = await self.session.execute(stmt)
+        return [
+            TaskTrendRead.model_validate(self._stats_from_row(row)).model_dump()
+            for row in res.all()
+        ]
+
     async def get_task_by_condition(
         self,
         creator_id: int | None = None,
@@ -483,17 +1301,7 @@ class AnalyticsRepo(SQLAlchemyRepository):
         Get tasks based on various conditions.
         This method can be extended to include more complex analytics queries.
         """
-        stmt = select(self.model).options(
-            joinedload(self.model.creator)
-            .joinedload(User.position)
-            .joinedload(Positions.hierarchy_level),
-            joinedload(self.model.executor)
-            .joinedload(User.position)
-            .joinedload(Positions.hierarchy_level),
-            joinedload(self.model.category),
-            selectinload(self.model.control_points),
-            joinedload(self.model.reports),
-        )
+        stmt = select(self.model).options(*task_loader_options("analytics"))
         if creator_id is not None:
             stmt = stmt.where(self.model.creator_id == creator_id)
         if executor_id is not None:
@@ -505,13 +1313,73 @@ class AnalyticsRepo(SQLAlchemyRepository):
         if end_datetime is not None:
             stmt = stmt.where(self.model.end_datetime <= end_datetime)
         res = await self.session.execute(stmt)
-        result = res.scalars().all()
+        result = res.unique().scalars().all()
         return [
-            TaskReadExtended.model_validate(task, from_attributes=True).model_dump()
+            TaskReadExtended.model_validate(task, from_attributes=True).model_dump(
+                exclude={"reports"}
+            )
             for task in result
         ]
 
 
+class TaskDailyStatsRepo(SQLAlchemyRepository):
+    """
+    Maintains the task_daily_stats rollup.
+
+    A day is always recomputed as a whole from tasks, so refreshing is idempotent and
+    may safely overlap with a previous run.
+    """
+
+    model = TaskDailyStats
+
+    async def get_changed_days(
+        self, since: datetime.datetime | None = None
+    ) -> list[datetime.date]:
+        """Get the start days of tasks created or updated after `since`."""
+        day_column = task_day_column()
+        stmt = select(day_column).distinct()
+        if since is not None:
+            stmt = stmt.where(Task.updated_at > since)
+        res = await self.session.execute(stmt)
+        return [day for day in res.scalars().all() if day is not None]
+
+    async def refresh_days(self, days: list[datetime.date]) -> None:
+        """Recompute rollup rows of the given days in the current transaction."""
+        if not days:
+            return
+        day_column = task_day_column()
+        select_stmt = (
+            select(
+                day_column.label("day"),
+                Task.executor_id.label("executor_id"),
+                func.coalesce(Task.category_id, 0).label("category_id"),
+                *task_count_columns(),
+                func.coalesce(
+                    func.sum(task_delay_minutes()).filter(task_late_condition()), 0
+                ).label("completion_delay_minutes_sum"),
+            )
+            # the range keeps the scan on the start_datetime index
+            .where(
+                Task.start_datetime
+                >= datetime.datetime.combine(min(days), datetime.time.min, KYIV),
+                Task.start_datetime
+                < datetime.datetime.combine(
+                    max(days) + datetime.timedelta(days=1), datetime.time.min, KYIV
+                ),
+                day_column.in_(days),
+            )
+            .group_by("day", "executor_id", "category_id")
+        )
+        await self.session.execute(
+            delete(self.model).where(self.model.day.in_(days))
+        )
+        await self.session.execute(
+            insert(self.model).from_select(
+                list(select_stmt.selected_columns.keys()), select_stmt
+            )
+        )
+
+
 class RegularTaskRepo(SQLAlchemyRepository):
     model = RegularTask
 
@@ -523,6 +1391,16 @@ class RegularTaskRepo(SQLAlchemyRepository):
         result = res.scalars().first
         return bool(result)
 
+    async def delete_import_batch(self, import_batch_id: str) -> list[int]:
+        """Видаляє всі регулярні завдання пакета імпорту одним запитом; повертає їх ID."""
+        stmt = (
+            delete(self.model)
+            .where(self.model.import_batch_id == import_batch_id)
+            .returning(self.model.id)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.scalars().all())
+
     async def get_all_regular_tasks(self, month: int, year: int):
         stmt = select(self.model).where(
             self.model.task_month == month, self.model.task_year == year
@@ -3,6 +3,7 @@ from .manage_personal_dialogs import dialogs as manage_personal_dialogs
 from .categories_menu_dialogs import dialogs as categories_menu_dialogs
 from .task_menu_dialogs import dialogs as task_menu_dialogs
 from .create_task_dialogs import dialogs as create_task_dialogs
+from .analytics_dialogs import dialogs as analytics_dialogs
 
 
 dialog_routers = [
@@ -11,4 +12,5 @@ dialog_routers = [
     *task_menu_dialogs,
     *manage_personal_dialogs,
     *categories_menu_dialogs,
+    *analytics_dialogs,
 ]
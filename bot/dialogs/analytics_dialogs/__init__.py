@@ -0,0 +1,9 @@
+from aiogram_dialog import Dialog  # noqa: F401
+from . import windows  # noqa: F401
+
+
+dialogs = [
+    Dialog(
+        windows.analytics_menu_window,
+    ),
+]
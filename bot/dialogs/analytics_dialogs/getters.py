@@ -0,0 +1,117 @@
+import datetime
+
+from aiogram.types import User  # noqa: F401
+from aiogram_dialog import DialogManager  # noqa: F401
+from aiogram_dialog.widgets.kbd import ManagedRadio
+from aiogram_i18n import I18nContext
+
+from bot.entities.analytics import (
+    CategoryStatsRead,
+    ExecutorStatsRead,
+    TaskStatsRead,
+)
+from bot.utils.unitofwork import UnitOfWork
+from configreader import KYIV
+
+TOP_EXECUTORS_LIMIT = 5
+ANALYTICS_PERIODS = ("week", "month", "quarter")
+
+
+def get_period_start(period: str, datetime_now: datetime.datetime) -> datetime.datetime:
+    if period == "week":
+        return datetime_now - datetime.timedelta(days=7)
+    if period == "quarter":
+        return datetime_now - datetime.timedelta(days=90)
+    return datetime_now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def format_stats_lines(
+    i18n: I18nContext, rows: list[tuple[str, TaskStatsRead]]
+) -> str:
+    """Рядки статистики виконавців або категорій: одне повідомлення, багато аргументів."""
+    lines = i18n.core.get_many(
+        "analytics-stats-line",
+        i18n.locale,
+        (
+            dict(
+                title=title,
+                completed=stats.completed,
+                total=stats.total,
+                completion_rate=f"{stats.completion_rate:.0%}",
+                overdue=stats.overdue,
+            )
+            for title, stats in rows
+        ),
+    )
+    return "\n".join(lines) or i18n.get("analytics-no-stats-lines")
+
+
+async def analytics_dashboard_getter(
+    dialog_manager: DialogManager,
+    uow: UnitOfWork,
+    event_from_user: User,
+    i18n: I18nContext,
+    **kwargs,
+):
+    if dialog_manager.dialog_data.get("period") is None:
+        widget: ManagedRadio = dialog_manager.find("radio_analytics_period")
+        await widget.set_checked("month")
+    period = dialog_manager.dialog_data.get("period", "month")
+    datetime_now = datetime.datetime.now(KYIV)
+    start_datetime = get_period_start(period, datetime_now)
+
+    # The whole screen comes from the task_daily_stats rollup: the headline has to
+    # add up with the breakdowns, which are only available from it
+    stats = TaskStatsRead.model_validate(
+        await uow.analytics.get_rollup_task_stats(
+            start_datetime=start_datetime,
+            end_datetime=datetime_now,
+        )
+    )
+    executors = [
+        ExecutorStatsRead.model_validate(row)
+        for row in await uow.analytics.get_executor_stats(
+            start_datetime=start_datetime,
+            end_datetime=datetime_now,
+            limit=TOP_EXECUTORS_LIMIT,
+        )
+    ]
+    categories = [
+        CategoryStatsRead.model_validate(row)
+        for row in await uow.analytics.get_category_stats(
+            start_datetime=start_datetime,
+            end_datetime=datetime_now,
+        )
+    ]
+    return {
+        "periods": [
+            (period_id, i18n.get(f"analytics-period-{period_id}"))
+            for period_id in ANALYTICS_PERIODS
+        ],
+        "date_from": start_datetime.strftime("%d.%m.%Y"),
+        "date_to": datetime_now.strftime("%d.%m.%Y"),
+        "total": stats.total,
+        "completed": stats.completed,
+        "in_progress": stats.in_progress + stats.new,
+        "canceled": stats.canceled,
+        "overdue": stats.overdue,
+        "completed_late": stats.completed_late,
+        "completion_rate": f"{stats.completion_rate:.0%}",
+        "avg_lateness": f"{stats.avg_lateness_minutes:.0f}"
+        if stats.avg_lateness_minutes is not None
+        else i18n.get("analytics-no-lateness"),
+        "executors": format_stats_lines(
+            i18n,
+            [
+                (executor.full_name or str(executor.executor_id), executor)
+                for executor in executors
+            ],
+        ),
+        "categories": format_stats_lines(
+            i18n,
+            [
+                (category.category_name or i18n.get("analytics-no-category"), category)
+                for category in categories
+            ],
+        ),
+    }
@@ -0,0 +1,29 @@
+import operator
+
+from aiogram_dialog.widgets.kbd import Group, Radio, Row, Button  # noqa: F401
+from aiogram_dialog.widgets.text import Format
+
+from . import on_clicks
+from ...i18n.utils.i18n_format import I18nFormat
+
+
+def analytics_menu_keyboard():
+    return Group(
+        Row(
+            Radio(
+                unchecked_text=Format("⚪️{item[1]}"),
+                checked_text=Format("🔘{item[1]}"),
+                id="radio_analytics_period",
+                items="periods",
+                item_id_getter=operator.itemgetter(0),
+                on_click=on_clicks.on_select_period_click,
+            ),
+        ),
+        Row(
+            Button(
+                I18nFormat("ai-agent-btn"),
+                id="ai_agent_analytics",
+                on_click=on_clicks.on_analytics_ai_agent_click,
+            ),
+        ),
+    )
@@ -0,0 +1,38 @@
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery
+from aiogram_i18n import I18nContext
+
+from aiogram_dialog.widgets.kbd import Button  # noqa: F401
+from aiogram_dialog import DialogManager, ShowMode  # noqa: F401
+
+from ...keyboards.ai import exit_ai_agent_kb
+from ...states.ai import AIAgentMenu
+
+
+async def on_select_period_click(
+    call: CallbackQuery, widget: Button, manager: DialogManager, item_id: str
+):
+    manager.dialog_data["period"] = item_id
+
+
+async def on_analytics_ai_agent_click(
+    call: CallbackQuery,
+    widget: Button,
+    manager: DialogManager,
+):
+    """
+    Handle the click event for the AI analytics agent button.
+    """
+    await manager.done(show_mode=ShowMode.NO_UPDATE)
+    state: FSMContext = manager.middleware_data["state"]
+    i18n: I18nContext = manager.middleware_data["i18n"]
+    await call.message.edit_text(
+        i18n.get("ai-agent-analytics-text"),
+        reply_markup=exit_ai_agent_kb().as_markup(),
+    )
+    await state.set_state(AIAgentMenu.send_query)
+    call_data = {
+        "message_id": call.message.message_id,
+        "inline_message_id": call.inline_message_id,
+    }
+    await state.set_data({"prompt": "analytics_prompt", "call_data": call_data})
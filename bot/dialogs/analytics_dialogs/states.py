@@ -0,0 +1,9 @@
+from aiogram.fsm.state import StatesGroup, State  # noqa: F401
+
+
+class AnalyticsMenu(StatesGroup):
+    """
+    The analytics dashboard states.
+    """
+
+    select_period = State()
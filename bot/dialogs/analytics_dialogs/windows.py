@@ -0,0 +1,14 @@
+from aiogram_dialog import Window  # noqa: F401
+from aiogram_dialog.widgets.kbd import Cancel  # noqa: F401
+from aiogram_dialog.widgets.text import Const, Format  # noqa: F401
+
+from ...i18n.utils.i18n_format import I18nFormat
+from . import getters, keyboards, states  # noqa: F401
+
+analytics_menu_window = Window(
+    I18nFormat("analytics-dashboard-text"),
+    keyboards.analytics_menu_keyboard(),
+    Cancel(I18nFormat("back-btn")),
+    state=states.AnalyticsMenu.select_period,
+    getter=getters.analytics_dashboard_getter,
+)
@@ -29,5 +29,6 @@ dialogs = [
     Dialog(
         windows.send_regular_tasks_csv_file_window,
         windows.show_parse_regular_tasks_result_window,
+        windows.csv_import_progress_window,
     ),
 ]
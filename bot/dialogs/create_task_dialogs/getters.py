@@ -2,25 +2,26 @@ import datetime
 from pprint import pprint
 from typing import Sequence
 
-from aiogram.enums import ContentType
 from aiogram_dialog import DialogManager  # noqa: F401
 from aiogram.types import User
-from aiogram_dialog.api.entities import MediaAttachment
 from arq import ArqRedis
 
 from bot.db.models.models import User as UserDB, TaskCategory, WorkSchedule
 from bot.entities.task import TaskCreate, TaskControlPointCreate
 from bot.services.ai_agent.tools import TaskTools
-from bot.services.create_task_with_csv import create_csv_tasks_template
+from bot.services.csv_import_service import get_csv_import_state
+from bot.services.create_task_with_csv import get_tasks_template
+from bot.services.org_directory import get_org_directory
+from bot.services.work_calendar import get_work_calendar
+from bot.utils.documents import load_document
 from bot.utils.unitofwork import UnitOfWork
 
 
 async def get_user_hierarchy(
     dialog_manager: DialogManager, event_from_user: User, uow: UnitOfWork, **kwargs
 ):
-    return {
-        "hierarchy_level": await uow.users.get_user_hierarchy_level(event_from_user.id)
-    }
+    directory = await get_org_directory(uow)
+    return {"hierarchy_level": directory.level_of(event_from_user.id)}
 
 
 async def get_start_date_getter(
@@ -28,29 +29,18 @@ async def get_start_date_getter(
 ):
     executor_id = dialog_manager.dialog_data["executor_id"]
     datetime_now = datetime.datetime.now()
-    work_dates: Sequence[
-        WorkSchedule
-    ] = await uow.work_schedules.get_all_work_schedule_in_user(
-        int(executor_id),
-        from_date=datetime_now.date(),
-    )
-    work_dates_list = [work_date.date for work_date in work_dates]
-    min_date = min(work_dates_list) if work_dates_list else datetime_now.date()
-    if min_date == datetime_now.date():
-        current_work_schedule = next(
-            (ws for ws in work_dates if ws.date == min_date), None
-        )
-        if current_work_schedule and not (
-            current_work_schedule.start_time
-            <= datetime_now.time()
-            <= current_work_schedule.end_time
-        ):
-            work_dates_list.remove(min_date)
-            min_date = min(work_dates_list) if work_dates_list else None
-    start_date = min_date
+    calendar = await get_work_calendar(uow, int(executor_id))
+    work_dates = calendar.dates
+    today_shift = calendar.shift(datetime_now.date())
+    if today_shift and not (today_shift[0] <= datetime_now.time() <= today_shift[1]):
+        work_dates = work_dates - {datetime_now.date()}
+    if not calendar.dates:
+        start_date = datetime_now.date()
+    else:
+        start_date = min(work_dates) if work_dates else None
     return {
         "start_date": start_date,
-        "work_dates": work_dates_list,
+        "work_dates": work_dates,
     }
 
 
@@ -62,30 +52,21 @@ async def get_end_date_getter(
     dt_selected_start_date = datetime.datetime.strptime(
         selected_start_date, "%Y-%m-%d"
     ).date()
-    work_dates = await uow.work_schedules.get_all_work_schedule_in_user(
-        int(executor_id), from_date=dt_selected_start_date
-    )
+    calendar = await get_work_calendar(uow, int(executor_id))
     return {
         "start_date": dt_selected_start_date,
-        "work_dates": [work_date.date for work_date in work_dates],
+        "work_dates": calendar.work_dates(date_from=dt_selected_start_date),
     }
 
 
 async def get_executors_list(
     dialog_manager: DialogManager, event_from_user: User, uow: UnitOfWork, **kwargs
 ):
-    my_hierarchy_level = await uow.users.get_user_hierarchy_level(event_from_user.id)
-    executors_list_model: Sequence[UserDB] = await uow.users.get_users_without_me(
-        event_from_user.id, my_hierarchy_level
-    )
+    directory = await get_org_directory(uow)
     return {
         "executors_list": [
-            (
-                executor.id,
-                executor.full_name or executor.full_name_tg,
-                executor.position.title,
-            )
-            for executor in executors_list_model
+            (executor.id, executor.name, executor.position_title)
+            for executor in directory.executors_for(event_from_user.id)
         ]
     }
 
@@ -181,13 +162,13 @@ async def get_control_point_deadline_date_getter(
         start_data["task_end_datetime"], "%Y-%m-%d %H:%M"
     )
     executor_id = dialog_manager.start_data["executor_id"]
-    work_dates = await uow.work_schedules.get_all_work_schedule_in_user(
-        int(executor_id), from_date=start_datetime.date(), to_date=end_datetime.date()
+    calendar = await get_work_calendar(
+        uow, int(executor_id), date_to=end_datetime.date()
     )
     return {
         "start_date": start_datetime.date(),
         "end_date": end_datetime.date(),
-        "work_dates": [work_date.date for work_date in work_dates],
+        "work_dates": calendar.work_dates(start_datetime.date(), end_datetime.date()),
     }
 
 
@@ -261,18 +242,26 @@ async def excel_file_getter(
 ):
     start_data = dialog_manager.start_data or {}
     is_regular = start_data.get("is_regular", False)
-    my_hierarchy_level = await uow.users.get_user_hierarchy_level(event_from_user.id)
-    all_users_models: Sequence[UserDB] = await uow.users.get_users_without_me(
-        event_from_user.id, my_hierarchy_level
-    )
-    path_to_file = create_csv_tasks_template(all_users_models, is_regular=is_regular)
-    print(f"Path to file: {path_to_file}")
-    media = MediaAttachment(
-        type=ContentType.DOCUMENT,
-        path=path_to_file,
-    )
+    directory = await get_org_directory(uow)
+    return {
+        "csv_file": get_tasks_template(
+            directory, event_from_user.id, is_regular=is_regular
+        ),
+    }
+
+
+async def csv_import_progress_getter(
+    dialog_manager: DialogManager, event_from_user: User, **kwargs
+):
+    import_state = await get_csv_import_state(dialog_manager.dialog_data["csv_import_id"])
+    status = import_state.get("status", "failed")
     return {
-        "csv_file": media,
+        "status": status,
+        "processed": import_state.get("processed", 0),
+        "total": import_state.get("total", 0),
+        "error": import_state.get("error", "Імпорт не знайдено"),
+        "in_progress": status in ("queued", "running"),
+        "has_result": "result" in import_state,
     }
 
 
@@ -285,11 +274,8 @@ async def get_pared_data(
     result = dialog_manager.dialog_data["parsing_csv_result"]
     errors = result.get("errors", [])
     return {
-        "csv_file": MediaAttachment(
-            type=ContentType.DOCUMENT,
-            path=result.get("error_report_path"),
-        )
-        if result.get("error_report_path")
+        "csv_file": await load_document(result["error_report"])
+        if result.get("error_report")
         else None,
         "errors": errors,
         "created_count": result.get("tasks_created"),
@@ -1,5 +1,4 @@
 import datetime
-import os.path
 from _pydatetime import date
 
 from aiogram import Bot
@@ -15,12 +14,17 @@ from aiogram_dialog.widgets.input import ManagedTextInput, MessageInput  # noqa:
 from aiogram_dialog import DialogManager, ShowMode, ChatEvent  # noqa: F401
 
 from ...db.models.models import WorkSchedule
-from ...exceptions.user_exceptions import InvalidCSVFile
 from ...keyboards.ai import exit_ai_agent_kb
-from ...services.ai_agent.tools import TaskTools
-from ...services.create_task_with_csv import parse_tasks_csv
+from ...services.csv_import_manifest import delete_csv_manifest, new_csv_manifest_id
+from ...services.csv_import_service import (
+    cancel_csv_import,
+    get_csv_import_state,
+    submit_csv_import,
+)
 from ...states.ai import AIAgentMenu
 from ...utils.unitofwork import UnitOfWork
+from scheduler.deadlines import cancel_task_deadlines
+from scheduler.jobs import abort_import_batch_jobs
 
 
 async def on_start_create_task(
@@ -623,36 +627,9 @@ async def on_send_csv_file_click(
     widget: MessageInput,
     manager: DialogManager,
 ):
-    if not message.document:
-        await message.answer("Будь ласка, надішліть CSV файл.")
-        return
-    start_data = manager.start_data or {}
-    bot: Bot = manager.middleware_data["bot"]
-    uow: UnitOfWork = manager.middleware_data["uow"]
-    path_to_file = os.path.join(
-        "csv_files", f"regular_tasks_{message.from_user.id}.csv"
-    )
-    await bot.download(
-        message.document.file_id,
-        os.path.join("csv_files", f"regular_tasks_{message.from_user.id}.csv"),
-    )
-    task_tools = TaskTools(
-        uow=uow,
-        arq=manager.middleware_data["arq"],
-        user_id=message.from_user.id,
-    )
-    try:
-        result = await parse_tasks_csv(
-            path_to_file,
-            uow,
-            task_tools,
-            is_regular=start_data.get("is_regular", False),
-        )
-        manager.dialog_data["parsing_csv_result"] = result
-    except InvalidCSVFile as e:
-        await message.answer(f"Помилка в CSV файлі: \n\n<blockquote>{e}</blockquote>")
-        return
-    await manager.next()
+    # Нове завантаження - новий маніфест рядків
+    manager.dialog_data["csv_manifest_id"] = new_csv_manifest_id()
+    await submit_csv_file(message, manager)
 
 
 async def on_recheck_csv_file_click(
@@ -660,22 +637,52 @@ async def on_recheck_csv_file_click(
     widget: MessageInput,
     manager: DialogManager,
 ):
+    # Той самий маніфест: валідуються та імпортуються лише змінені рядки
+    manager.dialog_data.setdefault("csv_manifest_id", new_csv_manifest_id())
+    await submit_csv_file(message, manager)
+
+
+async def submit_csv_file(message: Message, manager: DialogManager):
+    if not message.document:
+        await message.answer("Будь ласка, надішліть CSV файл.")
+        return
     start_data = manager.start_data or {}
-    uow: UnitOfWork = manager.middleware_data["uow"]
-    path_to_file = os.path.join(
-        "csv_files", f"regular_tasks_{message.from_user.id}.csv"
-    )
-    task_tools = TaskTools(
-        uow=uow,
-        arq=manager.middleware_data["arq"],
+    # Файл обробляє воркер arq: обробник не тримає сесію БД і блокування подій
+    progress_message = await message.answer("⏳ Файл поставлено в чергу на обробку...")
+    manager.dialog_data["csv_import_id"] = await submit_csv_import(
+        manager.middleware_data["arq"],
         user_id=message.from_user.id,
+        chat_id=message.chat.id,
+        message_id=progress_message.message_id,
+        file_id=message.document.file_id,
+        is_regular=start_data.get("is_regular", False),
+        manifest_id=manager.dialog_data["csv_manifest_id"],
     )
-    is_regular = start_data.get("is_regular")
-    try:
-        result = await parse_tasks_csv(path_to_file, uow, task_tools, is_regular)
-        manager.dialog_data["parsing_csv_result"] = result
-    except InvalidCSVFile as e:
-        await message.answer(f"Помилка в CSV файлі: \n\n<blockquote>{e}</blockquote>")
+    await manager.switch_to(
+        states.CreateManyTasks.import_progress, show_mode=ShowMode.SEND
+    )
+
+
+async def on_cancel_csv_import(
+    call: CallbackQuery,
+    widget: Button,
+    manager: DialogManager,
+):
+    await cancel_csv_import(manager.dialog_data["csv_import_id"])
+    await call.answer("Імпорт буде зупинено після поточної пачки рядків")
+
+
+async def on_show_csv_import_result(
+    call: CallbackQuery,
+    widget: Button,
+    manager: DialogManager,
+):
+    import_state = await get_csv_import_state(manager.dialog_data["csv_import_id"])
+    if "result" not in import_state:
+        await call.answer("Імпорт ще виконується")
+        return
+    manager.dialog_data["parsing_csv_result"] = import_state["result"]
+    await manager.switch_to(states.CreateManyTasks.show_result)
 
 
 async def on_delete_create_task(
@@ -685,17 +692,26 @@ async def on_delete_create_task(
 ):
     uow: UnitOfWork = manager.middleware_data["uow"]
     arq: ArqRedis = manager.middleware_data["arq"]
-    parsing_csv_result = manager.dialog_data.get("parsing_csv_result", {})
-    created_tasks_ids = parsing_csv_result.get("created_tasks_ids", [])
+    # Пакет імпорту - маніфест завантаження: усі завдання, створені ним і повторними перевірками
+    import_batch_id = manager.dialog_data.get("csv_manifest_id")
+    if not import_batch_id:
+        await call.answer("Немає створених завдань для видалення", show_alert=True)
+        return
+    is_regular = (manager.start_data or {}).get("is_regular", False)
     try:
-        for created_task_id in created_tasks_ids:
-            if not created_task_id:
-                continue
-            await uow.tasks.delete_one(created_task_id)
-            # await abort_jobs(created_task_id)
+        if is_regular:
+            await uow.regular_tasks.delete_import_batch(import_batch_id)
+        else:
+            deleted_ids = await uow.tasks.delete_import_batch(import_batch_id)
     except Exception as e:
         await call.answer(f"Помилка при видаленні завдань: {e}", show_alert=True)
         await uow.rollback()
         return
     await uow.commit()
+    if not is_regular:
+        await cancel_task_deadlines(arq, deleted_ids)
+        await abort_import_batch_jobs(arq, import_batch_id)
+    # Видалені рядки при наступній перевірці мають імпортуватись знову
+    manager.dialog_data.pop("csv_manifest_id")
+    await delete_csv_manifest(import_batch_id)
     await call.answer("Завдання видалено", show_alert=True)
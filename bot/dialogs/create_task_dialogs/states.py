@@ -41,3 +41,4 @@ class CreateManyTasks(StatesGroup):
 
     send_csv_file = State()
     show_result = State()
+    import_progress = State()
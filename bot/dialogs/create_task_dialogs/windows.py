@@ -3,7 +3,7 @@ from pprint import pprint
 from aiogram.enums import ContentType
 from aiogram_dialog import StartMode, Window, Data, DialogManager
 from aiogram_dialog.widgets.input import TextInput, MessageInput
-from aiogram_dialog.widgets.kbd import Back, Button, Cancel, Next, Start
+from aiogram_dialog.widgets.kbd import Back, Button, Cancel, Next, Start, SwitchTo
 from aiogram_dialog.widgets.media import DynamicMedia
 from aiogram_dialog.widgets.text import Format, Multi, List, Const
 from magic_filter import F
@@ -318,3 +318,33 @@ show_parse_regular_tasks_result_window = Window(
     state=states.CreateManyTasks.show_result,
     getter=getters.get_pared_data,
 )
+
+
+csv_import_progress_window = Window(
+    I18nFormat("csv-import-progress-text"),
+    Button(
+        I18nFormat("csv-import-refresh-btn"),
+        id="refresh_csv_import",
+        when=F["in_progress"],
+    ),
+    Button(
+        I18nFormat("csv-import-cancel-btn"),
+        id="cancel_csv_import",
+        on_click=on_clicks.on_cancel_csv_import,
+        when=F["in_progress"],
+    ),
+    Button(
+        I18nFormat("csv-import-show-result-btn"),
+        id="show_csv_import_result",
+        on_click=on_clicks.on_show_csv_import_result,
+        when=F["has_result"],
+    ),
+    SwitchTo(
+        I18nFormat("back-btn"),
+        id="back_to_send_csv_file",
+        state=states.CreateManyTasks.send_csv_file,
+        when=~F["in_progress"],
+    ),
+    state=states.CreateManyTasks.import_progress,
+    getter=getters.csv_import_progress_getter,
+)
@@ -1,10 +1,10 @@
 from aiogram_dialog.widgets.kbd import (
     Group,
     Start,
-    Button,
 )
 from magic_filter import F
 
+from ..analytics_dialogs.states import AnalyticsMenu
 from ..categories_menu_dialogs.states import CategoryMenu
 from ..create_task_dialogs.states import CreateTaskMenu
 
@@ -14,7 +14,7 @@ from ..manage_personal_dialogs.states import (
 )
 from ..task_menu_dialogs.states import MyTasks
 from ...i18n.utils.i18n_format import I18nFormat
-from . import on_clicks
+from . import on_clicks  # noqa: F401
 
 
 def main_menu_keyboard():
@@ -47,10 +47,10 @@ def main_menu_keyboard():
                 state=CategoryMenu.select_action,
                 when=F["hierarchy_level"].in_([1, 2, 3]),
             ),
-            Button(
+            Start(
                 I18nFormat("analytics-btn"),
                 id="analytics",
-                on_click=on_clicks.on_analytics_click,
+                state=AnalyticsMenu.select_period,
                 when=F["hierarchy_level"].in_([1, 2, 3]),
             ),
             width=2,
@@ -1,7 +1,4 @@
-from aiogram.exceptions import TelegramRetryAfter
-from aiogram.fsm.context import FSMContext
-from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
-from aiogram_i18n import I18nContext
+from aiogram.types import Message
 
 from . import states, getters, on_clicks  # noqa: F401
 from aiogram_dialog.widgets.kbd import Button, Select  # noqa: F401
@@ -9,8 +6,6 @@ from aiogram_dialog.widgets.input import ManagedTextInput, MessageInput  # noqa:
 from aiogram_dialog import DialogManager, StartMode, ShowMode  # noqa: F401
 
 from ...db.models.models import Positions
-from ...keyboards.ai import exit_ai_agent_kb
-from ...states.ai import AIAgentMenu
 from ...utils.unitofwork import UnitOfWork
 
 
@@ -45,25 +40,3 @@ async def on_enter_full_name_click(
     await uow.commit()
     await manager.start(states.MainMenu.select_action, mode=StartMode.RESET_STACK)
 
-
-async def on_analytics_click(
-    call: CallbackQuery,
-    widget: Button,
-    manager: DialogManager,
-):
-    """
-    Handle the click event for the Analytics button.
-    """
-    await manager.done(show_mode=ShowMode.NO_UPDATE)
-    state: FSMContext = manager.middleware_data["state"]
-    i18n: I18nContext = manager.middleware_data["i18n"]
-    await call.message.edit_text(
-        i18n.get("ai-agent-analytics-text"),
-        reply_markup=exit_ai_agent_kb().as_markup(),
-    )
-    await state.set_state(AIAgentMenu.send_query)
-    call_data = {
-        "message_id": call.message.message_id,
-        "inline_message_id": call.inline_message_id,
-    }
-    await state.set_data({"prompt": "analytics_prompt", "call_data": call_data})
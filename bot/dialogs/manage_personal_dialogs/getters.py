@@ -1,12 +1,11 @@
 import datetime
 import calendar
 
-from aiogram.enums import ContentType
 from aiogram_dialog import DialogManager  # noqa: F401
 from aiogram.types import User
-from aiogram_dialog.api.entities import MediaAttachment
 
 from bot.services.csv_service import create_work_schedule_csv
+from bot.utils.documents import DocumentAttachment
 from bot.utils.unitofwork import UnitOfWork
 
 
@@ -81,14 +80,10 @@ async def excel_file_getter(
     )
 
     users = await uow.users.get_all_users_with_schedule(date_from, date_to)
-    template_csv_file_path = create_work_schedule_csv(
-        users, month=current_month, year=current_year
-    )
-    dialog_manager.dialog_data["path_to_csv_file"] = template_csv_file_path
     return {
-        "template_csv_file": MediaAttachment(
-            path=template_csv_file_path,
-            type=ContentType.DOCUMENT,
+        "template_csv_file": DocumentAttachment(
+            create_work_schedule_csv(users, month=current_month, year=current_year),
+            filename=f"work_schedule_{current_month}_{current_year}.csv",
         ),
     }
 
@@ -114,14 +109,13 @@ async def work_schedule_getter(
     date_to = datetime.datetime(year=year, month=month, day=days_in_month)
 
     users = await uow.users.get_all_users_with_schedule(date_from, date_to)
-    path_to_csv_file = create_work_schedule_csv(users, month=month, year=year)
 
     month_name = calendar.month_name[month].capitalize()
 
     return {
-        "work_schedule_csv_file": MediaAttachment(
-            path=path_to_csv_file,
-            type=ContentType.DOCUMENT,
+        "work_schedule_csv_file": DocumentAttachment(
+            create_work_schedule_csv(users, month=month, year=year),
+            filename=f"work_schedule_{month}_{year}.csv",
         ),
         "month": month_name,
         "year": str(year),
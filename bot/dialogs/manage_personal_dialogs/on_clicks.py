@@ -1,6 +1,5 @@
 import logging
 import os.path
-from contextlib import suppress
 
 from aiogram import Bot
 from aiogram.fsm.context import FSMContext
@@ -58,8 +57,6 @@ async def on_send_csv_file_click(
     if message.document.mime_type != "text/csv":
         return await message.answer("Файл повинен бути .csv файлом.")
     bot: Bot = manager.middleware_data["bot"]
-    with suppress(FileNotFoundError):
-        os.remove(manager.dialog_data["path_to_csv_file"])
     await bot.download(
         message.document.file_id,
         os.path.join("csv_files", message.document.file_name),
@@ -1,5 +1,4 @@
 import datetime
-from pprint import pprint
 
 from aiogram.types import User  # noqa: F401
 from aiogram_dialog import DialogManager  # noqa: F401
@@ -9,8 +8,10 @@ from aiogram_dialog.widgets.kbd import ManagedRadio
 from aiogram_i18n import I18nContext
 
 from bot.db.models.models import TaskControlPoints
-from bot.entities.shared import TaskReadExtended
+from bot.entities.shared import TaskDetailRead, TaskReadExtended
 from bot.entities.task import TaskRead
+from bot.i18n.utils.catalog import TASK_STATUS_EMOJI_KEYS, TASK_STATUS_KEYS
+from bot.services.org_directory import get_org_directory
 from bot.utils.enum import TaskStatus
 from bot.utils.misc import is_task_hot
 from bot.utils.unitofwork import UnitOfWork
@@ -106,16 +107,10 @@ async def my_tasks_getter(
     my_tasks = await uow.tasks.get_all_task_simple(**task_find_filter)
 
     my_tasks = [TaskRead.model_validate(task) for task in my_tasks]
-    task_status_mapper = {
-        TaskStatus.IN_PROGRESS: i18n.get("task-status-in-progress-emoji"),
-        TaskStatus.NEW: i18n.get("task-status-new-emoji"),
-        TaskStatus.COMPLETED: i18n.get("task-status-completed-emoji"),
-        TaskStatus.CANCELED: i18n.get("task-status-canceled-emoji"),
-        TaskStatus.OVERDUE: i18n.get("task-status-overdue-emoji"),
-    }
-    user_level = await uow.users.get_user_hierarchy_level(event_from_user.id)
+    task_status_mapper = i18n.core.get_mapping(TASK_STATUS_EMOJI_KEYS, i18n.locale)
+    directory = await get_org_directory(uow)
     return {
-        "show_ai": user_level <= 3,
+        "show_ai": directory.is_manager(event_from_user.id),
         "task_list": [
             (
                 task.id,
@@ -151,44 +146,29 @@ async def get_task(
     report_text_list = []
     start_data = dialog_manager.start_data or {}
     task_id = dialog_manager.dialog_data.get("task_id", start_data.get("task_id"))
-    task_dict = await uow.tasks.get_task_by_id(task_id, update_cache=True)
-    task = TaskReadExtended.model_validate(task_dict)
-    if task.reports:
-        for report in task.reports:
-            report_content_model = await uow.task_report_contents.find_all(
-                report_id=report.id
+    task_dict = await uow.tasks.get_task_detail(task_id)
+    task = TaskDetailRead.model_validate(task_dict)
+    for report in task.reports:
+        report_text_list.append(report.report_text)
+        for content in report.content:
+            report_content_list.append(
+                MediaAttachment(
+                    file_id=MediaId(
+                        file_id=content.file_id,
+                        file_unique_id=content.file_unique_id,
+                    ),
+                    type=content.content_type,
+                )
             )
-            report_text_list.append(report.report_text)
-            for content in report_content_model:
-                report_content_list.append(
-                    MediaAttachment(
-                        file_id=MediaId(
-                            file_id=content.file_id,
-                            file_unique_id=content.file_unique_id,
-                        ),
-                        type=content.content_type,
-                    )
-                )  # Append the report itself to the content list
 
-    task_emoji_status_mapper = {
-        TaskStatus.IN_PROGRESS: i18n.get("task-status-in-progress-emoji"),
-        TaskStatus.NEW: i18n.get("task-status-new-emoji"),
-        TaskStatus.COMPLETED: i18n.get("task-status-completed-emoji"),
-        TaskStatus.CANCELED: i18n.get("task-status-canceled-emoji"),
-        TaskStatus.OVERDUE: i18n.get("task-status-overdue-emoji"),
-    }
-    task_status_mapper = {
-        TaskStatus.IN_PROGRESS: i18n.get("task-status-in-progress"),
-        TaskStatus.NEW: i18n.get("task-status-new"),
-        TaskStatus.COMPLETED: i18n.get("task-status-completed"),
-        TaskStatus.CANCELED: i18n.get("task-status-canceled"),
-        TaskStatus.OVERDUE: i18n.get("task-status-overdue"),
-    }
+    task_emoji_status_mapper = i18n.core.get_mapping(
+        TASK_STATUS_EMOJI_KEYS, i18n.locale
+    )
+    task_status_mapper = i18n.core.get_mapping(TASK_STATUS_KEYS, i18n.locale)
     dialog_manager.dialog_data["photo_required"] = task.photo_required
     dialog_manager.dialog_data["video_required"] = task.video_required
     dialog_manager.dialog_data["file_required"] = task.file_required
     dialog_manager.dialog_data["title"] = task.title
-    pprint(task)
     data = {
         "report_media_list": report_content_list,
         "report_texts": "\n".join(
@@ -13,6 +13,7 @@ from aiogram_i18n import I18nContext
 
 from configreader import KYIV
 from ...db.models.models import TaskControlPoints
+from ...db.redis import bump_task_versions
 from ...entities.shared import TaskReadExtended
 from ...keyboards.ai import exit_ai_agent_kb
 from ...services.log_service import LogService
@@ -429,7 +430,7 @@ async def on_update_task_click(
     start_data = manager.start_data or {}
     task_id = manager.dialog_data.get("task_id", start_data.get("task_id"))
 
-    await uow.tasks.get_task_by_id(task_id, update_cache=True)
+    await bump_task_versions([task_id])
     await call.answer(i18n.get("task-updated-alert"))
 
 
@@ -0,0 +1,54 @@
+import datetime
+from typing import Literal, TypeAlias
+
+from pydantic import BaseModel
+
+TREND_BUCKET: TypeAlias = Literal["day", "week", "month"]
+
+
+class TaskStatsRead(BaseModel):
+    """Агреговані показники виконання завдань за період."""
+
+    total: int = 0
+    """Загальна кількість завдань."""
+    new: int = 0
+    """Кількість нових завдань."""
+    in_progress: int = 0
+    """Кількість завдань у роботі."""
+    completed: int = 0
+    """Кількість виконаних завдань."""
+    canceled: int = 0
+    """Кількість скасованих завдань."""
+    overdue: int = 0
+    """Кількість прострочених завдань (статус OVERDUE або дедлайн минув, а завдання не закрите)."""
+    completed_late: int = 0
+    """Кількість завдань, виконаних після дедлайну."""
+    completion_rate: float = 0.0
+    """Частка виконаних завдань серед нескасованих, від 0 до 1."""
+    avg_lateness_minutes: float | None = None
+    """Середнє запізнення в хвилинах для завдань, виконаних після дедлайну."""
+
+
+class ExecutorStatsRead(TaskStatsRead):
+    """Показники виконання завдань для одного виконавця."""
+
+    executor_id: int
+    """ID виконавця."""
+    full_name: str | None = None
+    """ПІБ виконавця."""
+
+
+class CategoryStatsRead(TaskStatsRead):
+    """Показники виконання завдань для однієї категорії."""
+
+    category_id: int | None = None
+    """ID категорії. None для завдань без категорії."""
+    category_name: str | None = None
+    """Назва категорії."""
+
+
+class TaskTrendRead(TaskStatsRead):
+    """Показники виконання завдань за один часовий інтервал."""
+
+    bucket: datetime.date
+    """Початок інтервалу (день, тиждень або місяць)."""
@@ -1,6 +1,19 @@
+import datetime
+from typing import Literal
+
 from pydantic import BaseModel
 
 
+class ScheduleRowStatus(BaseModel):
+    """
+    Outcome of one work schedule in a schedule creation operation.
+    """
+
+    user_id: int
+    date: datetime.date
+    status: Literal["created", "updated"]
+
+
 class ScheduleCreationResult(BaseModel):
     """
     Represents the result of a schedule creation operation.
@@ -8,3 +21,5 @@ class ScheduleCreationResult(BaseModel):
 
     created_count: int
     existing_count: int
+    """Schedules that already existed for the user and date and were updated"""
+    schedules: list[ScheduleRowStatus] = []
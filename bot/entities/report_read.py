@@ -1,5 +1,6 @@
 import datetime
 
+from aiogram.enums import ContentType
 from pydantic import BaseModel, field_validator
 
 from configreader import KYIV
@@ -26,3 +27,24 @@ class TaskReportRead(BaseModel):
             else:
                 v = v.astimezone(KYIV)  # приводим к Киеву, если было в другой зоне
         return v
+
+
+class TaskReportContentRead(BaseModel):
+    """
+    Represents a task report content read model.
+    Media (photo, video, document) attached to the report by its Telegram file ID.
+    """
+
+    id: int
+    report_id: int
+    file_id: str
+    file_unique_id: str
+    content_type: ContentType
+
+
+class TaskReportReadExtended(TaskReportRead):
+    """
+    Represents a task report read model with its media content.
+    """
+
+    content: list[TaskReportContentRead] = []
@@ -1,8 +1,8 @@
 from typing import Optional
 
-from bot.entities.report_read import TaskReportRead
+from bot.entities.report_read import TaskReportRead, TaskReportReadExtended
 from bot.entities.task import TaskRead, TaskCategoryRead, TaskControlPointRead
-from bot.entities.users import UserRead, WorkScheduleRead
+from bot.entities.users import UserRead, UserShortRead, WorkScheduleRead
 
 
 class TaskReadExtended(TaskRead):
@@ -10,9 +10,9 @@ class TaskReadExtended(TaskRead):
 
     category: Optional["TaskCategoryRead"] = None
     """Категорія завдання. Може бути None, якщо категорія була видалена."""
-    creator: Optional["UserRead"] = None
+    creator: Optional["UserShortRead"] = None
     """Користувач, який створив завдання."""
-    executor: Optional["UserRead"] = None
+    executor: Optional["UserShortRead"] = None
     """Користувач, який виконує завдання."""
     control_points: list["TaskControlPointRead"] | None = None
     """Список контрольних точок звіту завдання. Може бути None, якщо контрольні точки не передбачені."""
@@ -29,3 +29,10 @@ class UserReadExtended(UserRead):
     """Список завдань, створених користувачем. Використовується для відстеження завдань, які користувач створив."""
     executed_tasks: list["TaskRead"] = []
     # reports: list["TaskReportRead"] = []
+
+
+class TaskDetailRead(TaskReadExtended):
+    """Модель для детального перегляду завдання, включає звіти разом з їх медіа-контентом."""
+
+    reports: list["TaskReportReadExtended"] = []
+    """Список звітів завдання з прикріпленими медіа."""
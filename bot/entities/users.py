@@ -5,13 +5,18 @@ from pydantic import BaseModel, field_validator
 from configreader import KYIV
 
 
-class HierarchyLevelRead(BaseModel):
-    """Модель для читання даних рівня ієрархії користувача з бази даних."""
+class HierarchyLevelShortRead(BaseModel):
+    """Модель для читання рівня ієрархії без промптів."""
 
     id: int
     """Унікальний ідентифікатор рівня ієрархії в базі даних."""
     level: int
     """Назва рівня ієрархії користувача."""
+
+
+class HierarchyLevelRead(HierarchyLevelShortRead):
+    """Модель для читання даних рівня ієрархії користувача з бази даних."""
+
     create_task_prompt: str | None = None
     """Промпт для завдання, який використовується"""
     work_schedule_prompt: str | None = None
@@ -22,8 +27,8 @@ class HierarchyLevelRead(BaseModel):
     """Промпт для аналітики, який використовується"""
 
 
-class PositionRead(BaseModel):
-    """Модель для читання даних позиції користувача з бази даних."""
+class PositionShortRead(BaseModel):
+    """Модель для читання позиції користувача з рівнем ієрархії без промптів."""
 
     id: int
     """Унікальний ідентифікатор позиції користувача в базі даних."""
@@ -31,6 +36,12 @@ class PositionRead(BaseModel):
     """Назва посади користувача."""
     hierarchy_level_id: int | None = None
     """ID рівня ієрархії, до якого належить позиція користувача."""
+    hierarchy_level: HierarchyLevelShortRead | None = None
+
+
+class PositionRead(PositionShortRead):
+    """Модель для читання даних позиції користувача з бази даних."""
+
     hierarchy_level: HierarchyLevelRead | None = None
 
 
@@ -64,6 +75,13 @@ class UserRead(BaseModel):
         return v
 
 
+class UserShortRead(UserRead):
+    """Модель для читання користувача, вкладеного в завдання. Не містить промптів рівня ієрархії."""
+
+    position: PositionShortRead | None = None
+    """Дані позиції користувача."""
+
+
 class WorkScheduleRead(BaseModel):
     """Модель для читання даних робочого графіку користувача з бази даних."""
 
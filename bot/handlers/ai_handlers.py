@@ -18,7 +18,7 @@ from redis import Redis
 
 from bot.dialogs.main_menu_dialogs.states import MainMenu
 from bot.keyboards.ai import exit_ai_agent_kb
-from bot.middleware.throttling import ThrottlingMiddleware
+from bot.middleware.throttling import ThrottlingMiddleware, ThrottlingRule
 from bot.services.ai_agent.main import AIAgent
 from bot.services.ai_agent.prompts import (
     generate_prompt,
@@ -26,6 +26,7 @@ from bot.services.ai_agent.prompts import (
     generate_prompt_without_history,
 )
 from bot.services.ai_agent.tools_manager import Tools
+from bot.services.ai_queue import AIQueueFull, ai_request_queue
 from bot.services.ai_service import run_ai_generation_with_loader
 from bot.services.log_service import LogService
 from bot.states.ai import AIAgentMenu
@@ -34,7 +35,10 @@ from bot.utils.unitofwork import UnitOfWork
 from configreader import config
 
 router = Router()
-router.message.middleware(ThrottlingMiddleware(ai=2.5))
+# An AI query costs 2 tokens: a burst of two queries, then one per 2.5 s
+router.message.middleware(
+    ThrottlingMiddleware(ai=ThrottlingRule(capacity=4, refill_per_second=0.8))
+)
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +62,7 @@ async def cancel_ai_agent(
     F.content_type.in_([ContentType.TEXT, ContentType.VOICE]),
 )
 @flags.throttling_key("ai")
+@flags.throttling_cost(2)
 async def start_ai_agent(
     message: Message,
     uow: UnitOfWork,
@@ -96,7 +101,9 @@ async def start_ai_agent(
     else:
         await message.answer(i18n.get("ai-agent-doesnt-support-this-content-type"))
         return
-    state_data.setdefault("query_history", []).append(message_text)
+    query_history = [*state_data.get("query_history", []), message_text]
+    # Історія зберігається одразу: запит, скасований новим, в ній залишається
+    await state.update_data(query_history=query_history)
     task_tools = Tools(uow=UnitOfWork(), arq=arq, bot=bot, user_id=message.from_user.id)
     hierarchy_level_model = await uow.users.get_user_hierarchy_prompt(
         message.from_user.id
@@ -131,33 +138,70 @@ async def start_ai_agent(
         log_service=channel_log,
         tools=task_tools.get_datetime_tools(),
     )
-    if len(state_data["query_history"]) == 1:
-        await ai_agent.clear_history()
-    await bot.send_chat_action(chat_id=message.chat.id, action="typing")
-    msg = await msg.edit_text("ㅤ", reply_markup=exit_ai_agent_kb().as_markup())
-    answer_text = await run_ai_generation_with_loader(
-        ai_agent,
-        formatter_ai_agent,
-        msg,
-        message_text,
-        channel_log,
-    )
-    try:
-        msg = await msg.edit_text(
-            answer_text, reply_markup=exit_ai_agent_kb().as_markup()
-        )
-    except TelegramBadRequest:
+    async def on_position(position: int) -> None:
         try:
-            msg = await msg.edit_text(
-                answer_text,
+            await msg.edit_text(
+                i18n.get("ai-agent-queue-position-text", position=position),
                 reply_markup=exit_ai_agent_kb().as_markup(),
-                parse_mode=ParseMode.MARKDOWN,
             )
         except TelegramBadRequest as e:
-            logger.error("Failed to edit message with Markdown: %s", e)
+            logger.info("Failed to edit queue position: %s", e)
+
+    async def on_cancel() -> None:
+        try:
+            await msg.edit_text(i18n.get("ai-agent-request-canceled-text"))
+        except TelegramBadRequest as e:
+            logger.info("Failed to edit canceled request: %s", e)
+
+    async def answer() -> None:
+        nonlocal msg
+        if len(query_history) == 1:
+            await ai_agent.clear_history()
+        await bot.send_chat_action(chat_id=message.chat.id, action="typing")
+        msg = await msg.edit_text("ㅤ", reply_markup=exit_ai_agent_kb().as_markup())
+        answer_text = await run_ai_generation_with_loader(
+            ai_agent,
+            formatter_ai_agent,
+            msg,
+            message_text,
+            channel_log,
+        )
+        try:
             msg = await msg.edit_text(
-                "Виникла помилка. Спробуйте ще раз",
-                reply_markup=exit_ai_agent_kb().as_markup(),
+                answer_text, reply_markup=exit_ai_agent_kb().as_markup()
             )
-    state_data.update(call_data=dict(message_id=msg.message_id))
-    await state.set_data(state_data)
+        except TelegramBadRequest:
+            try:
+                msg = await msg.edit_text(
+                    answer_text,
+                    reply_markup=exit_ai_agent_kb().as_markup(),
+                    parse_mode=ParseMode.MARKDOWN,
+                )
+            except TelegramBadRequest as e:
+                logger.error("Failed to edit message with Markdown: %s", e)
+                msg = await msg.edit_text(
+                    "Виникла помилка. Спробуйте ще раз",
+                    reply_markup=exit_ai_agent_kb().as_markup(),
+                )
+        # Поки запит виконувався, стан міг змінитись (новий запит, вихід з агента):
+        # тоді повідомлення з кнопкою вже не останнє і call_data не перезаписується
+        if await state.get_state() != AIAgentMenu.send_query.state:
+            return
+        current_data = await state.get_data()
+        if current_data.get("query_history") != query_history:
+            return
+        await state.set_data(
+            {**current_data, "call_data": dict(message_id=msg.message_id)}
+        )
+
+    # Відповідь генерується у фоні: обробник завершується, звільняючи сесію БД
+    # та блокування FSM, поки запит чекає в черзі та на відповідь LLM
+    try:
+        ai_request_queue.submit(
+            message.from_user.id, answer, on_position=on_position, on_cancel=on_cancel
+        )
+    except AIQueueFull:
+        await msg.edit_text(
+            i18n.get("ai-agent-queue-full-text"),
+            reply_markup=exit_ai_agent_kb().as_markup(),
+        )
@@ -0,0 +1,94 @@
+"""
+Вартість текстів для списку з 50 завдань: FluentRuntimeCore проти FluentCatalogCore.
+
+    python -m bot.i18n.benchmark --tasks 50 --renders 2000
+
+- list: словник статусів для списку завдань (окремі get для кожного статусу
+  проти get_mapping з запам'ятованими текстами).
+- notifications: одне повідомлення з аргументами для кожного завдання
+  (get на кожне проти get_many).
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from aiogram_i18n.cores import FluentRuntimeCore
+
+from bot.i18n.utils.catalog import FluentCatalogCore, TASK_STATUS_EMOJI_KEYS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LOCALE = "uk"
+NOTIFICATION_KEY = "task_started_now_executor_notification"
+
+
+def render_list_runtime(core: FluentRuntimeCore, titles: list[str]) -> list[str]:
+    mapper = {
+        status: core.get(key, LOCALE) for status, key in TASK_STATUS_EMOJI_KEYS.items()
+    }
+    statuses = list(mapper)
+    return [
+        f"{mapper[statuses[index % len(statuses)]]} {title} "
+        for index, title in enumerate(titles)
+    ]
+
+
+def render_list_catalog(core: FluentCatalogCore, titles: list[str]) -> list[str]:
+    mapper = core.get_mapping(TASK_STATUS_EMOJI_KEYS, LOCALE)
+    statuses = list(mapper)
+    return [
+        f"{mapper[statuses[index % len(statuses)]]} {title} "
+        for index, title in enumerate(titles)
+    ]
+
+
+def notifications_runtime(core: FluentRuntimeCore, titles: list[str]) -> list[str]:
+    return [core.get(NOTIFICATION_KEY, LOCALE, task_title=title) for title in titles]
+
+
+def notifications_catalog(core: FluentCatalogCore, titles: list[str]) -> list[str]:
+    return core.get_many(
+        NOTIFICATION_KEY, LOCALE, ({"task_title": title} for title in titles)
+    )
+
+
+def per_render_us(render, core, titles: list[str], renders: int) -> float:
+    started = time.perf_counter()
+    for _ in range(renders):
+        render(core, titles)
+    return (time.perf_counter() - started) / renders * 1_000_000
+
+
+async def run_benchmark(path: str, tasks: int, renders: int) -> None:
+    runtime = FluentRuntimeCore(path=path)
+    catalog = FluentCatalogCore(path=path)
+    await runtime.startup()
+    await catalog.startup()
+    titles = [f"Завдання {index}" for index in range(tasks)]
+    for name, runtime_render, catalog_render in (
+        ("list", render_list_runtime, render_list_catalog),
+        ("notifications", notifications_runtime, notifications_catalog),
+    ):
+        before = per_render_us(runtime_render, runtime, titles, renders)
+        after = per_render_us(catalog_render, catalog, titles, renders)
+        logger.info("%-13s runtime %8.1f us, catalog %8.1f us", name, before, after)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fluent catalog benchmark")
+    parser.add_argument(
+        "--path",
+        default=os.path.join("bot", "i18n", "locales", "{locale}", "LC_MESSAGES"),
+    )
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--renders", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.path, args.tasks, args.renders))
+
+
+if __name__ == "__main__":
+    main()
@@ -84,6 +84,9 @@ delete-category-btn = 🗑️ Видалити категорію
 confirm-btn = ✅ Підтвердити
 ai-agent-doesnt-support-this-content-type = ⚠️ Цей тип контенту не підтримується AI агентом.
     Будь ласка, спробуйте інший тип контенту або зверніться до адміністратора.
+ai-agent-queue-position-text = <i>Ваш запит у черзі: {$position}</i>
+ai-agent-request-canceled-text = <i>Запит скасовано новим запитом.</i>
+ai-agent-queue-full-text = Зараз забагато запитів. Спробуйте ще раз за хвилину
 ai-agent-send-query-text-1 = 👑 Вітаю, {$full_name}!
 
     Я ваш AI-помічник у Botanic Flower Group.
@@ -312,6 +315,29 @@ task_started_now_executor_notification = ✅ Задача <b>{$task_title}</b> 
 task_updated_notification = ℹ️ Завдання <b>{$task_title}</b> оновлено.
     Перейдіть до перегляду
 analytics-btn = 📊Аналітика
+analytics-dashboard-text = <b>📊 Аналітика завдань</b>
+    <i>{$date_from} - {$date_to}</i>
+
+    <blockquote><b>Всього:</b> {$total}
+    <b>✅ Виконано:</b> {$completed} ({$completion_rate})
+    <b>⏳ В роботі:</b> {$in_progress}
+    <b>❌ Скасовано:</b> {$canceled}
+    <b>🔴 Прострочено:</b> {$overdue}
+    <b>🐢 Виконано із запізненням:</b> {$completed_late}
+    <b>Середнє запізнення:</b> {$avg_lateness} хв.</blockquote>
+
+    <b>👥 Виконавці:</b>
+    {$executors}
+
+    <b>🗂️ Категорії:</b>
+    {$categories}
+analytics-period-week = 7 днів
+analytics-period-month = Місяць
+analytics-period-quarter = 90 днів
+analytics-stats-line = {" "}- {$title}: {$completed}/{$total} ({$completion_rate}), прострочено {$overdue}
+analytics-no-category = Без категорії
+analytics-no-stats-lines = {" "}-
+analytics-no-lateness = -
 ai-agent-analytics-send-query-text = <b>🤖 Аналітика та статистика</b>
     <blockquote>Я ваш AI-помічник у Botanic Flower Group.</blockquote>
 
@@ -683,4 +709,17 @@ parse-regular-tasks-result-text = <b>Результати створення р
 
     <blockquote><b>Створено:</b> {$created_count} завдань
     <b>Помилки:</b> {$errors_count} шт.</blockquote>
-delete-create-task-btn = ❌ Видалити створені завдання
\ No newline at end of file
+delete-create-task-btn = ❌ Видалити створені завдання
+csv-import-progress-text = <b>📥 Імпорт завдань з CSV</b>
+
+    { $status ->
+        [queued] ⏳ Файл у черзі на обробку...
+        [running] ⚙️ Оброблено рядків: {$processed} з {$total}
+        [done] ✅ Імпорт завершено.
+        [canceled] ⛔ Імпорт скасовано. Оброблено рядків: {$processed} з {$total}
+       *[failed] ❌ Помилка в CSV файлі:
+            <blockquote>{$error}</blockquote>
+    }
+csv-import-refresh-btn = 🔄 Оновити
+csv-import-cancel-btn = ⛔ Скасувати імпорт
+csv-import-show-result-btn = 📋 Показати результат
\ No newline at end of file
@@ -0,0 +1,93 @@
+from typing import Any, Hashable, Iterable, Mapping, Optional, TypeVar
+
+from aiogram_i18n.cores import FluentRuntimeCore
+from aiogram_i18n.exceptions import FluentMessageError
+
+from bot.utils.enum import TaskStatus
+
+K = TypeVar("K", bound=Hashable)
+
+TASK_STATUS_KEYS: dict[TaskStatus, str] = {
+    TaskStatus.IN_PROGRESS: "task-status-in-progress",
+    TaskStatus.NEW: "task-status-new",
+    TaskStatus.COMPLETED: "task-status-completed",
+    TaskStatus.CANCELED: "task-status-canceled",
+    TaskStatus.OVERDUE: "task-status-overdue",
+}
+TASK_STATUS_EMOJI_KEYS: dict[TaskStatus, str] = {
+    status: f"{key}-emoji" for status, key in TASK_STATUS_KEYS.items()
+}
+
+
+class FluentCatalogCore(FluentRuntimeCore):
+    """
+    FluentRuntimeCore, який компілює всі повідомлення під час старту
+    та запам'ятовує повідомлення без аргументів для кожної локалі.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._static_messages: dict[tuple[str | None, str], str] = {}
+
+    async def startup(self) -> None:
+        await super().startup()
+        self._static_messages.clear()
+        self.precompile()
+
+    def precompile(self) -> None:
+        """FluentBundle компілює повідомлення ліниво, тут це робиться один раз."""
+        for bundle in self.locales.values():
+            for message_id in list(bundle._messages):
+                bundle.get_message(message_id)
+
+    def get(
+        self, message: str, locale: Optional[str] = None, /, **kwargs: Any
+    ) -> str:
+        if kwargs:
+            return super().get(message, locale, **kwargs)
+        cache_key = (locale, message)
+        text = self._static_messages.get(cache_key)
+        if text is None:
+            text = super().get(message, locale)
+            self._static_messages[cache_key] = text
+        return text
+
+    def get_many(
+        self,
+        message: str,
+        locale: Optional[str],
+        args_list: Iterable[Mapping[str, Any]],
+    ) -> list[str]:
+        """
+        Форматує одне повідомлення з багатьма наборами аргументів
+        (рядки статистики, пакети сповіщень). Пошук повідомлення виконується один раз,
+        з тим самим переходом на локаль з locales_map, що і в get.
+        """
+        args_list = list(args_list)
+        requested_locale = self.get_locale(locale=locale)
+        current_locale: str | None = requested_locale
+        while current_locale is not None:
+            bundle = self.get_translator(locale=current_locale)
+            if bundle.has_message(message):
+                fluent_message = bundle.get_message(message)
+                if fluent_message.value is not None:
+                    break
+            current_locale = self.locales_map.get(current_locale)
+        else:
+            # Повідомлення немає: KeyNotFoundError або сам ключ, як у get
+            return [
+                super().get(message, requested_locale, **args) for args in args_list
+            ]
+        texts = []
+        for args in args_list:
+            text, errors = bundle.format_pattern(fluent_message.value, dict(args))
+            if errors:
+                raise FluentMessageError(message_id=message, errors=errors)
+            texts.append(text)
+        return texts
+
+    def get_mapping(
+        self, keys: Mapping[K, str], locale: Optional[str]
+    ) -> dict[K, str]:
+        """Словник {ключ: перекладений текст} для повідомлень без аргументів."""
+        return {key: self.get(message, locale) for key, message in keys.items()}
@@ -1,3 +1,4 @@
+from functools import cache
 from typing import Any, Dict, Protocol
 
 from aiogram_dialog.api.protocols import DialogManager
@@ -6,7 +7,7 @@ from aiogram_dialog.widgets.text import Text
 from fluent.runtime import FluentLocalization, FluentResourceLoader
 
 from bot.db.redis import set_user_locale
-from bot.middleware.i18n_dialog import I18nDialogMiddleware
+from bot.middleware.i18n_dialog import remember_user_locale
 from configreader import config
 
 
@@ -19,24 +20,25 @@ def default_format_text(text: str, data: Values) -> str:
     return text.format_map(data)
 
 
-async def update_locale(locale: str, user_id: int, manager: DialogManager) -> None:
-    loader = FluentResourceLoader(config.path_to_locales)
-    LOCALES = ["uk"]
-    l10ns = {
-        locale: FluentLocalization(
-            [
-                locale,
-            ],
-            ["messages.ftl"],
-            loader,
-        )
+LOCALES = ["uk"]
+
+
+@cache
+def get_l10ns(
+    path_to_locales: str = config.path_to_locales,
+) -> Dict[str, FluentLocalization]:
+    """Fluent localizations, built once per process and shared."""
+    loader = FluentResourceLoader(path_to_locales)
+    return {
+        locale: FluentLocalization([locale, "uk"], ["messages.ftl"], loader)
         for locale in LOCALES
     }
 
-    await set_user_locale(user_id=user_id, locale=locale)
-    l10n = l10ns[locale]
-    # we use fluent.runtime here, but you can create custom functions
 
+async def update_locale(locale: str, user_id: int, manager: DialogManager) -> None:
+    await set_user_locale(user_id=user_id, locale=locale)
+    remember_user_locale(user_id, locale)
+    l10n = get_l10ns()[locale]
     manager.middleware_data[config.i18n_format_key] = l10n.format_value
 
 
@@ -52,12 +54,3 @@ class I18nFormat(Text):
         )
         return format_text(self.text, data)
 
-
-def make_i18n_middleware(path_to_locales: str) -> I18nDialogMiddleware:
-    loader = FluentResourceLoader(path_to_locales)
-    LOCALES = ["uk"]
-    l10ns = {
-        locale: FluentLocalization([locale, "uk"], ["messages.ftl"], loader)
-        for locale in LOCALES
-    }
-    return I18nDialogMiddleware(l10ns, "uk", config.i18n_format_key)
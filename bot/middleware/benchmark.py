@@ -0,0 +1,135 @@
+"""
+Затримка i18n middleware на один апдейт: колишній ланцюжок з трьох middleware
+проти об'єднаного RedisI18nMiddleware з кешем локалі.
+
+    python -m bot.middleware.benchmark --updates 5000 --users 50
+
+- legacy: RedisI18nMiddleware, I18nDialogMiddleware і ще один RedisI18nMiddleware,
+  кожен читає локаль з Redis (і записує мову за замовчуванням, якщо її немає).
+- merged: один RedisI18nMiddleware, локаль з _locale_cache, Redis лише на промах.
+
+Апдейти розподіляються по --users користувачах по колу. Потрібен запущений Redis
+з configreader; ключі локалі тестових користувачів видаляються після заміру.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from aiogram_i18n import I18nContext
+
+from bot.db.redis import get_user_locale, redis, set_user_locale
+from bot.i18n.utils.catalog import FluentCatalogCore
+from bot.i18n.utils.i18n_format import get_l10ns
+from bot.middleware import i18n_dialog
+from bot.middleware.i18n_dialog import RedisI18nMiddleware
+from configreader import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCALE = "uk"
+# Telegram id тестових користувачів, щоб не зачепити справжні ключі локалі
+FIRST_USER_ID = 9_000_000_000
+
+
+async def noop_handler(event: Any, data: Dict[str, Any]) -> None:
+    return None
+
+
+async def legacy_user_locale(user_id: int) -> str:
+    """Колишній get_user_locale_func: без кешу, Redis на кожен виклик."""
+    user_locale = await get_user_locale(user_id)
+    if not user_locale:
+        await set_user_locale(user_id, DEFAULT_LOCALE)
+        return DEFAULT_LOCALE
+    return user_locale
+
+
+async def legacy_chain(middleware: RedisI18nMiddleware, data: Dict[str, Any]) -> None:
+    """Тіла трьох колишніх middleware у порядку реєстрації в include_middlewares."""
+    user_id: int = data["event_from_user"].id
+    for step in ("i18n", "dialog", "i18n"):
+        locale = await legacy_user_locale(user_id)
+        if step == "dialog":
+            data[config.i18n_format_key] = middleware.l10ns[locale].format_value
+            continue
+        data[middleware.context_key] = context = I18nContext(
+            locale=locale,
+            core=middleware.core,
+            manager=middleware.manager,
+            data=data,
+            key_separator=middleware.key_separator,
+        )
+        data[middleware.middleware_key] = middleware
+        I18nContext.set_current(context)
+    await noop_handler(None, data)
+
+
+async def merged_chain(middleware: RedisI18nMiddleware, data: Dict[str, Any]) -> None:
+    await middleware(noop_handler, None, data)
+
+
+async def per_update(
+    chain, middleware: RedisI18nMiddleware, updates: int, users: int
+) -> tuple[float, float]:
+    """
+    :return: Мікросекунди та кількість звернень до Redis на один апдейт.
+    """
+    calls = 0
+    execute_command = redis.execute_command
+
+    async def counting_execute_command(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return await execute_command(*args, **kwargs)
+
+    i18n_dialog._locale_cache.clear()
+    await redis.delete(
+        *(f"user:{FIRST_USER_ID + index}:locale" for index in range(users))
+    )
+    redis.execute_command = counting_execute_command
+    try:
+        started = time.perf_counter()
+        for index in range(updates):
+            user = SimpleNamespace(id=FIRST_USER_ID + index % users)
+            await chain(middleware, {"event_from_user": user})
+        elapsed = time.perf_counter() - started
+    finally:
+        del redis.execute_command
+    return elapsed / updates * 1_000_000, calls / updates
+
+
+async def run_benchmark(updates: int, users: int) -> None:
+    core = FluentCatalogCore(path=config.path_to_locales)
+    await core.startup()
+    middleware = RedisI18nMiddleware(core=core, redis=redis, l10ns=get_l10ns())
+    try:
+        for name, chain in (("legacy", legacy_chain), ("merged", merged_chain)):
+            latency, round_trips = await per_update(chain, middleware, updates, users)
+            logger.info(
+                "%-6s %8.1f us/update, %.2f redis round-trips/update",
+                name,
+                latency,
+                round_trips,
+            )
+    finally:
+        await redis.delete(
+            *(f"user:{FIRST_USER_ID + index}:locale" for index in range(users))
+        )
+        await redis.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="i18n middleware latency benchmark")
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.updates, args.users))
+
+
+if __name__ == "__main__":
+    main()
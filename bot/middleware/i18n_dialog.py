@@ -1,11 +1,11 @@
-from typing import Any, Awaitable, Callable, Dict, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, MutableMapping, Optional
 
 from aiogram import Dispatcher
-from aiogram.dispatcher.middlewares.base import BaseMiddleware
-from aiogram.types import CallbackQuery, Message, TelegramObject
+from aiogram.types import TelegramObject
 from aiogram_i18n import I18nContext, I18nMiddleware
 from aiogram_i18n.cores import BaseCore
 from aiogram_i18n.managers import BaseManager
+from cachetools import TTLCache
 from fluent.runtime import FluentLocalization
 from redis.asyncio import Redis
 
@@ -13,52 +13,44 @@ from bot.db.redis import get_user_locale, set_user_locale
 from configreader import config
 
 
+LOCALE_CACHE_TTL = 60
+
+# Process-local cache: user_id -> locale. Short TTL keeps replicas in sync
+# with a locale changed in another process.
+_locale_cache: MutableMapping[int, str] = TTLCache(
+    maxsize=10_000, ttl=LOCALE_CACHE_TTL
+)
+
+
+def remember_user_locale(user_id: int, locale: str) -> None:
+    _locale_cache[user_id] = locale
+
+
 async def get_user_locale_func(user_id: int, default_locale: str) -> str:
+    lang = _locale_cache.get(user_id)
+    if lang is not None:
+        return lang
     user_locale = await get_user_locale(user_id)
     if not user_locale:
         await set_user_locale(user_id, default_locale)
         lang = default_locale
     else:
         lang = user_locale
+    remember_user_locale(user_id, lang)
     return lang
 
 
-class I18nDialogMiddleware(BaseMiddleware):
-    def __init__(
-        self,
-        l10ns: Dict[str, FluentLocalization],
-        default_locale: str,
-        i18n_format_key: str = config.i18n_format_key,
-    ):
-        super().__init__()
-        self.l10ns = l10ns
-        self.default_locale = default_locale
-
-    async def __call__(
-        self,
-        handler: Callable[
-            [Union[Message, CallbackQuery], Dict[str, Any]],
-            Awaitable[Any],
-        ],
-        event: Union[Message, CallbackQuery],
-        data: Dict[str, Any],
-    ) -> Any:
-        user_id: int = data["event_from_user"].id
-        # some language/locale retrieving logic
-        locale = await get_user_locale_func(user_id, self.default_locale)
-
-        l10n = self.l10ns[locale]
-        # we use fluent.runtime here, but you can create custom functions
-
-        data[config.i18n_format_key] = l10n.format_value
-        return await handler(event, data)
-
-
 class RedisI18nMiddleware(I18nMiddleware):
+    """
+    Resolves the user locale once per update and exposes it both as the
+    aiogram_i18n context and as the aiogram_dialog format function.
+    """
+
     def __init__(
         self,
         core: BaseCore[Any],
         redis: Redis,
+        l10ns: Dict[str, FluentLocalization],
         manager: Optional[BaseManager] = None,
         context_key: str = "i18n",
         locale_key: Optional[str] = None,
@@ -76,6 +68,7 @@ class RedisI18nMiddleware(I18nMiddleware):
             key_separator,
         )
         self.redis = redis
+        self.l10ns = l10ns
         self.default_locale = default_locale
 
     def setup(self, dispatcher: Dispatcher) -> None:
@@ -102,6 +95,8 @@ class RedisI18nMiddleware(I18nMiddleware):
         )
         if self.locale_key is not None:
             data[self.locale_key] = locale
+        l10n = self.l10ns.get(locale) or self.l10ns[self.default_locale]
+        data[config.i18n_format_key] = l10n.format_value
         data[self.middleware_key] = self
 
         I18nContext.set_current(context)
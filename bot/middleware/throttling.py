@@ -1,25 +1,79 @@
-from typing import Any, Awaitable, Callable, Dict, MutableMapping, Optional
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from aiogram import BaseMiddleware
 from aiogram.dispatcher.flags import get_flag
 from aiogram.types import TelegramObject, User
-from cachetools import TTLCache
+from redis.asyncio import Redis
+
+from bot.db.redis import redis as default_redis
 
 DEFAULT_TTL = 0.7
 DEFAULT_KEY = "default"
+DEFAULT_COST = 1
+
+THROTTLING_KEY_PREFIX = "throttling"
+THROTTLING_REJECTIONS_KEY = "throttling:rejections"
+
+# Token bucket: KEYS[1] - bucket, KEYS[2] - rejection counters hash;
+# ARGV: capacity, refill per millisecond, cost, throttling key.
+# The Redis server clock is used, so all replicas share one time source.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill_per_ms = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now_ms = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now_ms
+tokens = math.min(capacity, tokens + math.max(0, now_ms - ts) * refill_per_ms)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    redis.call('HINCRBY', KEYS[2], ARGV[4], 1)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now_ms)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_per_ms))
+return allowed
+"""
+
+
+@dataclass(frozen=True)
+class ThrottlingRule:
+    """
+    Token bucket: up to `capacity` tokens, refilled at `refill_per_second`.
+    A handler spends `throttling_cost` tokens (1 by default) per call.
+    """
+
+    capacity: float
+    refill_per_second: float
+
+    @classmethod
+    def from_ttl(cls, ttl: float) -> "ThrottlingRule":
+        """One call per `ttl` seconds."""
+        return cls(capacity=1, refill_per_second=1 / ttl)
 
 
 class ThrottlingMiddleware(BaseMiddleware):
     """
-    Simple throttling middleware using TTLCache
+    Distributed throttling middleware using a Redis token bucket (Lua script).
 
+    Limits are shared by all bot replicas and checked with one round-trip.
+    Rejections are counted per throttling key in the `throttling:rejections` hash.
 
     Usage example:
     router.message.middleware(ThrottlingMiddleware(spin=2.0))
+    router.message.middleware(
+        ThrottlingMiddleware(ai=ThrottlingRule(capacity=4, refill_per_second=0.8))
+    )
 
     And then:
         @router.message(Command("dice"))
         @flags.throttling_key("spin")
+        @flags.throttling_cost(2)
         async def dice(message: Message) -> Any:
             pass
     """
@@ -27,24 +81,47 @@ class ThrottlingMiddleware(BaseMiddleware):
     def __init__(
         self,
         *,
+        redis: Redis = default_redis,
         default_key: Optional[str] = DEFAULT_KEY,
         default_ttl: float = DEFAULT_TTL,
-        **ttl_map: float,
+        **rules: float | ThrottlingRule,
     ) -> None:
         """
-        :param default_key: The cache key to be used by default.
+        :param redis: Redis client shared by all replicas.
+        :param default_key: The throttling key to be used by default.
         Set to None to disable throttling by default.
-        :param default_ttl: The TTL in default cache
-        :param ttl_map: Creates additional cache instances with different TTL
+        :param default_ttl: The TTL for the default key
+        :param rules: Additional throttling keys: TTL in seconds or ThrottlingRule
         """
         if default_key:
-            ttl_map[default_key] = default_ttl
+            rules[default_key] = default_ttl
 
         self.default_key = default_key
-        self.caches: Dict[str, MutableMapping[int, None]] = {}
+        self.rules: Dict[str, ThrottlingRule] = {
+            name: rule
+            if isinstance(rule, ThrottlingRule)
+            else ThrottlingRule.from_ttl(rule)
+            for name, rule in rules.items()
+        }
+        self.script = redis.register_script(TOKEN_BUCKET_LUA)
 
-        for name, ttl in ttl_map.items():
-            self.caches[name] = TTLCache(maxsize=10_000, ttl=ttl)
+    async def is_allowed(
+        self, user_id: int, throttling_key: str, cost: float
+    ) -> bool:
+        rule = self.rules[throttling_key]
+        allowed = await self.script(
+            keys=[
+                f"{THROTTLING_KEY_PREFIX}:{throttling_key}:{user_id}",
+                THROTTLING_REJECTIONS_KEY,
+            ],
+            args=[
+                rule.capacity,
+                rule.refill_per_second / 1000,
+                min(cost, rule.capacity),
+                throttling_key,
+            ],
+        )
+        return bool(allowed)
 
     async def __call__(
         self,
@@ -56,8 +133,16 @@ class ThrottlingMiddleware(BaseMiddleware):
 
         if user is not None:
             throttling_key = get_flag(data, "throttling_key", default=self.default_key)
-            if throttling_key and user.id in self.caches[throttling_key]:
+            cost = get_flag(data, "throttling_cost", default=DEFAULT_COST)
+            if throttling_key and not await self.is_allowed(
+                user.id, throttling_key, cost
+            ):
                 return None
-            self.caches[throttling_key][user.id] = None
 
         return await handler(event, data)
+
+
+async def get_throttling_rejections(redis: Redis = default_redis) -> Dict[str, int]:
+    """Rejection counters per throttling key, for metrics export."""
+    counters = await redis.hgetall(THROTTLING_REJECTIONS_KEY)
+    return {key.decode(): int(value) for key, value in counters.items()}
@@ -4,6 +4,7 @@ from .user_tools import UserTools
 from .work_schedule_tools import WorkScheduleTools
 from .category_tools import CategoryTools
 from .task_tools import TaskTools
+from .analytics_tools import AnalyticsTools
 
 __all__ = [
     "BaseTools",
@@ -12,4 +13,5 @@ __all__ = [
     "WorkScheduleTools",
     "CategoryTools",
     "TaskTools",
+    "AnalyticsTools",
 ]
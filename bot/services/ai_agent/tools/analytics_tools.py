@@ -0,0 +1,183 @@
+import datetime
+import logging
+
+from langchain_core.tools import tool
+
+from bot.entities.analytics import (
+    TREND_BUCKET,
+    CategoryStatsRead,
+    ExecutorStatsRead,
+    TaskStatsRead,
+    TaskTrendRead,
+)
+from configreader import KYIV
+from .base import BaseTools
+
+logger = logging.getLogger(__name__)
+
+
+def default_period(
+    date_from: datetime.datetime | None,
+    date_to: datetime.datetime | None,
+) -> tuple[datetime.datetime, datetime.datetime]:
+    """За замовчуванням - з початку поточного місяця до поточного моменту."""
+    datetime_now = datetime.datetime.now(KYIV)
+    if not date_from:
+        date_from = datetime_now.replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+    if not date_to:
+        date_to = datetime_now
+    if date_from.tzinfo is None:
+        date_from = date_from.replace(tzinfo=KYIV)
+    if date_to.tzinfo is None:
+        date_to = date_to.replace(tzinfo=KYIV)
+    return date_from, date_to
+
+
+class AnalyticsTools(BaseTools):
+    """Інструменти для агрегованої аналітики завдань. Всі підрахунки виконуються в базі даних."""
+
+    async def get_allowed_executor_id(self, executor_id: int | None) -> int | None:
+        """Співробітники 4 рівня бачать лише власну статистику."""
+        if not await self.is_manager():
+            return self.user_id
+        return executor_id
+
+    def get_tools(self) -> list:
+        @tool
+        async def get_task_stats(
+            date_from: datetime.datetime | None = None,
+            date_to: datetime.datetime | None = None,
+            executor_id: int | None = None,
+            creator_id: int | None = None,
+            category_id: int | None = None,
+        ) -> TaskStatsRead:
+            """
+            Отримати загальну статистику завдань за період: кількість за статусами,
+            відсоток виконання, кількість прострочених та середнє запізнення в хвилинах.
+            Рахується з денної зведеної таблиці, як і get_executor_stats, get_category_stats
+            та get_task_trend, тому сходиться з їхніми розбивками: період округлюється до днів,
+            а зміни останніх хвилин можуть ще не потрапити в підсумок.
+            З creator_id рахується напряму по завданнях, бо у зведеній таблиці автора немає.
+
+            :param date_from: Початок періоду (за датою початку завдання). За замовчуванням початок поточного місяця.
+            :param date_to: Кінець періоду. За замовчуванням поточний момент.
+            :param executor_id: ID виконавця (необов'язково).
+            :param creator_id: ID автора завдань (необов'язково).
+            :param category_id: ID категорії (необов'язково).
+            """
+            date_from, date_to = default_period(date_from, date_to)
+            executor_id = await self.get_allowed_executor_id(executor_id)
+            async with self.uow:
+                if creator_id is None:
+                    stats = await self.uow.analytics.get_rollup_task_stats(
+                        executor_id=executor_id,
+                        category_id=category_id,
+                        start_datetime=date_from,
+                        end_datetime=date_to,
+                    )
+                else:
+                    stats = await self.uow.analytics.get_task_stats(
+                        creator_id=creator_id,
+                        executor_id=executor_id,
+                        category_id=category_id,
+                        start_datetime=date_from,
+                        end_datetime=date_to,
+                    )
+            return TaskStatsRead.model_validate(stats)
+
+        @tool
+        async def get_executor_stats(
+            date_from: datetime.datetime | None = None,
+            date_to: datetime.datetime | None = None,
+            category_id: int | None = None,
+            limit: int | None = 20,
+        ) -> str | list[ExecutorStatsRead]:
+            """
+            Отримати статистику виконання завдань по кожному виконавцю за період.
+            Використовуй для оцінки продуктивності та навантаження співробітників.
+            Рахується з денної зведеної таблиці: період округлюється до днів.
+
+            :param date_from: Початок періоду. За замовчуванням початок поточного місяця.
+            :param date_to: Кінець періоду. За замовчуванням поточний момент.
+            :param category_id: ID категорії (необов'язково).
+            :param limit: Максимальна кількість виконавців у відповіді, відсортованих за кількістю завдань.
+            """
+            if not await self.is_manager():
+                logger.warning(
+                    "User with ID %s has insufficient permissions to access executor stats.",
+                    self.user_id,
+                )
+                return "You do not have permission to access executor stats."
+            date_from, date_to = default_period(date_from, date_to)
+            async with self.uow:
+                stats = await self.uow.analytics.get_executor_stats(
+                    category_id=category_id,
+                    start_datetime=date_from,
+                    end_datetime=date_to,
+                    limit=limit,
+                )
+            return [ExecutorStatsRead.model_validate(row) for row in stats]
+
+        @tool
+        async def get_category_stats(
+            date_from: datetime.datetime | None = None,
+            date_to: datetime.datetime | None = None,
+            executor_id: int | None = None,
+        ) -> list[CategoryStatsRead]:
+            """
+            Отримати статистику виконання завдань по кожній категорії за період.
+            Рахується з денної зведеної таблиці: період округлюється до днів.
+
+            :param date_from: Початок періоду. За замовчуванням початок поточного місяця.
+            :param date_to: Кінець періоду. За замовчуванням поточний момент.
+            :param executor_id: ID виконавця (необов'язково).
+            """
+            date_from, date_to = default_period(date_from, date_to)
+            executor_id = await self.get_allowed_executor_id(executor_id)
+            async with self.uow:
+                stats = await self.uow.analytics.get_category_stats(
+                    executor_id=executor_id,
+                    start_datetime=date_from,
+                    end_datetime=date_to,
+                )
+            return [CategoryStatsRead.model_validate(row) for row in stats]
+
+        @tool
+        async def get_task_trend(
+            bucket: TREND_BUCKET = "week",
+            date_from: datetime.datetime | None = None,
+            date_to: datetime.datetime | None = None,
+            executor_id: int | None = None,
+            category_id: int | None = None,
+        ) -> list[TaskTrendRead]:
+            """
+            Отримати динаміку показників завдань по днях, тижнях або місяцях.
+            Використовуй для порівняння періодів та аналізу трендів.
+            Рахується з денної зведеної таблиці: період округлюється до днів.
+
+            :param bucket: Розмір інтервалу: "day", "week" або "month".
+            :param date_from: Початок періоду. За замовчуванням початок поточного місяця.
+            :param date_to: Кінець періоду. За замовчуванням поточний момент.
+            :param executor_id: ID виконавця (необов'язково).
+            :param category_id: ID категорії (необов'язково).
+            """
+            date_from, date_to = default_period(date_from, date_to)
+            executor_id = await self.get_allowed_executor_id(executor_id)
+            async with self.uow:
+                trend = await self.uow.analytics.get_task_trend(
+                    bucket=bucket,
+                    executor_id=executor_id,
+                    category_id=category_id,
+                    start_datetime=date_from,
+                    end_datetime=date_to,
+                )
+            return [TaskTrendRead.model_validate(row) for row in trend]
+
+        return [
+            get_task_stats,
+            get_executor_stats,
+            get_category_stats,
+            get_task_trend,
+        ]
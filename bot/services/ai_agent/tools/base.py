@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from arq import ArqRedis
+from bot.services.org_directory import OrgDirectory, get_org_directory
 from bot.utils.unitofwork import UnitOfWork
 
 
@@ -11,18 +12,28 @@ class BaseTools(ABC):
         self.arq = arq
         self.user_id = user_id
 
-    async def get_user_hierarchy_level(self, user_id: int | None = None) -> int:
+    async def get_org_directory(self) -> OrgDirectory:
+        """
+        Довідник ієрархії з пам'яті процесу. БД читається лише після змін користувачів,
+        посад або рівнів, тому його можна викликати і всередині `async with self.uow`.
+        """
+        return await get_org_directory()
+
+    async def get_user_hierarchy_level(self, user_id: int | None = None) -> int | None:
         """
         Отримує рівень ієрархії користувача за його ID.
         Args:
             user_id (int): ID користувача, для якого потрібно отримати рівень ієрархії.
         Returns:
-            int: Рівень ієрархії користувача.
+            int | None: Рівень ієрархії користувача або None, якщо в нього немає посади.
         """
-        async with self.uow:
-            user_id = user_id or self.user_id
-            level = await self.uow.users.get_user_hierarchy_level(user_id)
-            return level
+        directory = await self.get_org_directory()
+        return directory.level_of(user_id or self.user_id)
+
+    async def is_manager(self, user_id: int | None = None) -> bool:
+        """Чи має користувач (за замовчуванням поточний) рівень керівника (1-3)."""
+        directory = await self.get_org_directory()
+        return directory.is_manager(user_id or self.user_id)
 
     @abstractmethod
     def get_tools(self) -> list:
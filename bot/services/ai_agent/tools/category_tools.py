@@ -89,8 +89,7 @@ class CategoryTools(BaseTools):
 
             :param category_id: ID категорії завдання, яку потрібно видалити.
             """
-            user_level = await self.get_user_hierarchy_level()
-            if user_level > 3:
+            if not await self.is_manager():
                 logger.warning(
                     "User with ID %s has insufficient permissions to delete task categories.",
                     self.user_id,
@@ -70,12 +70,7 @@ class CreateTaskTools(TaskTools):
             Returns:
                 bool: True, якщо завдання були успішно видалені, False в іншому випадку.
             """
-            async with self.uow:
-                for task_id in task_ids:
-                    result = await self.delete_task_func(task_id)
-                    if isinstance(result, str):
-                        return result
-                return True
+            return await self.delete_many_tasks_func(task_ids)
 
         @tool
         async def get_tasks(
@@ -3,8 +3,8 @@ import logging
 
 from langchain_core.tools import tool
 
-from bot.db.models.models import Task
 from bot.db.redis import redis_cache
+from bot.db.repositories.repo import task_fingerprint
 from bot.entities.shared import TaskReadExtended
 from bot.entities.task import (
     TaskCreate,
@@ -12,7 +12,13 @@ from bot.entities.task import (
 )
 from bot.utils.enum import TaskStatus
 from configreader import KYIV
-from scheduler.jobs import create_notification_job
+from scheduler.deadlines import cancel_task_deadlines, schedule_task_deadlines
+from scheduler.jobs import (
+    NotificationJob,
+    abort_task_notification_jobs,
+    create_notification_job,
+    enqueue_notification_jobs,
+)
 from .base import BaseTools
 
 logger = logging.getLogger(__name__)
@@ -46,37 +52,6 @@ class TaskTools(BaseTools):
             task_id=task_id,
         )
 
-    async def create_notification_task_started(
-        self,
-        task_id: int,
-        _defer_until: datetime.datetime | None = None,
-        _defer_by: datetime.timedelta | None = None,
-        update_notification: bool = False,
-    ):
-        """
-        Створює завдання для надсилання сповіщення користувачу про те, що завдання почалося.
-        Args:
-            task_id (int): ID завдання, про яке буде надіслано сповіщення.
-            _defer_until (datetime.datetime | None): Час, до якого слід відкласти виконання завдання.
-                Якщо вказано, то завдання буде виконано в цей час.
-            _defer_by (datetime.timedelta | None): Час, на який слід відкласти виконання завдання.
-                Якщо вказано, то завдання буде виконано через цей проміжок часу.
-            update_notification: bool: True - для того щоб оновити існуюче сповіщення, якщо ми оновили завдання.
-                False - для того щоб створити нове сповіщення.
-
-            Якщо не вказати _defer_until та _defer_by - повідомлення буде надіслано відразу.
-
-        """
-        await create_notification_job(
-            self.arq,
-            notification_for="executor",
-            notification_subject="task_started",
-            task_id=task_id,
-            _defer_until=_defer_until,
-            _defer_by=_defer_by,
-            update_notification=update_notification,
-        )
-
     async def create_notification_task_updated(
         self,
         task_id: int,
@@ -96,97 +71,23 @@ class TaskTools(BaseTools):
             task_id=task_id,
         )
 
-    async def create_notification_task_is_overdue(
-        self,
-        task_id: int,
-        _defer_until: datetime.datetime | None = None,
-        _defer_by: datetime.timedelta | None = None,
-        update_notification: bool = False,
-    ):
-        """
-        Створює завдання для надсилання сповіщення користувачу про те, що завдання прострочено.
-        Args:
-            task_id (int): ID завдання, про яке буде надіслано сповіщення.
-
-            _defer_until (datetime.datetime | None): Час, до якого слід відкласти виконання завдання.
-                Якщо вказано, то завдання буде виконано в цей час.
-            _defer_by (datetime.timedelta | None): Час, на який слід відкласти виконання завдання.
-                Якщо вказано, то завдання буде виконано через цей проміжок часу.
-            update_notification: bool: True - для того щоб оновити існуюче сповіщення, якщо ми оновили завдання.
-                False - для того щоб створити нове сповіщення.
-
-            Якщо не вказати _defer_until та _defer_by - повідомлення буде надіслано відразу.
-
-        """
-        await create_notification_job(
-            self.arq,
-            notification_for="executor",
-            notification_subject="task_overdue",
-            task_id=task_id,
-            _defer_until=_defer_until,
-            _defer_by=_defer_by,
-            update_notification=update_notification,
-        )
-        await create_notification_job(
-            self.arq,
-            notification_for="creator",
-            notification_subject="task_overdue",
-            task_id=task_id,
-            _defer_until=_defer_until,
-            _defer_by=_defer_by,
-            update_notification=update_notification,
-        )
-
-    async def create_notification_task_ending_soon(
-        self,
-        task_id: int,
-        _defer_until: datetime.datetime | None = None,
-        _defer_by: datetime.timedelta | None = None,
-        update_notification: bool = False,
-    ):
-        """
-        Створює завдання для надсилання сповіщення користувачу про те, що завдання закінчується незабаром.
-        Args:
-            task_id (int): ID завдання, про яке буде надіслано сповіщення.
-            _defer_until (datetime.datetime | None): Час, до якого слід відкласти виконання завдання.
-                Якщо вказано, то завдання буде виконано в цей час.
-            _defer_by (datetime.timedelta | None): Час, на який слід відкласти виконання завдання.
-                Якщо вказано, то завдання буде виконано через цей проміжок часу.
-            update_notification: bool: True - для того щоб оновити існуюче сповіщення, якщо ми оновили завдання.
-                False - для того щоб створити нове сповіщення.
-
-
-            Якщо не вказати _defer_until та _defer_by - повідомлення буде надіслано відразу.
-
-        """
-        await create_notification_job(
-            self.arq,
-            notification_for="executor",
-            notification_subject="task_ending_soon",
-            task_id=task_id,
-            _defer_until=_defer_until,
-            _defer_by=_defer_by,
-            update_notification=update_notification,
-        )
-
     async def create_one_task_func(self, new_task_data: TaskCreate):
         task_id = None
-        creator_level = await self.get_user_hierarchy_level()
+        directory = await self.get_org_directory()
         async with self.uow:
             if new_task_data.creator_id != self.user_id:
                 return "Creator ID does not match the current user."
-            executor_level = await self.get_user_hierarchy_level(
-                new_task_data.executor_id
-            )
-            if executor_level < creator_level:
+            if not directory.can_assign(self.user_id, new_task_data.executor_id):
                 return "You do not have permission to create a task for this user."
             task_data_dict = new_task_data.model_dump(exclude={"task_control_points"})
             try:
-                task_id = await self.uow.tasks.add_one(task_data_dict)
+                task_id = await self.uow.tasks.add_one_if_new(task_data_dict)
             except Exception as e:
                 logger.error(f"Error creating task: {e}")
                 await self.uow.rollback()
                 return f"Error creating task: {e}"
+            if task_id is None:
+                return "The same task already exists for this executor and time."
             if new_task_data.task_control_points:
                 for control_point in new_task_data.task_control_points:
                     # TODO: додати нотифікації по контрольним точкам
@@ -199,17 +100,9 @@ class TaskTools(BaseTools):
                         await self.uow.rollback()
                         return f"Error creating control point: {e}"
             await self.uow.commit()
-        await self.create_notification_task_ending_soon(
-            task_id=task_id,
-            _defer_until=new_task_data.end_datetime - datetime.timedelta(minutes=30),
-        )
-        await self.create_notification_task_is_overdue(
-            task_id=task_id,
-            _defer_until=new_task_data.end_datetime,
-        )
-        await self.create_notification_task_started(
-            task_id=task_id,
-            _defer_until=new_task_data.start_datetime,
+        await schedule_task_deadlines(
+            self.arq,
+            [(task_id, new_task_data.start_datetime, new_task_data.end_datetime)],
         )
         # await self.create_notification_new_task(
         #     task_id=task_id,
@@ -221,89 +114,154 @@ class TaskTools(BaseTools):
         self,
         new_task_data: list[TaskCreate],
     ):
-        created_task_ids = []
-        for new_task in new_task_data:
-            task_id = await self.create_one_task_func(new_task)
-            if isinstance(task_id, str):
-                return task_id
-            created_task_ids.append(task_id)
-        return created_task_ids
+        """
+        Створює завдання пакетом: права на всіх виконавців перевіряються до створення
+        за довідником ієрархії в пам'яті, завдання та контрольні точки додаються
+        багаторядковими INSERT в одній транзакції, дедлайни сповіщень додаються одним конвеєром.
+        Дублікати (вже існуючі або повтори в самому списку) пропускаються.
+        """
+        if any(new_task.creator_id != self.user_id for new_task in new_task_data):
+            return "Creator ID does not match the current user."
+        directory = await self.get_org_directory()
+        forbidden = directory.cannot_assign(
+            self.user_id, (new_task.executor_id for new_task in new_task_data)
+        )
+        if forbidden:
+            return (
+                f"You do not have permission to create a task for user {forbidden[0]}."
+            )
+        async with self.uow:
+            fingerprints = [self._fingerprint(new_task) for new_task in new_task_data]
+            existing = await self.uow.tasks.get_ids_by_fingerprints(fingerprints)
+            new_tasks: dict[str, TaskCreate] = {}
+            for fingerprint, new_task in zip(fingerprints, new_task_data):
+                if fingerprint in existing or fingerprint in new_tasks:
+                    logger.info(f"Skipping duplicate task {fingerprint}")
+                    continue
+                new_tasks[fingerprint] = new_task
+
+            try:
+                created = await self.uow.tasks.add_many_if_new(
+                    [
+                        new_task.model_dump(exclude={"task_control_points"})
+                        for new_task in new_tasks.values()
+                    ]
+                )
+                await self.uow.task_control_points.add_many(
+                    [
+                        {**control_point.model_dump(), "task_id": created[fingerprint]}
+                        for fingerprint, new_task in new_tasks.items()
+                        if fingerprint in created
+                        for control_point in new_task.task_control_points or []
+                    ]
+                )
+            except Exception as e:
+                logger.error(f"Error creating tasks: {e}")
+                await self.uow.rollback()
+                return f"Error creating tasks: {e}"
+            await self.uow.commit()
+
+        await schedule_task_deadlines(
+            self.arq,
+            [
+                (created[fingerprint], new_task.start_datetime, new_task.end_datetime)
+                for fingerprint, new_task in new_tasks.items()
+                if fingerprint in created
+            ],
+        )
+        # ID у порядку вхідного списку
+        return [
+            created[fingerprint] for fingerprint in new_tasks if fingerprint in created
+        ]
+
+    @staticmethod
+    def _fingerprint(task: TaskCreate) -> str:
+        return task_fingerprint(
+            task.executor_id,
+            task.start_datetime,
+            task.end_datetime,
+            task.title,
+            task.description,
+            task.category_id,
+        )
 
     async def update_tasks_func(
         self,
         updates_list: list[TaskUpdate],
     ):
+        """
+        Оновлює завдання одним UPDATE з перевіркою прав у SQL; потім переносить дедлайни
+        сповіщень оновлених завдань і ставить сповіщення про оновлення - теж пакетом.
+        """
+        updates = []
+        for task_data in updates_list:
+            if task_data.start_datetime:
+                task_data.start_datetime = task_data.start_datetime.replace(tzinfo=KYIV)
+            if task_data.end_datetime:
+                task_data.end_datetime = task_data.end_datetime.replace(tzinfo=KYIV)
+            updates.append(
+                task_data.model_dump(exclude_unset=True, exclude_none=True)
+            )
+        task_ids = [task_data.id for task_data in updates_list]
         async with self.uow:
-            for task_data in updates_list:
-                task_model = await self.uow.tasks.find_one(
-                    id=task_data.id,
-                )
-                if not task_model:
-                    await self.uow.rollback()
-                    return f"Task with ID {task_data.id} not found."
-                if (
-                    task_model.creator_id != self.user_id
-                    and await self.get_user_hierarchy_level() > 3
-                ):
-                    await self.uow.rollback()
-                    return "You do not have permission to update this task."
-                if task_data.start_datetime:
-                    task_data.start_datetime = task_data.start_datetime.replace(
-                        tzinfo=KYIV
-                    )
-                if task_data.end_datetime:
-                    task_data.end_datetime = task_data.end_datetime.replace(tzinfo=KYIV)
-                task_dict = task_data.model_dump(
-                    exclude_unset=True, exclude_none=True, exclude={"id"}
+            try:
+                updated = await self.uow.tasks.update_many(updates, self.user_id)
+            except Exception as e:
+                logger.error(f"Error updating task: {e}")
+                await self.uow.rollback()
+                return f"Error updating task: {e}"
+            if len(updated) < len(set(task_ids)):
+                await self.uow.rollback()
+                return await self._explain_missing_tasks(
+                    task_ids, {row.id for row in updated}, "update"
                 )
-                try:
-                    await self.uow.tasks.edit_one(id=task_data.id, data=task_dict)
-                except Exception as e:
-                    logger.error(f"Error updating task: {e}")
-                    await self.uow.rollback()
-                    return f"Error updating task: {e}"
-
             await self.uow.commit()
-            for task_data in updates_list:
-                await self.create_notification_task_updated(
-                    task_id=task_data.id,
-                )
-                await self.create_notification_task_ending_soon(
-                    task_id=task_data.id,
-                    _defer_until=task_data.end_datetime
-                    - datetime.timedelta(minutes=30),
-                    update_notification=True,
-                )
-                await self.create_notification_task_is_overdue(
-                    task_id=task_data.id,
-                    _defer_until=task_data.end_datetime,
-                    update_notification=True,
-                )
-                await self.create_notification_task_started(
-                    task_id=task_data.id,
-                    _defer_until=task_data.start_datetime,
-                    update_notification=True,
-                )
-            return True
 
-    async def delete_task_func(self, task_id: int) -> str | bool:
+        # Відкладені завдання arq, поставлені до переходу на дедлайни, теж скасовуються
+        await abort_task_notification_jobs(self.arq, [row.id for row in updated])
+        await schedule_task_deadlines(
+            self.arq,
+            [(row.id, row.start_datetime, row.end_datetime) for row in updated],
+        )
+        await enqueue_notification_jobs(
+            self.arq,
+            [NotificationJob(row.id, "executor", "task_updated") for row in updated],
+        )
+        return True
+
+    async def _explain_missing_tasks(
+        self, task_ids: list[int], done_ids: set[int], action: str
+    ) -> str:
+        """Повідомлення для завдань, які не змінено: не знайдено або немає прав."""
+        missing_ids = [task_id for task_id in task_ids if task_id not in done_ids]
+        async with self.uow:
+            existing_ids = await self.uow.tasks.get_existing_ids(missing_ids)
+        not_found = [task_id for task_id in missing_ids if task_id not in existing_ids]
+        if not_found:
+            return f"Task with ID {not_found[0]} not found."
+        return f"You do not have permission to {action} this task."
+
+    async def delete_many_tasks_func(self, task_ids: list[int]) -> str | bool:
+        """Видаляє завдання одним DELETE з перевіркою прав у SQL і скасовує їх сповіщення та дедлайни."""
         async with self.uow:
             try:
-                task_model: Task | None = await self.uow.tasks.find_one(id=task_id)
-                if not task_model:
-                    return f"Task with ID {task_id} not found."
-                if (
-                    task_model.creator_id != self.user_id
-                    and await self.get_user_hierarchy_level() > 3
-                ):
-                    return "You do not have permission to delete this task."
-                await self.uow.tasks.delete_one(id=task_id)
+                deleted_ids = await self.uow.tasks.delete_many(task_ids, self.user_id)
             except Exception as e:
                 logger.error(f"Error deleting task: {e}")
                 await self.uow.rollback()
                 return f"Error deleting task: {e}"
+            if len(deleted_ids) < len(set(task_ids)):
+                await self.uow.rollback()
+                return await self._explain_missing_tasks(
+                    task_ids, set(deleted_ids), "delete"
+                )
             await self.uow.commit()
-            return True
+        await abort_task_notification_jobs(self.arq, deleted_ids)
+        await cancel_task_deadlines(self.arq, deleted_ids)
+        return True
+
+    async def delete_task_func(self, task_id: int) -> str | bool:
+        return await self.delete_many_tasks_func([task_id])
 
     @redis_cache(15)
     async def get_tasks_func(
@@ -316,8 +274,7 @@ class TaskTools(BaseTools):
         end_datetime: datetime.datetime | None = None,
     ):
         async with self.uow:
-            hierarchy_level = await self.get_user_hierarchy_level()
-            if hierarchy_level > 3 and self.user_id not in [
+            if not await self.is_manager() and self.user_id not in [
                 creator_id,
                 executor_id,
             ]:
@@ -331,32 +288,7 @@ class TaskTools(BaseTools):
                 end_datetime=end_datetime,
             )
             return [
-                TaskReadExtended.model_validate(task, from_attributes=True).model_dump(
-                    exclude={
-                        "creator": {
-                            "position": {
-                                "hierarchy_level": {
-                                    "create_task_prompt",
-                                    "manage_task_prompt",
-                                    "work_schedule_prompt",
-                                    "category_prompt",
-                                    "analytics_prompt",
-                                }
-                            }
-                        },
-                        "executor": {
-                            "position": {
-                                "hierarchy_level": {
-                                    "create_task_prompt",
-                                    "manage_task_prompt",
-                                    "work_schedule_prompt",
-                                    "category_prompt",
-                                    "analytics_prompt",
-                                }
-                            }
-                        },
-                    },
-                )
+                TaskReadExtended.model_validate(task, from_attributes=True).model_dump()
                 for task in tasks
             ]
 
@@ -367,37 +299,12 @@ class TaskTools(BaseTools):
             )
             if (
                 self.user_id not in [task["creator_id"], task["executor_id"]]
-                and await self.get_user_hierarchy_level() > 3
+                and not await self.is_manager()
             ):
                 return None
             return TaskReadExtended.model_validate(
                 task, from_attributes=True
-            ).model_dump(
-                exclude={
-                    "creator": {
-                        "position": {
-                            "hierarchy_level": {
-                                "create_task_prompt",
-                                "manage_task_prompt",
-                                "work_schedule_prompt",
-                                "category_prompt",
-                                "analytics_prompt",
-                            }
-                        }
-                    },
-                    "executor": {
-                        "position": {
-                            "hierarchy_level": {
-                                "create_task_prompt",
-                                "manage_task_prompt",
-                                "work_schedule_prompt",
-                                "category_prompt",
-                                "analytics_prompt",
-                            }
-                        }
-                    },
-                },
-            )
+            ).model_dump()
 
     def get_tools(
         self,
@@ -460,12 +367,7 @@ class TaskTools(BaseTools):
             Returns:
                 bool: True, якщо завдання були успішно видалені, False в іншому випадку.
             """
-            async with self.uow:
-                for task_id in task_ids:
-                    result = await self.delete_task_func(task_id)
-                    if isinstance(result, str):
-                        return result
-                return True
+            return await self.delete_many_tasks_func(task_ids)
 
         @tool
         async def get_tasks(
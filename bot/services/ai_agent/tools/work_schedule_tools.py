@@ -3,7 +3,7 @@ import logging
 
 from langchain_core.tools import tool
 
-from bot.entities.other import ScheduleCreationResult
+from bot.entities.other import ScheduleCreationResult, ScheduleRowStatus
 from bot.entities.users import WorkScheduleCreate, WorkScheduleRead, WorkScheduleUpdate
 from .base import BaseTools
 
@@ -31,8 +31,7 @@ class WorkScheduleTools(BaseTools):
             Returns:
                 list: List of all work schedules.
             """
-            user_level = await self.get_user_hierarchy_level(self.user_id)
-            if user_level > 3:
+            if not await self.is_manager():
                 logger.warning(
                     "User with ID %s has insufficient permissions to access work schedules.",
                     self.user_id,
@@ -78,7 +77,7 @@ class WorkScheduleTools(BaseTools):
             """
             if (
                 user_id != self.user_id
-                and await self.get_user_hierarchy_level(user_id=user_id) > 3
+                and not await self.is_manager()
             ):
                 logger.warning(
                     "User with ID %s has insufficient permissions to access their own work schedule.",
@@ -108,7 +107,7 @@ class WorkScheduleTools(BaseTools):
             """
 
             async with self.uow:
-                if await self.get_user_hierarchy_level(user_id=self.user_id) > 3:
+                if not await self.is_manager():
                     logger.warning(
                         "User with ID %s has insufficient permissions to update their own work schedule.",
                         self.user_id,
@@ -137,7 +136,7 @@ class WorkScheduleTools(BaseTools):
             :param work_schedule_id: ID робочого графіку, який потрібно видалити.
             """
             async with self.uow:
-                if await self.get_user_hierarchy_level(user_id=self.user_id) > 3:
+                if not await self.is_manager():
                     logger.warning(
                         "User with ID %s has insufficient permissions to delete their own work schedule.",
                         self.user_id,
@@ -163,47 +162,48 @@ class WorkScheduleTools(BaseTools):
             :param work_schedule_data_list: WorkScheduleCreate instance containing the data for the new work schedule.
 
             Returns:
-                ScheduleCreationResult: Result of the schedule creation operation, including counts of created and existing schedules.
+                ScheduleCreationResult: Result of the schedule creation operation, including counts of created and existing
+                (updated) schedules and the status of every schedule.
 
             """
-            schedules_exists = 0
-            schedules_created = 0
-            if await self.get_user_hierarchy_level(user_id=self.user_id) > 3:
+            if not await self.is_manager():
                 logger.warning(
                     "User with ID %s has insufficient permissions to create work schedules.",
                     self.user_id,
                 )
                 return "You do not have permission to create work schedules."
+            # Один рядок на користувача і дату (останній у списку), інакше ON CONFLICT
+            # DO UPDATE не може двічі змінити той самий рядок
+            schedules = {
+                (work_schedule_data.user_id, work_schedule_data.date): (
+                    work_schedule_data.model_dump()
+                )
+                for work_schedule_data in work_schedule_data_list
+            }
             async with self.uow:
-                for work_schedule_data in work_schedule_data_list:
-                    work_schedule_exists = await self.uow.work_schedules.find_one(
-                        user_id=work_schedule_data.user_id,
-                        date=work_schedule_data.date,
+                try:
+                    results = await self.uow.work_schedules.upsert_many(
+                        list(schedules.values())
                     )
-                    if not work_schedule_exists:
-                        work_schedule_dict = work_schedule_data.model_dump()
-                        try:
-                            await self.uow.work_schedules.add_one(work_schedule_dict)
-                        except Exception as e:
-                            logger.error("Error creating work schedule: %s", e)
-                            return f"Error creating work schedule: {e}"
-                        await self.uow.commit()
-                        schedules_created += 1
-                    else:
-                        try:
-                            await self.uow.work_schedules.edit_one(
-                                id=work_schedule_exists.id,
-                                data=work_schedule_data.model_dump(
-                                    exclude_unset=True, exclude_none=True
-                                ),
-                            )
-                        except Exception as e:
-                            logger.error("Error updating existing work schedule: %s", e)
-                            return f"Error updating existing work schedule: {e}"
-                return ScheduleCreationResult(
-                    created_count=schedules_created,
-                    existing_count=schedules_exists,
+                except Exception as e:
+                    logger.error("Error creating work schedules: %s", e)
+                    await self.uow.rollback()
+                    return f"Error creating work schedules: {e}"
+                await self.uow.commit()
+            statuses = [
+                ScheduleRowStatus(
+                    user_id=row.user_id,
+                    date=row.date,
+                    status="created" if row.created else "updated",
                 )
+                for row in results
+            ]
+            schedules_created = sum(status.status == "created" for status in statuses)
+            return ScheduleCreationResult(
+                created_count=schedules_created,
+                existing_count=len(statuses) - schedules_created,
+                schedules=statuses,
+            )
 
         return [
             get_all_work_schedulers_from_db,
@@ -6,6 +6,7 @@ from arq import ArqRedis
 from bot.utils.unitofwork import UnitOfWork
 
 from .tools import (
+    AnalyticsTools,
     CategoryTools,
     DateTimeTools,
     TaskTools,
@@ -31,6 +32,7 @@ class Tools:
         self.create_task_tools = TaskTools(self.uow, self.arq, self.user_id)
         self.manage_task_tools = TaskTools(self.uow, self.arq, self.user_id)
         self.all_task_tools = TaskTools(self.uow, self.arq, self.user_id)
+        self.analytics_tools = AnalyticsTools(self.uow, self.arq, self.user_id)
 
     def get_tools(
         self,
@@ -54,6 +56,7 @@ class Tools:
             *self.work_schedule_tools.get_tools(),
             *self.category_tools.get_tools(),
             *self.manage_task_tools.get_tools(),
+            *self.analytics_tools.get_tools(),
         ]
         create_task_tools = [
             *self.datetime_tools.get_tools(),
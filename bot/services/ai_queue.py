@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+AI_MAX_CONCURRENT_REQUESTS = 4
+AI_MAX_WAITING_REQUESTS = 50
+
+
+class AIQueueFull(Exception):
+    """Черга AI запитів заповнена."""
+
+
+class AIRequestQueue:
+    """
+    Обмежена черга AI запитів.
+
+    Одночасно виконується не більше max_concurrent запитів, решта чекає в порядку
+    надходження (не більше max_waiting). Для кожного користувача діє single-flight:
+    новий запит скасовує попередній, який ще чекає або виконується.
+    Запити виконуються у фонових задачах, тож обробник оновлення одразу завершується
+    і звільняє сесію БД та блокування FSM.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = AI_MAX_CONCURRENT_REQUESTS,
+        max_waiting: int = AI_MAX_WAITING_REQUESTS,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self._running = 0
+        self._waiting: deque[object] = deque()
+        self._condition = asyncio.Condition()
+        self._user_tasks: dict[int, asyncio.Task] = {}
+        # Фонові оновлення позиції: event loop тримає лише слабкі посилання на задачі
+        self._position_updates: set[asyncio.Task] = set()
+
+    def submit(
+        self,
+        user_id: int,
+        job: Callable[[], Awaitable[None]],
+        on_position: Callable[[int], Awaitable[None]] | None = None,
+        on_cancel: Callable[[], Awaitable[None]] | None = None,
+    ) -> asyncio.Task:
+        """
+        Ставить запит користувача в чергу.
+
+        :param job: Корутина-фабрика, яка виконує запит.
+        :param on_position: Викликається з позицією в черзі, коли вона змінюється.
+        :param on_cancel: Викликається, якщо запит скасовано новим запитом користувача.
+        """
+        if len(self._waiting) >= self.max_waiting:
+            raise AIQueueFull
+        previous = self._user_tasks.get(user_id)
+        if previous is not None and not previous.done():
+            previous.cancel()
+        task = asyncio.create_task(self._run(job, on_position, on_cancel))
+        self._user_tasks[user_id] = task
+        task.add_done_callback(lambda done: self._forget(user_id, done))
+        return task
+
+    def _forget(self, user_id: int, task: asyncio.Task) -> None:
+        if self._user_tasks.get(user_id) is task:
+            del self._user_tasks[user_id]
+
+    async def _run(
+        self,
+        job: Callable[[], Awaitable[None]],
+        on_position: Callable[[int], Awaitable[None]] | None,
+        on_cancel: Callable[[], Awaitable[None]] | None,
+    ) -> None:
+        try:
+            await self._acquire(on_position)
+            try:
+                await job()
+            finally:
+                await self._release()
+        except asyncio.CancelledError:
+            if on_cancel is not None:
+                await asyncio.shield(on_cancel())
+            raise
+        except Exception:
+            logger.exception("AI request failed")
+
+    async def _acquire(
+        self, on_position: Callable[[int], Awaitable[None]] | None
+    ) -> None:
+        ticket = object()
+        async with self._condition:
+            self._waiting.append(ticket)
+            try:
+                last_position = None
+                while (
+                    self._waiting[0] is not ticket
+                    or self._running >= self.max_concurrent
+                ):
+                    position = self._waiting.index(ticket) + 1
+                    if on_position is not None and position != last_position:
+                        last_position = position
+                        # Telegram запит не повинен тримати блокування черги
+                        update = asyncio.create_task(on_position(position))
+                        self._position_updates.add(update)
+                        update.add_done_callback(self._position_updates.discard)
+                    await self._condition.wait()
+                self._waiting.popleft()
+                self._running += 1
+            except BaseException:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                    self._condition.notify_all()
+                raise
+            self._condition.notify_all()
+
+    async def _release(self) -> None:
+        async with self._condition:
+            self._running -= 1
+            self._condition.notify_all()
+
+
+ai_request_queue = AIRequestQueue()
@@ -3,17 +3,41 @@ import csv
 import datetime
 import logging
 import os
+import re
 from io import StringIO
-from pathlib import Path
-from typing import Any, Dict, Sequence, List, Optional
+from itertools import batched, chain
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
 from zoneinfo import ZoneInfo
 
+from cachetools import LRUCache
+
 from bot.db.models.models import User, WorkSchedule
+from bot.db.repositories.repo import task_fingerprint
 from bot.entities.task import TaskCreate
 from bot.exceptions.user_exceptions import InvalidCSVFile
 from bot.services.ai_agent.tools import TaskTools
+from bot.services.csv_import_manifest import (
+    CSVImportManifest,
+    RowOutcome,
+    csv_row_hash,
+)
+from bot.services.csv_upload import open_csv_upload
+from bot.services.org_directory import DirectoryEntry, OrgDirectory
+from bot.utils.documents import DocumentAttachment, build_csv, store_document
 from bot.utils.unitofwork import UnitOfWork
 from configreader import KYIV
+from scheduler.deadlines import schedule_task_deadlines
+
+TEMPLATES_CACHE_SIZE = 256
 
 SIMPLE_TASK_HEADERS = [
     "Telegram ID",
@@ -29,6 +53,9 @@ SIMPLE_TASK_HEADERS = [
     "Документ",
 ]
 
+# Import is committed and reported in chunks of this many rows
+CSV_IMPORT_CHUNK_ROWS = 50
+
 REGULAR_TASK_HEADERS = [
     "Telegram ID",
     "Ім'я + Посада",
@@ -92,65 +119,64 @@ def get_row_data(user_id: int, full_name_and_position: str, is_regular: bool) ->
         return regular_task_row_data
 
 
-def create_csv_tasks_template(users: Sequence[User], is_regular: bool) -> str:
+def create_csv_tasks_template(
+    users: Sequence[DirectoryEntry], is_regular: bool
+) -> bytes:
     """
-    Create a CSV file (Excel compatible) with all users from the database as a template for regular tasks.
+    Create a CSV file (Excel compatible) in memory with users from the org directory
+    as a template for tasks.
 
     Args:
-        users: List of User objects from the database
+        users: Directory entries of the users to include
         is_regular: Whether the template is for regular tasks or for other tasks (e.g., for reminders)
 
     Returns:
-        str: Path to the saved CSV file
+        bytes: CSV file content
     """
-    # Create headers
     headers = REGULAR_TASK_HEADERS if is_regular else SIMPLE_TASK_HEADERS
+    # An empty row for each user as a template
+    rows = (
+        get_row_data(
+            user.id, f"{user.name} - {user.position_title or 'Не вказано'}", is_regular
+        )
+        for user in users
+    )
+    return build_csv(headers, rows)
 
-    # Create a string buffer for CSV data
-    output = StringIO()
-    writer = csv.writer(output, delimiter=";")
-
-    # Write headers
-    writer.writerow(headers)
-
-    # Write data for each user
-    for user in users:
-        # Prepare user information
-        full_name = user.full_name or user.full_name_tg
-        position_title = user.position.title if user.position else "Не вказано"
-        user_info = f"{full_name} - {position_title}"
-
-        # Create an empty row for the user as a template
-        row_data = get_row_data(user.id, user_info, is_regular)
-        # Write the row
-        writer.writerow(row_data)
-
-    # Convert to bytes
-    csv_data = output.getvalue().encode(
-        "utf-8-sig"
-    )  # Use UTF-8 with BOM for Excel compatibility
-
-    # Create directory for excel files if it doesn't exist
-    excel_dir = Path("csv_files")
-    excel_dir.mkdir(exist_ok=True)
 
-    # Generate a unique filename
-    current_date = datetime.datetime.now().strftime("%Y-%m-%d")
-    if is_regular:
-        filename = f"regular_tasks_template_{current_date}.csv"
-    else:
-        filename = f"simple_tasks_template_{current_date}.csv"
-    file_path = excel_dir / filename
+_templates: LRUCache = LRUCache(maxsize=TEMPLATES_CACHE_SIZE)
 
-    # Save the file to disk
-    with open(file_path, "wb") as f:
-        f.write(csv_data)
 
-    return str(file_path.absolute())
+def get_tasks_template(
+    directory: OrgDirectory, user_id: int, is_regular: bool
+) -> DocumentAttachment:
+    """
+    Шаблон CSV завдань для користувача. Генерується один раз для версії довідника
+    (і дати, від якої залежать значення за замовчуванням у рядках).
+    """
+    current_date = datetime.datetime.now(KYIV).strftime("%Y-%m-%d")
+    cache_key = (directory.version, current_date, user_id, is_regular)
+    document = _templates.get(cache_key)
+    if document is None:
+        prefix = "regular" if is_regular else "simple"
+        document = DocumentAttachment(
+            create_csv_tasks_template(
+                directory.executors_for(user_id), is_regular=is_regular
+            ),
+            filename=f"{prefix}_tasks_template_{current_date}.csv",
+        )
+        _templates[cache_key] = document
+    return document
 
 
 async def parse_tasks_csv(
-    file_path: str, uow: UnitOfWork, task_tools: TaskTools, is_regular: bool
+    file_path: str,
+    uow: UnitOfWork,
+    task_tools: TaskTools,
+    is_regular: bool,
+    on_progress: Callable[[int, int], Awaitable[bool]] | None = None,
+    manifest: Optional[CSVImportManifest] = None,
+    import_batch_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Parse a CSV file with regular tasks and add them to the database.
@@ -172,12 +198,23 @@ async def parse_tasks_csv(
         uow: UnitOfWork object for database operations
         task_tools: TaskTools object for task-related operations
         is_regular: Whether the CSV file is for regular tasks or for other tasks (e.g., for reminders)
+        on_progress: Called with (processed rows, total rows) after every
+            CSV_IMPORT_CHUNK_ROWS rows, once the chunk is committed. Returning False stops the import.
+        manifest: Row outcomes of earlier checks of the same upload. Rows whose content
+            has not changed reuse their outcome instead of being validated and imported again;
+            after each commit it gets the outcomes of rows that were imported without errors
+            or rejected by the format checks. Rows that failed against the database are not
+            recorded and are checked again next time.
+        import_batch_id: Stored on created tasks, so the whole import and its notification
+            deadlines can be undone at once.
 
     Returns:
         Dict with statistics about the update:
         - tasks_created: Number of tasks created
         - errors: List of errors encountered
-        - error_report_path: Path to the error report CSV file (if errors were found)
+        - canceled: Whether on_progress stopped the import
+        - rows_unchanged: Number of rows taken from the manifest
+        - error_report: Reference to the error report CSV from store_document (if errors were found)
     """
     # Check if file exists
     if not os.path.exists(file_path):
@@ -188,64 +225,30 @@ async def parse_tasks_csv(
     stats = {
         "tasks_created": 0,
         "errors": [],
-        "error_report_path": None,
+        "error_report": None,
         "created_tasks_ids": [],
+        "canceled": False,
+        "rows_unchanged": 0,
     }
 
     # Dictionary to store problematic rows with their error messages
     # Key: row index, Value: list of error messages
     problematic_rows = {}
 
-    # Read the CSV file with robust encoding and delimiter handling
-    rows: List[List[str]] | None = None
-    chosen_encoding: Optional[str] = None
-    chosen_delimiter: Optional[str] = None
-
-    encodings_to_try = [
-        "utf-8-sig",
-        "utf-8",
-        "cp1251",
-        "windows-1251",
-        "cp1252",
-        "latin1",
-    ]
-    delimiters_to_try = [";", ","]
-
-    for enc in encodings_to_try:
-        try:
-            for delim in delimiters_to_try:
-                with open(file_path, "r", encoding=enc, newline="") as f:
-                    reader = csv.reader(f, delimiter=delim)
-                    rows = list(reader)
-                    if not rows:
-                        continue  # At least headers exist
-                    headers = rows[0]
-                    logging.info(
-                        f"Parsed headers (encoding={chosen_encoding},"
-                        f" delimiter='{chosen_delimiter}'): {headers}"
-                    )
-                    if len(headers) < headers_count_required:
-                        logging.info(
-                            f"Headers count ({len(headers)}) is less"
-                            f" than required ({headers_count_required}). "
-                            f"Skipping rows with missing headers."
-                        )
-                        continue
-                    chosen_encoding = enc
-                    chosen_delimiter = delim
-                    break
-
-        except UnicodeDecodeError:
-            continue
-        if rows is not None:
-            break
-
-    if rows is None:
-        raise InvalidCSVFile(
-            "Не вдалося прочитати CSV файл. Будь ласка, переконайтесь, що файл збережено в UTF-8 або Windows-1251."
-        )
-
-    if len(rows) < 2:  # At least headers and one data row
+    # Detect encoding and delimiter from the beginning of the file, then stream rows once
+    upload = open_csv_upload(
+        file_path,
+        accept_headers=lambda headers: len(headers) >= headers_count_required,
+        headers_error="Недостатньо стовпців у файлі CSV. Використовуйте шаблон CSV для створення завдань",
+    )
+    headers = upload.headers
+    logging.info(
+        f"Parsed headers (encoding={upload.encoding},"
+        f" delimiter='{upload.delimiter}'): {headers}"
+    )
+    rows = upload.rows()
+    first_row = next(rows, None)
+    if first_row is None:  # At least headers and one data row
         raise InvalidCSVFile(
             "Файл порожній. Використовуйте шаблон CSV для створення регулярних завдань"
         )
@@ -260,294 +263,65 @@ async def parse_tasks_csv(
             )
 
     # Process data rows
-    for row_index, row in enumerate(
-        rows[1:], start=2
-    ):  # Skip headers, start counting from 2 for error messages
-        if len(row) < 7:
-            error_msg = f"Рядок {row_index} має недостатньо інформації: {row}"
-            stats["errors"].append(error_msg)
-            if row_index not in problematic_rows:
-                problematic_rows[row_index] = {"row": row, "errors": []}
-            problematic_rows[row_index]["errors"].append(error_msg)
-            continue
-        month_str = None
-        task_date_str = None
-        year_str = None
-        # Extract data from row
-        try:
-            telegram_id = int(row[0])
-            task_name = row[2].strip()
-            task_description = row[3].strip()
-            if is_regular:
-                month_str = row[4].strip()
-                year_str = row[5].strip()
-                start_time_str = row[6].strip()
-                end_time_str = row[7].strip()
-                category_name = row[8].strip()
-                # Optional fields (photo, video, document) can be empty
-                photo = True if row[9].strip() == "+" else False
-                video = True if row[10].strip() == "+" else False
-                document = True if row[11].strip() == "+" else False
-
-            else:
-                task_date_str = row[4].strip()
-                start_time_str = row[5].strip()
-                end_time_str = row[6].strip()
-                category_name = row[7].strip()
-                # Optional fields (photo, video, document) can be empty
-                photo = True if row[8].strip() == "+" else False
-                video = True if row[9].strip() == "+" else False
-                document = True if row[10].strip() == "+" else False
-
-        except ValueError as e:
-            error_msg = f"Помилка в рядку {row_index}: {e}"
-            stats["errors"].append(error_msg)
-            if row_index not in problematic_rows:
-                problematic_rows[row_index] = {"row": row, "errors": []}
-            problematic_rows[row_index]["errors"].append(error_msg)
-            continue
-        if not is_regular and not task_date_str:
-            error_msg = f"Рядок {row_index}: Дата завдання не може бути порожньою"
-            stats["errors"].append(error_msg)
-            if row_index not in problematic_rows:
-                problematic_rows[row_index] = {"row": row, "errors": []}
-            problematic_rows[row_index]["errors"].append(error_msg)
-            continue
-        if is_regular and not year_str:
-            error_msg = f"Рядок {row_index}: Рік не може бути порожнім"
-            stats["errors"].append(error_msg)
-            if row_index not in problematic_rows:
-                problematic_rows[row_index] = {"row": row, "errors": []}
-        if is_regular and not month_str:
-            error_msg = f"Рядок {row_index}: Місяць не може бути порожнім"
-            stats["errors"].append(error_msg)
-            if row_index not in problematic_rows:
-                problematic_rows[row_index] = {"row": row, "errors": []}
-            problematic_rows[row_index]["errors"].append(error_msg)
-            continue
-        # Validate required fields
-        if not task_name:
-            error_msg = f"Рядок {row_index}: Назва завдання не може бути порожньою"
-            stats["errors"].append(error_msg)
-            if row_index not in problematic_rows:
-                problematic_rows[row_index] = {"row": row, "errors": []}
-            problematic_rows[row_index]["errors"].append(error_msg)
-            continue
-
-        if not start_time_str or not end_time_str:
-            error_msg = f"Рядок {row_index}: Час початку та кінця завдання не можуть бути порожніми"
-            stats["errors"].append(error_msg)
-            if row_index not in problematic_rows:
-                problematic_rows[row_index] = {"row": row, "errors": []}
-            problematic_rows[row_index]["errors"].append(error_msg)
-            continue
-
-        # Parse time values
-        if not is_regular:
-            try:
-                task_date = datetime.datetime.strptime(task_date_str, "%Y-%m-%d").date()
-                if task_date < datetime.date.today():
-                    error_msg = f"Рядок {row_index}: Дата завдання ({task_date_str}) не може бути в минулому"
-                    stats["errors"].append(error_msg)
-                    if row_index not in problematic_rows:
-                        problematic_rows[row_index] = {"row": row, "errors": []}
-                    problematic_rows[row_index]["errors"].append(error_msg)
-                    continue
-            except ValueError:
-                error_msg = f"Рядок {row_index}: Неправильний формат дати. Використовуйте формат YYYY-MM-DD"
-                stats["errors"].append(error_msg)
-                if row_index not in problematic_rows:
-                    problematic_rows[row_index] = {"row": row, "errors": []}
-                problematic_rows[row_index]["errors"].append(error_msg)
-                continue
-        try:
-            start_time = (
-                datetime.datetime.strptime(start_time_str, "%H:%M")
-                .replace(tzinfo=KYIV)
-                .time()
-            )
-            end_time = (
-                datetime.datetime.strptime(end_time_str, "%H:%M")
-                .replace(tzinfo=KYIV)
-                .time()
-            )
-            if start_time >= end_time:
-                error_msg = f"Рядок {row_index}: Час початку ({start_time_str}) не може бути пізніше або дорівнювати часу кінця ({end_time_str})"
-                stats["errors"].append(error_msg)
-                if row_index not in problematic_rows:
-                    problematic_rows[row_index] = {"row": row, "errors": []}
-                problematic_rows[row_index]["errors"].append(error_msg)
+    total_rows = upload.count_rows() if on_progress is not None else 0
+    processed_rows = 0
+    # Category name -> ID for the whole import
+    categories: Dict[str, int] = {}
+    # Skip headers, start counting from 2 for error messages
+    numbered_rows = enumerate(chain([first_row], rows), start=2)
+    # Rows are checked against the database a chunk at a time: executors, shifts
+    # and availability of all tasks of the chunk are loaded with a few queries
+    for chunk in batched(numbered_rows, CSV_IMPORT_CHUNK_ROWS):
+        if on_progress is not None and processed_rows:
+            await uow.commit()
+            if manifest is not None:
+                await manifest.save()
+            if not await on_progress(processed_rows, max(total_rows, processed_rows)):
+                stats["canceled"] = True
+                break
+        processed_rows += len(chunk)
+        parsed_rows = []
+        row_hashes = {}
+        # Rows rejected by the format checks alone: their outcome does not depend on the database
+        malformed_rows = set()
+        for row_index, row in chunk:
+            row_hash = csv_row_hash(row)
+            outcome = manifest.take(row_hash) if manifest is not None else None
+            if outcome is not None:
+                # The row has not changed since an earlier check of this upload
+                _apply_row_outcome(outcome, row, row_index, problematic_rows, stats)
+                stats["rows_unchanged"] += 1
                 continue
-        except ValueError:
-            error_msg = f"Рядок {row_index}: Неправильний формат часу. Використовуйте формат HH:MM"
-            stats["errors"].append(error_msg)
-            if row_index not in problematic_rows:
-                problematic_rows[row_index] = {"row": row, "errors": []}
-            problematic_rows[row_index]["errors"].append(error_msg)
-            continue
-
-        # Find user by Telegram ID
-        user = await uow.users.find_one(id=telegram_id)
-        if not user:
-            error_msg = (
-                f"Рядок {row_index}: Користувач з Telegram ID {telegram_id} не знайдено"
-            )
-            stats["errors"].append(error_msg)
-            if row_index not in problematic_rows:
-                problematic_rows[row_index] = {"row": row, "errors": []}
-            problematic_rows[row_index]["errors"].append(error_msg)
-            continue
-
-        # Find or create category if provided
-        category_id: Optional[int] = None
-        if category_name:
-            category = await uow.task_categories.find_one(name=category_name)
-            if not category:
-                # Create new category and get its id
-                category_id = await uow.task_categories.add_one({"name": category_name})
+            row_hashes[row_index] = row_hash
+            parsed = _parse_task_row(row, row_index, is_regular, problematic_rows, stats)
+            if parsed is not None:
+                parsed_rows.append((row_index, row, parsed))
             else:
-                category_id = category.id
-        if not is_regular:
-            # Get all work schedules for the user in the future
-            future_work_schedules: Sequence[
-                WorkSchedule
-            ] = await uow.work_schedules.get_all_work_schedule_in_user(
-                user_id=user.id,
-                from_date=task_date,
-                to_date=task_date,
-            )
-        else:
-            # Process regular task creation: month-based without specific date
-            try:
-                task_month = int(month_str)
-                if task_month < 1 or task_month > 12:
-                    raise ValueError
-            except Exception:
-                error_msg = f"Рядок {row_index}: Неправильний місяць '{month_str}'. Вкажіть число від 1 до 12"
-                stats["errors"].append(error_msg)
-                if row_index not in problematic_rows:
-                    problematic_rows[row_index] = {"row": row, "errors": []}
-                problematic_rows[row_index]["errors"].append(error_msg)
-                continue
-
-            await _create_regular_task(
-                uow=uow,
-                task_tools=task_tools,
-                user=user,
-                task_name=task_name,
-                task_description=task_description,
-                task_month=task_month,
-                task_year=int(year_str),
-                start_time=start_time,
-                end_time=end_time,
-                category_id=category_id,
-                photo=photo,
-                video=video,
-                document=document,
-                start_time_str=start_time_str,
-                end_time_str=end_time_str,
-                row_index=row_index,
-                row=row,
-                problematic_rows=problematic_rows,
-                stats=stats,
-            )
-            # For regular tasks, continue to next row
-            continue
-
-        if not future_work_schedules:
-            error_msg = f"Рядок {row_index}: Користувач з Telegram ID {telegram_id} не має робочих днів у майбутньому"
-            stats["errors"].append(error_msg)
-            if row_index not in problematic_rows:
-                problematic_rows[row_index] = {"row": row, "errors": []}
-            problematic_rows[row_index]["errors"].append(error_msg)
-            continue
-
-        # Create tasks for each work day
-        for schedule in future_work_schedules:
-            # Create datetime objects for start and end times
-            schedule_date = schedule.date
-            if schedule.start_time > start_time:
-                error_msg = f"Рядок {row_index}: Час початку ({start_time_str}) не може бути раніше робочого часу ({schedule.start_time})"
-                stats["errors"].append(error_msg)
-                if row_index not in problematic_rows:
-                    problematic_rows[row_index] = {"row": row, "errors": []}
-                problematic_rows[row_index]["errors"].append(error_msg)
-                break
-            if schedule.end_time < end_time:
-                error_msg = f"Рядок {row_index}: Час кінця ({end_time_str}) не може бути пізніше робочого часу ({schedule.end_time})"
-                stats["errors"].append(error_msg)
-                if row_index not in problematic_rows:
-                    problematic_rows[row_index] = {"row": row, "errors": []}
-                problematic_rows[row_index]["errors"].append(error_msg)
-                break
-            start_datetime = datetime.datetime.combine(
-                schedule_date, start_time
-            ).replace(tzinfo=KYIV)
-            end_datetime = datetime.datetime.combine(schedule_date, end_time).replace(
-                tzinfo=KYIV
-            )
-
-            # Check if task already exists for this user, date, and time
-            existing_tasks = await uow.tasks.get_all_tasks(
-                executor_id=user.id,
-                start_datetime=start_datetime,
-                end_datetime=end_datetime,
-            )
-
-            existing_task_found = False
-            for task in existing_tasks:
-                if (
-                    task.title == task_name
-                    and task.description == task_description
-                    and task.category_id == category_id
-                    and task.start_datetime == start_datetime
-                ):
-                    existing_task_found = True
-                    error_msg = f"Рядок {row_index}: Завдання вже існує для користувача {user.full_name} на {schedule_date} з часом початку {start_time_str} та кінця {end_time_str}"
-                    stats["errors"].append(error_msg)
-                    if row_index not in problematic_rows:
-                        problematic_rows[row_index] = {"row": row, "errors": []}
-                    problematic_rows[row_index]["errors"].append(error_msg)
-                    break
-
-            if existing_task_found:
-                break  # Skip creating this task as it already exists
-
-            # Create new task
-            task_create = TaskCreate(
-                creator_id=task_tools.user_id,  # User creates their own regular task
-                executor_id=user.id,
-                title=task_name,
-                description=task_description,
-                start_datetime=start_datetime,
-                end_datetime=end_datetime,
-                category_id=category_id,
-                photo_required=photo,
-                video_required=video,
-                file_required=document,
-            )
-
-            # Add task to database
-            new_task = task_create.model_dump(exclude_unset=True)
-            task_id = await uow.tasks.add_one(new_task)
-            await task_tools.create_notification_task_started(
-                task_id,
-                _defer_until=task_create.start_datetime,
-            )
-            await task_tools.create_notification_task_is_overdue(
-                task_id,
-                _defer_until=task_create.end_datetime,
-            )
-            await task_tools.create_notification_task_ending_soon(
-                task_id,
-                _defer_until=task_create.end_datetime - datetime.timedelta(minutes=30),
-            )
-
-            stats["tasks_created"] += 1
-            stats["created_tasks_ids"].append(task_id)
+                malformed_rows.add(row_index)
+        created = await _import_task_chunk(
+            uow,
+            task_tools,
+            parsed_rows,
+            is_regular,
+            problematic_rows,
+            stats,
+            categories,
+            import_batch_id,
+        )
+        if manifest is not None:
+            for row_index, row_hash in row_hashes.items():
+                errors = problematic_rows.get(row_index, {}).get("errors", [])
+                task_ids = created.get(row_index, [])
+                # Errors found against the database (no user, no shift, a duplicate)
+                # may go away without the row changing, so such rows are checked again
+                if row_index in malformed_rows or (task_ids and not errors):
+                    manifest.record(row_hash, row_index, errors=errors, task_ids=task_ids)
 
-        # Commit changes after processing each user
     await uow.commit()
+    if manifest is not None:
+        await manifest.save()
+    if on_progress is not None and not stats["canceled"]:
+        await on_progress(processed_rows, processed_rows)
 
     # Create error report CSV if there are any problematic rows
     if problematic_rows:
@@ -587,31 +361,422 @@ async def parse_tasks_csv(
         # Convert to bytes with UTF-8 encoding and BOM for Excel compatibility
         csv_data = output.getvalue().encode("utf-8-sig")
 
-        # Create directory for error reports if it doesn't exist
-        excel_dir = Path("csv_files")
-        excel_dir.mkdir(exist_ok=True)
-
-        # Generate a unique filename with timestamp to avoid overwriting previous reports
         current_date = datetime.datetime.now().strftime("%Y-%m-%d")
         filename = (
             f"simple_tasks_errors_{current_date}.csv"
             if not is_regular
             else f"regular_tasks_errors_{current_date}.csv"
         )
-        file_path = excel_dir / filename
-
-        # Save the file to disk
-        with open(file_path, "wb") as f:
-            f.write(csv_data)
-
-        # Add error report path to stats for the caller to access
-        stats["error_report_path"] = str(file_path.absolute())
-        logging.info(f"Error report created at: {stats['error_report_path']}")
+        # The report is kept in Redis by content hash; dialog_data stores only the reference
+        stats["error_report"] = await store_document(csv_data, filename)
+        logging.info(f"Error report created: {stats['error_report']}")
 
     logging.info(f"Regular tasks creation stats: {stats}")
     return stats
 
 
+class ParsedTaskRow(NamedTuple):
+    """Values of a CSV row that passed the format checks."""
+
+    telegram_id: int
+    task_name: str
+    task_description: str
+    # Simple tasks: the date of the executor's shift; regular tasks: month and year
+    task_date: Optional[datetime.date]
+    task_month: Optional[int]
+    task_year: Optional[int]
+    start_time: datetime.time
+    end_time: datetime.time
+    start_time_str: str
+    end_time_str: str
+    category_name: str
+    photo: bool
+    video: bool
+    document: bool
+
+
+def _add_row_error(
+    problematic_rows: Dict[int, Dict[str, Any]],
+    stats: Dict[str, Any],
+    row_index: int,
+    row: List[str],
+    error_msg: str,
+) -> None:
+    stats["errors"].append(error_msg)
+    problematic_rows.setdefault(row_index, {"row": row, "errors": []})[
+        "errors"
+    ].append(error_msg)
+
+
+def _parse_task_row(
+    row: List[str],
+    row_index: int,
+    is_regular: bool,
+    problematic_rows: Dict[int, Dict[str, Any]],
+    stats: Dict[str, Any],
+) -> Optional[ParsedTaskRow]:
+    """
+    Check the format of one CSV row, without the database.
+    Errors go to problematic_rows[row_index] and stats["errors"].
+
+    Returns:
+        The parsed row, or None if the row has errors.
+    """
+
+    def error(error_msg: str) -> None:
+        _add_row_error(problematic_rows, stats, row_index, row, error_msg)
+
+    if len(row) < 7:
+        error(f"Рядок {row_index} має недостатньо інформації: {row}")
+        return None
+    month_str = None
+    task_date_str = None
+    year_str = None
+    # Extract data from row
+    try:
+        telegram_id = int(row[0])
+        task_name = row[2].strip()
+        task_description = row[3].strip()
+        if is_regular:
+            month_str = row[4].strip()
+            year_str = row[5].strip()
+            start_time_str = row[6].strip()
+            end_time_str = row[7].strip()
+            category_name = row[8].strip()
+            # Optional fields (photo, video, document) can be empty
+            photo = True if row[9].strip() == "+" else False
+            video = True if row[10].strip() == "+" else False
+            document = True if row[11].strip() == "+" else False
+
+        else:
+            task_date_str = row[4].strip()
+            start_time_str = row[5].strip()
+            end_time_str = row[6].strip()
+            category_name = row[7].strip()
+            # Optional fields (photo, video, document) can be empty
+            photo = True if row[8].strip() == "+" else False
+            video = True if row[9].strip() == "+" else False
+            document = True if row[10].strip() == "+" else False
+
+    except (ValueError, IndexError) as e:
+        error(f"Помилка в рядку {row_index}: {e}")
+        return None
+    if not is_regular and not task_date_str:
+        error(f"Рядок {row_index}: Дата завдання не може бути порожньою")
+        return None
+    if is_regular and not year_str:
+        error(f"Рядок {row_index}: Рік не може бути порожнім")
+        return None
+    if is_regular and not month_str:
+        error(f"Рядок {row_index}: Місяць не може бути порожнім")
+        return None
+    # Validate required fields
+    if not task_name:
+        error(f"Рядок {row_index}: Назва завдання не може бути порожньою")
+        return None
+
+    if not start_time_str or not end_time_str:
+        error(
+            f"Рядок {row_index}: Час початку та кінця завдання не можуть бути порожніми"
+        )
+        return None
+
+    task_date = None
+    task_month = None
+    task_year = None
+    if not is_regular:
+        try:
+            task_date = datetime.datetime.strptime(task_date_str, "%Y-%m-%d").date()
+        except ValueError:
+            error(
+                f"Рядок {row_index}: Неправильний формат дати. Використовуйте формат YYYY-MM-DD"
+            )
+            return None
+        if task_date < datetime.date.today():
+            error(
+                f"Рядок {row_index}: Дата завдання ({task_date_str}) не може бути в минулому"
+            )
+            return None
+    else:
+        # Regular tasks are month-based without specific date
+        try:
+            task_month = int(month_str)
+            if task_month < 1 or task_month > 12:
+                raise ValueError
+        except ValueError:
+            error(
+                f"Рядок {row_index}: Неправильний місяць '{month_str}'. Вкажіть число від 1 до 12"
+            )
+            return None
+        try:
+            task_year = int(year_str)
+        except ValueError:
+            error(f"Рядок {row_index}: Неправильний рік '{year_str}'")
+            return None
+
+    # Parse time values
+    try:
+        start_time = datetime.datetime.strptime(start_time_str, "%H:%M").time()
+        end_time = datetime.datetime.strptime(end_time_str, "%H:%M").time()
+    except ValueError:
+        error(
+            f"Рядок {row_index}: Неправильний формат часу. Використовуйте формат HH:MM"
+        )
+        return None
+    # A simple task may end after midnight within a night shift (end before start);
+    # regular tasks are created for one calendar day
+    if start_time == end_time or (is_regular and start_time > end_time):
+        error(
+            f"Рядок {row_index}: Час початку ({start_time_str}) не може бути пізніше або дорівнювати часу кінця ({end_time_str})"
+        )
+        return None
+
+    return ParsedTaskRow(
+        telegram_id=telegram_id,
+        task_name=task_name,
+        task_description=task_description,
+        task_date=task_date,
+        task_month=task_month,
+        task_year=task_year,
+        start_time=start_time,
+        end_time=end_time,
+        start_time_str=start_time_str,
+        end_time_str=end_time_str,
+        category_name=category_name,
+        photo=photo,
+        video=video,
+        document=document,
+    )
+
+
+def task_interval_in_shift(
+    schedule: WorkSchedule,
+    start_time: datetime.time,
+    end_time: datetime.time,
+) -> tuple[datetime.datetime, datetime.datetime]:
+    """
+    Start and end of a task given by clock times within the executor's shift.
+    In a night shift (end_time < start_time) the times before the shift start
+    belong to the next day; a task whose end is before its start ends the next day.
+    """
+    start = datetime.datetime.combine(schedule.date, start_time)
+    if schedule.end_time < schedule.start_time and start_time < schedule.start_time:
+        start += datetime.timedelta(days=1)
+    end = datetime.datetime.combine(start.date(), end_time)
+    if end_time < start_time:
+        end += datetime.timedelta(days=1)
+    return start.replace(tzinfo=KYIV), end.replace(tzinfo=KYIV)
+
+
+async def _get_category_id(
+    uow: UnitOfWork, categories: Dict[str, int], category_name: str
+) -> Optional[int]:
+    """Find or create a category; ids are remembered for the rest of the import."""
+    if not category_name:
+        return None
+    if category_name not in categories:
+        category = await uow.task_categories.find_one(name=category_name)
+        if category:
+            categories[category_name] = category.id
+        else:
+            categories[category_name] = await uow.task_categories.add_one(
+                {"name": category_name}
+            )
+    return categories[category_name]
+
+
+async def _import_task_chunk(
+    uow: UnitOfWork,
+    task_tools: TaskTools,
+    rows: List[tuple[int, List[str], ParsedTaskRow]],
+    is_regular: bool,
+    problematic_rows: Dict[int, Dict[str, Any]],
+    stats: Dict[str, Any],
+    categories: Dict[str, int],
+    import_batch_id: Optional[str] = None,
+) -> Dict[int, List[int]]:
+    """
+    Check the parsed rows of one chunk against the database and create their tasks.
+    Executors, their shifts and the availability of every task are loaded for the
+    whole chunk at once; simple tasks are inserted with one statement.
+    Errors go to problematic_rows and stats["errors"].
+
+    Returns:
+        Row index -> ids of the tasks created for the row.
+    """
+    created: Dict[int, List[int]] = {}
+    if not rows:
+        return created
+    users = {
+        user.id: user
+        for user in await uow.users.get_users_by_ids(
+            list({parsed.telegram_id for _, _, parsed in rows})
+        )
+    }
+    found = []
+    for row_index, row, parsed in rows:
+        user = users.get(parsed.telegram_id)
+        if not user:
+            _add_row_error(
+                problematic_rows,
+                stats,
+                row_index,
+                row,
+                f"Рядок {row_index}: Користувач з Telegram ID {parsed.telegram_id} не знайдено",
+            )
+            continue
+        category_id = await _get_category_id(uow, categories, parsed.category_name)
+        found.append((row_index, row, parsed, user, category_id))
+
+    if is_regular:
+        for row_index, row, parsed, user, category_id in found:
+            created_before = len(stats["created_tasks_ids"])
+            await _create_regular_task(
+                uow=uow,
+                task_tools=task_tools,
+                user=user,
+                task_name=parsed.task_name,
+                task_description=parsed.task_description,
+                task_month=parsed.task_month,
+                task_year=parsed.task_year,
+                start_time=parsed.start_time,
+                end_time=parsed.end_time,
+                category_id=category_id,
+                photo=parsed.photo,
+                video=parsed.video,
+                document=parsed.document,
+                start_time_str=parsed.start_time_str,
+                end_time_str=parsed.end_time_str,
+                row_index=row_index,
+                row=row,
+                problematic_rows=problematic_rows,
+                stats=stats,
+                import_batch_id=import_batch_id,
+            )
+            created[row_index] = stats["created_tasks_ids"][created_before:]
+        return created
+
+    # Shifts of the chunk's executors on the chunk's dates (GiST index on shift)
+    task_dates = [parsed.task_date for _, _, parsed, _, _ in found]
+    schedules = (
+        await uow.work_schedules.get_shifts_overlapping(
+            start=datetime.datetime.combine(min(task_dates), datetime.time.min),
+            end=datetime.datetime.combine(max(task_dates), datetime.time.max),
+            user_ids=list({user.id for _, _, _, user, _ in found}),
+        )
+        if found
+        else []
+    )
+    schedule_by_key = {(schedule.user_id, schedule.date): schedule for schedule in schedules}
+    planned = []
+    for row_index, row, parsed, user, category_id in found:
+        schedule = schedule_by_key.get((user.id, parsed.task_date))
+        if schedule is None:
+            _add_row_error(
+                problematic_rows,
+                stats,
+                row_index,
+                row,
+                f"Рядок {row_index}: Користувач з Telegram ID {parsed.telegram_id} не має робочої зміни на {parsed.task_date}",
+            )
+            continue
+        start_datetime, end_datetime = task_interval_in_shift(
+            schedule, parsed.start_time, parsed.end_time
+        )
+        planned.append(
+            (row_index, row, parsed, user, category_id, schedule, start_datetime, end_datetime)
+        )
+
+    # The whole task interval has to be inside one shift of the executor
+    available = await uow.work_schedules.check_availability_many(
+        [(user.id, start, end) for _, _, _, user, _, _, start, end in planned]
+    )
+    to_create = []
+    for item, is_available in zip(planned, available):
+        row_index, row, parsed, user, category_id, schedule, start_datetime, end_datetime = item
+        if not is_available:
+            _add_row_error(
+                problematic_rows,
+                stats,
+                row_index,
+                row,
+                f"Рядок {row_index}: Час завдання ({parsed.start_time_str}-{parsed.end_time_str}) виходить за межі робочої зміни ({schedule.start_time:%H:%M}-{schedule.end_time:%H:%M})",
+            )
+            continue
+        task_create = TaskCreate(
+            creator_id=task_tools.user_id,  # User creates their own regular task
+            executor_id=user.id,
+            title=parsed.task_name,
+            description=parsed.task_description,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+            category_id=category_id,
+            photo_required=parsed.photo,
+            video_required=parsed.video,
+            file_required=parsed.document,
+        )
+        fingerprint = task_fingerprint(
+            task_create.executor_id,
+            task_create.start_datetime,
+            task_create.end_datetime,
+            task_create.title,
+            task_create.description,
+            task_create.category_id,
+        )
+        to_create.append((row_index, row, parsed, user, task_create, fingerprint))
+
+    # Existing identical tasks (same fingerprint) and repeats within the chunk are skipped
+    created_ids = await uow.tasks.add_many_if_new(
+        [
+            {
+                **task_create.model_dump(exclude_unset=True),
+                "import_batch_id": import_batch_id,
+            }
+            for _, _, _, _, task_create, _ in to_create
+        ]
+    )
+    deadlines = []
+    for row_index, row, parsed, user, task_create, fingerprint in to_create:
+        task_id = created_ids.pop(fingerprint, None)
+        if task_id is None:
+            _add_row_error(
+                problematic_rows,
+                stats,
+                row_index,
+                row,
+                f"Рядок {row_index}: Завдання вже існує для користувача {user.full_name} на {parsed.task_date} з часом початку {parsed.start_time_str} та кінця {parsed.end_time_str}",
+            )
+            continue
+        stats["tasks_created"] += 1
+        stats["created_tasks_ids"].append(task_id)
+        created[row_index] = [task_id]
+        deadlines.append((task_id, task_create.start_datetime, task_create.end_datetime))
+    await schedule_task_deadlines(task_tools.arq, deadlines)
+    return created
+
+
+def _apply_row_outcome(
+    outcome: RowOutcome,
+    row: List[str],
+    row_index: int,
+    problematic_rows: Dict[int, Dict[str, Any]],
+    stats: Dict[str, Any],
+) -> None:
+    """Add the recorded outcome of an unchanged row to the current statistics."""
+    stats["created_tasks_ids"].extend(outcome.task_ids)
+    if not outcome.errors:
+        return
+    # The row may have moved in the corrected file, so messages get its current number
+    errors = [
+        re.sub(
+            rf"((?:[Рр]ядок|рядку) ){outcome.row_index}\b", rf"\g<1>{row_index}", error
+        )
+        for error in outcome.errors
+    ]
+    stats["errors"].extend(errors)
+    problematic_rows[row_index] = {"row": row, "errors": errors}
+
+
 def timetz_with_fixed_offset(
     local_t: datetime.time, year: int, month: int, tz_key="Europe/Kyiv"
 ) -> datetime.time:
@@ -646,6 +811,7 @@ async def _create_regular_task(
     row: List[str],
     problematic_rows: Dict[int, Dict[str, Any]],
     stats: Dict[str, Any],
+    import_batch_id: Optional[str] = None,
 ) -> None:
     """Create a regular (monthly) task for a user or record an error if duplicate exists.
 
@@ -687,6 +853,7 @@ async def _create_regular_task(
         "photo_required": photo,
         "video_required": video,
         "file_required": document,
+        "import_batch_id": import_batch_id,
     }
     regular_task_id = await uow.regular_tasks.add_one(regular_task_data)
     stats["tasks_created"] += 1
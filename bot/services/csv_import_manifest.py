@@ -0,0 +1,100 @@
+import datetime
+import hashlib
+import json
+import uuid
+from typing import NamedTuple, Sequence
+
+from bot.db.redis import redis
+
+CSV_MANIFEST_TTL = datetime.timedelta(days=1)
+
+
+class RowOutcome(NamedTuple):
+    row_index: int
+    errors: list[str]
+    task_ids: list[int]
+
+
+def csv_manifest_key(manifest_id: str) -> str:
+    return f"csv_import:manifest:{manifest_id}"
+
+
+def new_csv_manifest_id() -> str:
+    return uuid.uuid4().hex
+
+
+def csv_row_hash(row: Sequence[str]) -> str:
+    """Хеш вмісту рядка; пробіли навколо значень не враховуються, як і при розборі."""
+    content = "\x1f".join(cell.strip() for cell in row)
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+class CSVImportManifest:
+    """
+    Результати рядків, вже оброблених в межах одного завантаження (хеш рядка -> RowOutcome).
+    Повторна перевірка виправленого файлу бере результат незмінених рядків звідси
+    і валідує та імпортує лише змінені.
+
+    Записуються лише результати, що не залежать від стану БД: створені без помилок
+    завдання та помилки формату рядка. Рядок, що не пройшов перевірку в БД
+    (немає користувача, зміни, дублікат), перевіряється заново.
+    """
+
+    __slots__ = ("manifest_id", "_entries", "_known", "_pending")
+
+    def __init__(self, manifest_id: str, entries: dict[str, RowOutcome]):
+        self.manifest_id = manifest_id
+        self._entries = entries
+        self._known = set(entries)
+        self._pending: dict[str, RowOutcome] = {}
+
+    @classmethod
+    async def load(cls, manifest_id: str) -> "CSVImportManifest":
+        raw = await redis.hgetall(csv_manifest_key(manifest_id))
+        return cls(
+            manifest_id,
+            {
+                row_hash.decode(): RowOutcome(*json.loads(value))
+                for row_hash, value in raw.items()
+            },
+        )
+
+    def take(self, row_hash: str) -> RowOutcome | None:
+        """
+        Результат з попередніх перевірок. Кожен запис видається один раз,
+        тож однакові рядки в одному файлі обробляються як раніше.
+        """
+        return self._entries.pop(row_hash, None)
+
+    def record(
+        self,
+        row_hash: str,
+        row_index: int,
+        errors: list[str],
+        task_ids: list[int],
+    ) -> None:
+        if row_hash in self._known:
+            return
+        self._known.add(row_hash)
+        self._pending[row_hash] = RowOutcome(row_index, list(errors), list(task_ids))
+
+    async def save(self) -> None:
+        """Зберігає нові записи. Викликати після коміту рядків, яких вони стосуються."""
+        if not self._pending:
+            return
+        key = csv_manifest_key(self.manifest_id)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                key,
+                mapping={
+                    row_hash: json.dumps(outcome)
+                    for row_hash, outcome in self._pending.items()
+                },
+            )
+            pipe.expire(key, CSV_MANIFEST_TTL)
+            await pipe.execute()
+        self._pending.clear()
+
+
+async def delete_csv_manifest(manifest_id: str) -> None:
+    await redis.delete(csv_manifest_key(manifest_id))
@@ -0,0 +1,185 @@
+import datetime
+import json
+import logging
+import time
+import uuid
+from contextlib import suppress
+from pathlib import Path
+from typing import Literal, TypeAlias
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from arq import ArqRedis
+
+from bot.db.redis import json_serializer, redis
+from bot.exceptions.user_exceptions import InvalidCSVFile
+from bot.services.ai_agent.tools import TaskTools
+from bot.services.create_task_with_csv import parse_tasks_csv
+from bot.services.csv_import_manifest import CSVImportManifest
+from bot.utils.unitofwork import UnitOfWork
+
+logger = logging.getLogger(__name__)
+
+CSV_IMPORT_STATUS: TypeAlias = Literal[
+    "queued", "running", "done", "failed", "canceled"
+]
+
+CSV_IMPORT_TTL = datetime.timedelta(days=1)
+CSV_IMPORTS_DIR = Path("csv_files") / "imports"
+# Не частіше одного редагування повідомлення з прогресом за цей час (ліміти Telegram)
+PROGRESS_EDIT_INTERVAL = 3.0
+CSV_IMPORT_JOB_TIMEOUT = 60 * 60
+
+
+def csv_import_key(import_id: str) -> str:
+    return f"csv_import:{import_id}"
+
+
+async def set_csv_import_state(import_id: str, **fields) -> None:
+    key = csv_import_key(import_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hset(key, mapping={name: str(value) for name, value in fields.items()})
+        pipe.expire(key, CSV_IMPORT_TTL)
+        await pipe.execute()
+
+
+async def get_csv_import_state(import_id: str) -> dict:
+    """
+    Стан імпорту: status, processed, total, error (для failed)
+    та result (статистика parse_tasks_csv після завершення).
+    """
+    raw = await redis.hgetall(csv_import_key(import_id))
+    state = {key.decode(): value.decode() for key, value in raw.items()}
+    if not state:
+        return {}
+    state["processed"] = int(state.get("processed", 0))
+    state["total"] = int(state.get("total", 0))
+    if "result" in state:
+        state["result"] = json.loads(state["result"])
+    return state
+
+
+async def cancel_csv_import(import_id: str) -> None:
+    """Імпорт зупиняється на межі наступної пачки рядків; створене раніше лишається."""
+    await set_csv_import_state(import_id, cancel=1)
+
+
+async def is_csv_import_canceled(import_id: str) -> bool:
+    return await redis.hget(csv_import_key(import_id), "cancel") == b"1"
+
+
+async def submit_csv_import(
+    arq: ArqRedis,
+    *,
+    user_id: int,
+    chat_id: int,
+    message_id: int,
+    file_id: str,
+    is_regular: bool,
+    manifest_id: str,
+) -> str:
+    """
+    Ставить імпорт CSV у чергу arq.
+
+    :param message_id: Повідомлення, в якому воркер показує прогрес.
+    :param manifest_id: Маніфест рядків завантаження: при повторній перевірці
+        виправленого файлу передається той самий, і незмінені рядки не обробляються знову.
+    :return: ID імпорту для get_csv_import_state та cancel_csv_import.
+    """
+    import_id = uuid.uuid4().hex
+    await set_csv_import_state(import_id, status="queued", processed=0, total=0)
+    await arq.enqueue_job(
+        "import_tasks_csv",
+        import_id=import_id,
+        user_id=user_id,
+        chat_id=chat_id,
+        message_id=message_id,
+        file_id=file_id,
+        is_regular=is_regular,
+        manifest_id=manifest_id,
+        _job_id=csv_import_key(import_id),
+    )
+    return import_id
+
+
+async def run_csv_import(
+    bot: Bot,
+    arq: ArqRedis,
+    *,
+    import_id: str,
+    user_id: int,
+    chat_id: int,
+    message_id: int,
+    file_id: str,
+    is_regular: bool,
+    manifest_id: str,
+) -> None:
+    """
+    Виконує імпорт у воркері: завантажує файл, обробляє його пачками з комітом
+    після кожної, оновлює прогрес у Redis і в повідомленні користувача,
+    результат зберігає в Redis для діалогу.
+    """
+
+    async def edit_progress(text: str) -> None:
+        with suppress(TelegramBadRequest):
+            await bot.edit_message_text(text, chat_id=chat_id, message_id=message_id)
+
+    if await is_csv_import_canceled(import_id):
+        await set_csv_import_state(import_id, status="canceled")
+        await edit_progress("⛔ Імпорт скасовано.")
+        return
+
+    last_edit = 0.0
+
+    async def on_progress(processed: int, total: int) -> bool:
+        nonlocal last_edit
+        await set_csv_import_state(import_id, processed=processed, total=total)
+        if time.monotonic() - last_edit >= PROGRESS_EDIT_INTERVAL:
+            last_edit = time.monotonic()
+            await edit_progress(f"⚙️ Імпорт завдань: {processed} з {total} рядків...")
+        return not await is_csv_import_canceled(import_id)
+
+    await set_csv_import_state(import_id, status="running")
+    await edit_progress("⚙️ Імпорт завдань розпочато...")
+    file_path = CSV_IMPORTS_DIR / f"{import_id}.csv"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        await bot.download(file_id, destination=file_path)
+        manifest = await CSVImportManifest.load(manifest_id)
+        uow = UnitOfWork()
+        async with uow:
+            task_tools = TaskTools(uow=uow, arq=arq, user_id=user_id)
+            result = await parse_tasks_csv(
+                str(file_path),
+                uow,
+                task_tools,
+                is_regular,
+                on_progress=on_progress,
+                manifest=manifest,
+                # Пакет імпорту - усе завантаження разом з повторними перевірками
+                import_batch_id=manifest_id,
+            )
+    except InvalidCSVFile as e:
+        await set_csv_import_state(import_id, status="failed", error=str(e))
+        await edit_progress("❌ Помилка в CSV файлі. Деталі - у меню імпорту.")
+        return
+    except Exception as e:
+        logger.exception("CSV import %s failed", import_id)
+        await set_csv_import_state(
+            import_id, status="failed", error="Не вдалося обробити файл"
+        )
+        await edit_progress("❌ Не вдалося обробити файл.")
+        raise e
+    finally:
+        file_path.unlink(missing_ok=True)
+
+    status: CSV_IMPORT_STATUS = "canceled" if result.get("canceled") else "done"
+    await set_csv_import_state(
+        import_id,
+        status=status,
+        result=json.dumps(result, default=json_serializer),
+    )
+    await edit_progress(
+        f"{'⛔ Імпорт скасовано' if status == 'canceled' else '✅ Імпорт завершено'}: "
+        f"створено {result['tasks_created']} завдань, помилок: {len(result['errors'])}."
+    )
@@ -0,0 +1,118 @@
+import codecs
+import csv
+from io import StringIO
+from typing import Callable, Iterator, Sequence
+
+from bot.exceptions.user_exceptions import InvalidCSVFile
+
+# Кодування в порядку спроб. utf-8-sig читає і UTF-8 без BOM,
+# windows-1251 - це той самий cp1251
+CSV_ENCODINGS = ("utf-8-sig", "cp1251", "cp1252", "latin1")
+CSV_DELIMITERS = (";", ",")
+# Формат визначається за початком файлу, а не за всім вмістом
+CSV_SAMPLE_BYTES = 64 * 1024
+CSV_READ_CHUNK_BYTES = 1024 * 1024
+
+
+class CSVUpload:
+    """
+    Завантажений CSV файл з визначеними кодуванням і роздільником.
+    Рядки даних читаються потоково, файл декодується один раз за прохід.
+    """
+
+    __slots__ = ("file_path", "encoding", "delimiter", "headers")
+
+    def __init__(
+        self, file_path: str, encoding: str, delimiter: str, headers: list[str]
+    ):
+        self.file_path = file_path
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self.headers = headers
+
+    def rows(self) -> Iterator[list[str]]:
+        """Рядки даних без заголовків."""
+        with open(self.file_path, "r", encoding=self.encoding, newline="") as f:
+            reader = csv.reader(f, delimiter=self.delimiter)
+            next(reader, None)
+            try:
+                yield from reader
+            except UnicodeDecodeError:
+                raise InvalidCSVFile(
+                    f"Файл містить символи, які не відповідають кодуванню {self.encoding}. "
+                    "Будь ласка, переконайтесь, що файл збережено в UTF-8 або Windows-1251."
+                )
+
+    def count_rows(self) -> int:
+        """
+        Кількість рядків даних за кількістю переносів рядка, без декодування.
+        Для прогресу: переноси всередині значень у лапках теж рахуються.
+        """
+        lines = 0
+        last_byte = b"\n"
+        with open(self.file_path, "rb") as f:
+            while chunk := f.read(CSV_READ_CHUNK_BYTES):
+                lines += chunk.count(b"\n")
+                last_byte = chunk[-1:]
+        if last_byte != b"\n":
+            lines += 1
+        return max(lines - 1, 0)
+
+
+def _decode_sample(sample: bytes, encoding: str, is_complete: bool) -> str | None:
+    decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+    try:
+        # Обрізаний посередині багатобайтовий символ в кінці вибірки - не помилка
+        return decoder.decode(sample, final=is_complete)
+    except UnicodeDecodeError:
+        return None
+
+
+def detect_csv_format(
+    sample: bytes,
+    accept_headers: Callable[[list[str]], bool],
+    is_complete: bool = False,
+) -> tuple[str, str, list[str]] | None:
+    """
+    Кодування, роздільник і заголовки за початком файлу: перша комбінація
+    з CSV_ENCODINGS x CSV_DELIMITERS, заголовки якої приймає accept_headers.
+    """
+    for encoding in CSV_ENCODINGS:
+        text = _decode_sample(sample, encoding, is_complete)
+        if text is None:
+            continue
+        for delimiter in CSV_DELIMITERS:
+            headers = next(csv.reader(StringIO(text), delimiter=delimiter), None)
+            if headers and accept_headers(headers):
+                return encoding, delimiter, headers
+    return None
+
+
+def open_csv_upload(
+    file_path: str,
+    accept_headers: Callable[[list[str]], bool],
+    headers_error: str,
+) -> CSVUpload:
+    """
+    Визначає формат завантаженого CSV файлу за першими CSV_SAMPLE_BYTES байтами.
+
+    :param accept_headers: Чи підходять заголовки, прочитані з певним кодуванням і роздільником.
+    :param headers_error: Текст помилки, якщо заголовки не підійшли в жодній комбінації.
+    :raises InvalidCSVFile: Заголовки не підійшли в жодній комбінації.
+    """
+    with open(file_path, "rb") as f:
+        sample = f.read(CSV_SAMPLE_BYTES)
+        is_complete = not f.read(1)
+
+    detected = detect_csv_format(sample, accept_headers, is_complete)
+    if detected is None:
+        raise InvalidCSVFile(headers_error)
+    encoding, delimiter, headers = detected
+    return CSVUpload(file_path, encoding, delimiter, headers)
+
+
+def headers_start_with(expected: Sequence[str]) -> Callable[[list[str]], bool]:
+    def accept(headers: list[str]) -> bool:
+        return headers[: len(expected)] == list(expected)
+
+    return accept
@@ -0,0 +1,117 @@
+"""
+Порівняння читання CSV завантаження: колишній перебір кодувань і роздільників
+з повним розбором файлу на кожну спробу проти open_csv_upload з одним проходом.
+
+    python -m bot.services.csv_upload_benchmark --size-mb 5
+
+Файл генерується в cp1251 з роздільником ",", як його зберігає Excel з українською
+локаллю, тож колишній спосіб доходить до правильної комбінації не з першої спроби.
+"""
+
+import argparse
+import csv
+import logging
+import os
+import tempfile
+import time
+
+from bot.services.csv_upload import open_csv_upload
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HEADERS = [
+    "Telegram ID",
+    "Ім'я + Посада",
+    "Назва завдання",
+    "Опис завдання",
+    "Дата завдання",
+    "Час початку (HH:MM)",
+    "Час кінця (HH:MM)",
+    "Категорія",
+    "Фото",
+    "Відео",
+    "Документ",
+]
+# Кодування та роздільники, які перебирались до open_csv_upload
+LEGACY_ENCODINGS = ("utf-8-sig", "utf-8", "cp1251", "windows-1251", "cp1252", "latin1")
+LEGACY_DELIMITERS = (";", ",")
+
+
+def write_sample_csv(path: str, size_bytes: int) -> int:
+    """Пише CSV з HEADERS у cp1251 розміром не менше size_bytes; повертає кількість рядків."""
+    rows = 0
+    with open(path, "w", encoding="cp1251", newline="") as f:
+        writer = csv.writer(f, delimiter=",")
+        writer.writerow(HEADERS)
+        while f.tell() < size_bytes:
+            writer.writerow(
+                [
+                    100000000 + rows,
+                    "Петренко Олена, менеджер",
+                    f"Перевірити залишки на складі №{rows}",
+                    "Звірити фактичні залишки з обліковими та оформити акт",
+                    "2030-01-15",
+                    "09:00",
+                    "10:30",
+                    "Склад",
+                    "+",
+                    "",
+                    "+",
+                ]
+            )
+            rows += 1
+    return rows
+
+
+def read_legacy(path: str) -> int:
+    """Колишнє читання: кожна комбінація відкриває і розбирає весь файл."""
+    for encoding in LEGACY_ENCODINGS:
+        try:
+            for delimiter in LEGACY_DELIMITERS:
+                with open(path, "r", encoding=encoding, newline="") as f:
+                    rows = list(csv.reader(f, delimiter=delimiter))
+                if rows and len(rows[0]) >= len(HEADERS):
+                    return len(rows) - 1
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("No encoding and delimiter matched")
+
+
+def read_single_pass(path: str) -> int:
+    upload = open_csv_upload(
+        path,
+        accept_headers=lambda headers: len(headers) >= len(HEADERS),
+        headers_error="No encoding and delimiter matched",
+    )
+    return sum(1 for _ in upload.rows())
+
+
+def best_time(read, path: str, repeat: int) -> tuple[float, int]:
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = read(path)
+        timings.append(time.perf_counter() - started)
+    return min(timings), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV upload reading benchmark")
+    parser.add_argument("--size-mb", type=float, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.csv")
+        written = write_sample_csv(path, int(args.size_mb * 1024 * 1024))
+        logger.info(
+            "%.1f MB cp1251, %s rows", os.path.getsize(path) / 1024 / 1024, written
+        )
+        for name, read in (("legacy", read_legacy), ("single pass", read_single_pass)):
+            elapsed, rows = best_time(read, path, args.repeat)
+            logger.info("%-11s %.3f s, %s rows", name, elapsed, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ async def send_message(
     text: str,
     media_group: MediaGroupBuilder | None = None,
     reply_markup: ReplyMarkupUnion | None = None,
+    raise_errors: bool = False,
 ):
     """
     Sends a message to a specified chat.
@@ -25,6 +26,8 @@ async def send_message(
                         If not provided, only the text message will be sent.
     :param reply_markup: Optional reply markup for the message (e.g., inline keyboard).
                         If provided, it will be attached to the message.
+    :param raise_errors: Re-raise the error after logging it, so the caller can retry
+                        the delivery. By default errors are only logged.
     """
     try:
         if not media_group:
@@ -45,3 +48,5 @@ async def send_message(
                 )
     except Exception as e:
         logger.error(f"Failed to send message to chat {chat_id}: {e}")
+        if raise_errors:
+            raise
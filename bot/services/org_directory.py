@@ -0,0 +1,113 @@
+import asyncio
+from typing import Iterable, NamedTuple
+
+from bot.db.redis import get_org_directory_version
+from bot.db.repositories.repo import TASK_MANAGER_MAX_LEVEL
+from bot.utils.unitofwork import UnitOfWork
+
+
+class DirectoryEntry(NamedTuple):
+    id: int
+    name: str
+    position_title: str
+    level: int
+
+
+class OrgDirectory:
+    """
+    Довідник користувачів з посадою та рівнем ієрархії, згрупований за рівнями.
+    Один екземпляр відповідає одній версії довідника.
+
+    Перевірки прав за рівнем ієрархії (level_of, can_assign, is_manager)
+    виконуються за словником в пам'яті, без запитів до БД.
+    Користувачі без посади або рівня в довіднику відсутні і прав не мають.
+    """
+
+    __slots__ = ("version", "levels", "by_level", "by_id", "level_by_id")
+
+    def __init__(self, version: int, entries: list[DirectoryEntry]):
+        self.version = version
+        self.by_id = {entry.id: entry for entry in entries}
+        self.level_by_id = {entry.id: entry.level for entry in entries}
+        by_level: dict[int, list[DirectoryEntry]] = {}
+        for entry in entries:
+            by_level.setdefault(entry.level, []).append(entry)
+        self.by_level = {level: tuple(items) for level, items in by_level.items()}
+        self.levels = sorted(self.by_level)
+
+    def level_of(self, user_id: int) -> int | None:
+        return self.level_by_id.get(user_id)
+
+    def levels_of(self, user_ids: Iterable[int]) -> dict[int, int]:
+        """Рівні кількох користувачів: ID -> рівень, лише для наявних у довіднику."""
+        return {
+            user_id: self.level_by_id[user_id]
+            for user_id in user_ids
+            if user_id in self.level_by_id
+        }
+
+    def is_manager(self, user_id: int) -> bool:
+        """Рівні 1-TASK_MANAGER_MAX_LEVEL керують завданнями і графіками інших."""
+        level = self.level_by_id.get(user_id)
+        return level is not None and level <= TASK_MANAGER_MAX_LEVEL
+
+    def can_assign(self, creator_id: int, executor_id: int) -> bool:
+        """Чи може creator_id ставити завдання executor_id: рівень виконавця не вищий."""
+        creator_level = self.level_by_id.get(creator_id)
+        executor_level = self.level_by_id.get(executor_id)
+        return (
+            creator_level is not None
+            and executor_level is not None
+            and executor_level >= creator_level
+        )
+
+    def cannot_assign(self, creator_id: int, executor_ids: Iterable[int]) -> list[int]:
+        """Виконавці зі списку, яким creator_id не може ставити завдання, без повторів."""
+        return [
+            executor_id
+            for executor_id in dict.fromkeys(executor_ids)
+            if not self.can_assign(creator_id, executor_id)
+        ]
+
+    def executors_for(self, user_id: int) -> list[DirectoryEntry]:
+        """Користувачі з рівнем не вищим за рівень user_id, без нього самого."""
+        my_level = self.level_of(user_id)
+        if my_level is None:
+            return []
+        return [
+            entry
+            for level in self.levels
+            if level >= my_level
+            for entry in self.by_level[level]
+            if entry.id != user_id
+        ]
+
+
+_directory: OrgDirectory | None = None
+_directory_lock = asyncio.Lock()
+
+
+async def get_org_directory(uow: UnitOfWork | None = None) -> OrgDirectory:
+    """
+    Довідник з пам'яті процесу. З БД він перечитується лише тоді, коли версія
+    в Redis змінилась (коміт UnitOfWork або адмін-панель змінили користувачів,
+    посади чи рівні ієрархії).
+
+    :param uow: Відкритий UnitOfWork для перечитування. Без нього відкривається окремий,
+        щоб не підміняти сесію UnitOfWork, з яким вже працює код, що викликає.
+    """
+    global _directory
+    version = await get_org_directory_version()
+    if _directory is not None and _directory.version == version:
+        return _directory
+    async with _directory_lock:
+        if _directory is None or _directory.version != version:
+            if uow is None:
+                async with UnitOfWork() as own_uow:
+                    rows = await own_uow.users.get_org_directory_rows()
+            else:
+                rows = await uow.users.get_org_directory_rows()
+            _directory = OrgDirectory(
+                version, [DirectoryEntry(*row) for row in rows]
+            )
+    return _directory
@@ -0,0 +1,63 @@
+import datetime
+import logging
+
+from bot.db.redis import (
+    get_task_daily_stats_watermark,
+    set_task_daily_stats_watermark,
+)
+from bot.utils.unitofwork import UnitOfWork
+from configreader import KYIV
+
+logger = logging.getLogger(__name__)
+
+# Запас на транзакції, які почалися до попереднього запуску, а закомітились після нього:
+# updated_at = now() береться на початку транзакції
+WATERMARK_OVERLAP = datetime.timedelta(minutes=5)
+REFRESH_CHUNK_DAYS = 31
+RECONCILE_DAYS = 35
+
+
+async def refresh_task_daily_stats_days(days: list[datetime.date]) -> int:
+    """
+    Перераховує task_daily_stats для вказаних днів.
+    Дні обробляються пачками, кожна пачка - окрема транзакція.
+
+    Returns:
+        int: Кількість перерахованих днів.
+    """
+    days = sorted(set(days))
+    for index in range(0, len(days), REFRESH_CHUNK_DAYS):
+        chunk = days[index : index + REFRESH_CHUNK_DAYS]
+        uow = UnitOfWork()
+        async with uow:
+            await uow.task_daily_stats.refresh_days(chunk)
+            await uow.commit()
+    return len(days)
+
+
+async def refresh_changed_task_daily_stats() -> int:
+    """
+    Інкрементально оновлює task_daily_stats: перераховує лише дні завдань,
+    змінених після watermark. Перший запуск без watermark перераховує всю історію.
+    """
+    started_at = datetime.datetime.now(KYIV)
+    watermark = await get_task_daily_stats_watermark()
+    since = watermark - WATERMARK_OVERLAP if watermark else None
+    uow = UnitOfWork()
+    async with uow:
+        days = await uow.task_daily_stats.get_changed_days(since)
+    refreshed = await refresh_task_daily_stats_days(days)
+    await set_task_daily_stats_watermark(started_at)
+    logger.info("task_daily_stats: refreshed %s days since %s", refreshed, since)
+    return refreshed
+
+
+async def reconcile_task_daily_stats(days_back: int = RECONCILE_DAYS) -> int:
+    """
+    Повністю перераховує останні `days_back` днів.
+    Враховує видалені завдання, перенесені на інший день, та завдання,
+    що стали простроченими без зміни запису.
+    """
+    today = datetime.datetime.now(KYIV).date()
+    days = [today - datetime.timedelta(days=offset) for offset in range(days_back + 1)]
+    return await refresh_task_daily_stats_days(days)
@@ -0,0 +1,71 @@
+import datetime
+
+from bot.utils.unitofwork import UnitOfWork
+
+WORK_CALENDAR_HORIZON_DAYS = 180
+
+
+class WorkCalendar:
+    """
+    Робочий календар виконавця: дата -> (початок, кінець) зміни.
+    Перевірка робочого дня - пошук у множині, без звернень до БД.
+    """
+
+    __slots__ = ("shifts", "dates")
+
+    def __init__(self, shifts: dict[datetime.date, tuple[datetime.time, datetime.time]]):
+        self.shifts = shifts
+        self.dates = frozenset(shifts)
+
+    @classmethod
+    def from_cache(cls, calendar: dict[str, list[str]]) -> "WorkCalendar":
+        return cls(
+            {
+                datetime.date.fromisoformat(day): (
+                    datetime.time.fromisoformat(start_time),
+                    datetime.time.fromisoformat(end_time),
+                )
+                for day, (start_time, end_time) in calendar.items()
+            }
+        )
+
+    def __contains__(self, day: datetime.date) -> bool:
+        return day in self.dates
+
+    def shift(
+        self, day: datetime.date
+    ) -> tuple[datetime.time, datetime.time] | None:
+        return self.shifts.get(day)
+
+    def work_dates(
+        self,
+        date_from: datetime.date | None = None,
+        date_to: datetime.date | None = None,
+    ) -> frozenset[datetime.date]:
+        """Робочі дні в межах періоду."""
+        if date_from is None and date_to is None:
+            return self.dates
+        return frozenset(
+            day
+            for day in self.dates
+            if (date_from is None or day >= date_from)
+            and (date_to is None or day <= date_to)
+        )
+
+
+async def get_work_calendar(
+    uow: UnitOfWork,
+    user_id: int,
+    date_to: datetime.date | None = None,
+) -> WorkCalendar:
+    """
+    Календар виконавця від сьогодні до горизонту WORK_CALENDAR_HORIZON_DAYS
+    (або до date_to, якщо він далі). Завантажується з кешу Redis, з БД -
+    лише після зміни графіку виконавця.
+    """
+    today = datetime.datetime.now().date()
+    horizon = today + datetime.timedelta(days=WORK_CALENDAR_HORIZON_DAYS)
+    if date_to is not None and date_to > horizon:
+        horizon = date_to
+    calendar = await uow.work_schedules.get_work_calendar(user_id, today, horizon)
+    return WorkCalendar.from_cache(calendar)
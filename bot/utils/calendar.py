@@ -94,7 +94,8 @@ class CustomCalendarDaysView(CalendarDaysView):
         end_date += timedelta(days=days_till_week_end)
         # add days
         today = get_today(config.timezone)
-        work_dates = data.get("work_dates", [])
+        # Множина з WorkCalendar: перевірка кожної клітинки за O(1)
+        work_dates = data.get("work_dates", frozenset())
         for offset in range(0, (end_date - start_date).days, 7):  # noqa: PLR1704
             row = []
             for row_offset in range(7):
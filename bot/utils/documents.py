@@ -0,0 +1,202 @@
+import codecs
+import csv
+import datetime
+import hashlib
+from io import StringIO
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Union
+
+from aiogram import Bot
+from aiogram.enums import ContentType
+from aiogram.types import BufferedInputFile, InputFile
+from aiogram_dialog.api.entities import MediaAttachment, MediaId
+from aiogram_dialog.context.media_storage import MediaIdStorage
+from aiogram_dialog.manager.message_manager import MessageManager
+
+from bot.db.redis import redis
+
+CSV_CHUNK_ROWS = 500
+DOCUMENT_PATH_PREFIX = "sha256:"
+
+DOCUMENT_FILE_ID_KEY_PREFIX = "document:file_id"
+DOCUMENT_CONTENT_KEY_PREFIX = "document:content"
+DOCUMENT_METRICS_KEY = "document:metrics"
+# Telegram file_id не має терміну дії; TTL подовжується при кожному повторному використанні
+DOCUMENT_FILE_ID_TTL = datetime.timedelta(days=30)
+DOCUMENT_CONTENT_TTL = datetime.timedelta(days=1)
+
+
+def iter_csv_chunks(
+    headers: Sequence,
+    rows: Iterable[Sequence],
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """
+    CSV (Excel compatible: UTF-8 з BOM, роздільник ";") частинами по chunk_rows рядків,
+    тож великі вибірки не збираються в один рядок перед кодуванням.
+    """
+    yield codecs.BOM_UTF8
+    output = StringIO()
+    writer = csv.writer(output, delimiter=";")
+    writer.writerow(headers)
+    for index, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if index % chunk_rows == 0:
+            yield output.getvalue().encode("utf-8")
+            output.seek(0)
+            output.truncate()
+    yield output.getvalue().encode("utf-8")
+
+
+def build_csv(headers: Sequence, rows: Iterable[Sequence]) -> bytes:
+    """
+    Весь CSV в пам'яті: DocumentAttachment і store_document рахують sha256 вмісту
+    ще до відправлення, тож документ не передається в Telegram потоком.
+    Частини iter_csv_chunks лише не дають зібрати великий str перед кодуванням.
+    """
+    return b"".join(iter_csv_chunks(headers, rows))
+
+
+def document_path(sha256: str, size: int, filename: str) -> str:
+    return f"{DOCUMENT_PATH_PREFIX}{sha256}:{size}/{filename}"
+
+
+def parse_document_path(path) -> tuple[str, int] | None:
+    """(sha256, розмір) з content-addressed шляху або None для звичайного файлу."""
+    if not isinstance(path, str) or not path.startswith(DOCUMENT_PATH_PREFIX):
+        return None
+    sha256, size = path[len(DOCUMENT_PATH_PREFIX) :].split("/", 1)[0].split(":")
+    return sha256, int(size)
+
+
+class DocumentAttachment(MediaAttachment):
+    """
+    Документ, згенерований у пам'яті.
+
+    path - не файл на диску, а content-addressed ключ "sha256:<hash>:<size>/<filename>",
+    за яким MediaIdStorage запам'ятовує file_id: однаковий вміст після першого
+    відправлення надсилається за file_id без повторного завантаження.
+    """
+
+    def __init__(self, data: bytes, filename: str, **kwargs):
+        self.data = data
+        self.filename = filename
+        self.sha256 = hashlib.sha256(data).hexdigest()
+        super().__init__(
+            type=ContentType.DOCUMENT,
+            path=document_path(self.sha256, len(data), filename),
+            **kwargs,
+        )
+
+    def as_input_file(self) -> BufferedInputFile:
+        return BufferedInputFile(self.data, filename=self.filename)
+
+
+class DocumentMessageManager(MessageManager):
+    """MessageManager, який надсилає DocumentAttachment з пам'яті."""
+
+    async def get_media_source(
+        self, media: MediaAttachment, bot: Bot
+    ) -> Union[InputFile, str]:
+        if isinstance(media, DocumentAttachment) and not media.file_id:
+            await _count_document_metrics(uploads=1, upload_bytes=len(media.data))
+            return media.as_input_file()
+        document = parse_document_path(media.path)
+        if document is not None and media.file_id:
+            # Викликається лише при надсиланні: перемальовування без змін не рахується
+            sha256, size = document
+            await redis.expire(
+                f"{DOCUMENT_FILE_ID_KEY_PREFIX}:{sha256}", DOCUMENT_FILE_ID_TTL
+            )
+            await _count_document_metrics(reuses=1, upload_bytes_saved=size)
+        return await super().get_media_source(media, bot)
+
+
+class RedisMediaIdStorage(MediaIdStorage):
+    """
+    Реєстр хеш вмісту -> file_id у Redis для документів, згенерованих у пам'яті.
+    Спільний для всіх реплік і переживає перезапуск, тож однаковий документ
+    завантажується в Telegram один раз. Решта медіа - у стандартному LRU в пам'яті.
+    """
+
+    async def get_media_id(
+        self,
+        path: Optional[str],
+        url: Optional[str],
+        type: ContentType,
+    ) -> Optional[MediaId]:
+        document = parse_document_path(path)
+        if document is None:
+            return await super().get_media_id(path, url, type)
+        sha256, _ = document
+        # Повторне використання рахує DocumentMessageManager, коли file_id справді надсилається
+        return await get_document_file_id(sha256)
+
+    async def save_media_id(
+        self,
+        path: Optional[str],
+        url: Optional[str],
+        type: ContentType,
+        media_id: MediaId,
+    ) -> None:
+        document = parse_document_path(path)
+        if document is None:
+            return await super().save_media_id(path, url, type, media_id)
+        sha256, _ = document
+        await redis.set(
+            f"{DOCUMENT_FILE_ID_KEY_PREFIX}:{sha256}",
+            f"{media_id.file_id}|{media_id.file_unique_id or ''}",
+            ex=DOCUMENT_FILE_ID_TTL,
+        )
+
+
+async def get_document_file_id(sha256: str) -> MediaId | None:
+    cached = await redis.get(f"{DOCUMENT_FILE_ID_KEY_PREFIX}:{sha256}")
+    if not cached:
+        return None
+    file_id, file_unique_id = cached.decode().split("|", 1)
+    return MediaId(file_id, file_unique_id or None)
+
+
+async def store_document(data: bytes, filename: str) -> dict:
+    """
+    Зберігає згенерований документ для показу пізніше (наприклад, звіт про помилки,
+    посилання на який лежить у dialog_data). Вміст кладеться в Redis лише якщо
+    file_id для нього ще невідомий.
+
+    :return: Посилання на документ: sha256, size, filename.
+    """
+    sha256 = hashlib.sha256(data).hexdigest()
+    if await get_document_file_id(sha256) is None:
+        await redis.set(
+            f"{DOCUMENT_CONTENT_KEY_PREFIX}:{sha256}", data, ex=DOCUMENT_CONTENT_TTL
+        )
+    return {"sha256": sha256, "size": len(data), "filename": filename}
+
+
+async def load_document(document: dict) -> MediaAttachment | None:
+    """Вкладення за посиланням зі store_document: за file_id або з вмісту в Redis."""
+    if await get_document_file_id(document["sha256"]) is not None:
+        # file_id підставить RedisMediaIdStorage за content-addressed шляхом
+        return MediaAttachment(
+            type=ContentType.DOCUMENT,
+            path=document_path(
+                document["sha256"], document["size"], document["filename"]
+            ),
+        )
+    data = await redis.get(f"{DOCUMENT_CONTENT_KEY_PREFIX}:{document['sha256']}")
+    if data is None:
+        return None
+    return DocumentAttachment(data, filename=document["filename"])
+
+
+async def _count_document_metrics(**counters: int) -> None:
+    async with redis.pipeline(transaction=False) as pipe:
+        for name, value in counters.items():
+            pipe.hincrby(DOCUMENT_METRICS_KEY, name, value)
+        await pipe.execute()
+
+
+async def get_document_metrics() -> Dict[str, int]:
+    """uploads, upload_bytes, reuses, upload_bytes_saved - для експорту метрик."""
+    counters = await redis.hgetall(DOCUMENT_METRICS_KEY)
+    return {key.decode(): int(value) for key, value in counters.items()}
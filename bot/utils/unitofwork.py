@@ -3,6 +3,11 @@ from abc import ABC, abstractmethod
 from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
 
 from bot.db.base import async_session_maker
+from bot.db.redis import (
+    bump_org_directory_version,
+    bump_task_versions,
+    bump_work_calendar_versions,
+)
 from bot.db.repositories.repo import (
     TaskCategoryRepo,
     TaskControlPointsRepo,
@@ -14,6 +19,8 @@ from bot.db.repositories.repo import (
     PositionRepo,
     HierarchyLevelRepo,
     RegularTaskRepo,
+    AnalyticsRepo,
+    TaskDailyStatsRepo,
 )
 
 
@@ -53,6 +60,8 @@ class UnitOfWork(IUnitOfWork):
         self.task_report_contents = TaskReportContentRepo(self.session)
         self.positions = PositionRepo(self.session)
         self.hierarchy_level_repo = HierarchyLevelRepo(self.session)
+        self.analytics = AnalyticsRepo(self.session)
+        self.task_daily_stats = TaskDailyStatsRepo(self.session)
         return self
 
     async def __aexit__(self, exc_type, *args):
@@ -60,6 +69,19 @@ class UnitOfWork(IUnitOfWork):
 
     async def commit(self):
         await self.session.commit()
+        changed_task_ids = self.session.info.pop("changed_task_ids", None)
+        if changed_task_ids:
+            await bump_task_versions(changed_task_ids)
+        changed_schedule_user_ids = self.session.info.pop(
+            "changed_work_schedule_user_ids", None
+        )
+        if changed_schedule_user_ids:
+            await bump_work_calendar_versions(changed_schedule_user_ids)
+        if self.session.info.pop("org_directory_changed", False):
+            await bump_org_directory_version()
 
     async def rollback(self):
         await self.session.rollback()
+        self.session.info.pop("changed_task_ids", None)
+        self.session.info.pop("changed_work_schedule_user_ids", None)
+        self.session.info.pop("org_directory_changed", None)
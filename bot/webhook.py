@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from types import FrameType
+
+import uvicorn
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from fastapi import FastAPI, Header, Request, Response
+from fastapi.responses import JSONResponse
+
+from configreader import WebhookConfig
+
+logger = logging.getLogger(__name__)
+
+# Telegram дозволяє від 1 до 100 одночасних з'єднань на webhook
+TELEGRAM_MAX_CONNECTIONS = 100
+
+
+class UpdateProcessor:
+    """
+    Передає оновлення з webhook у диспетчер з обмеженою кількістю одночасних обробок.
+
+    Коли ліміт вичерпано, запит webhook чекає на вільний слот, тож Telegram
+    сам сповільнює доставку. Під час зупинки нові оновлення не приймаються,
+    а ті, що вже обробляються, отримують drain_timeout секунд на завершення.
+    """
+
+    def __init__(self, dp: Dispatcher, bot: Bot, max_concurrent_updates: int):
+        self.dp = dp
+        self.bot = bot
+        self.accepting = True
+        self._semaphore = asyncio.Semaphore(max_concurrent_updates)
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def submit(self, update: Update) -> None:
+        await self._semaphore.acquire()
+        task = asyncio.create_task(self._process(update))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, update: Update) -> None:
+        try:
+            await self.dp.feed_update(self.bot, update)
+        except Exception:
+            logger.exception("Failed to process update %s", update.update_id)
+        finally:
+            self._semaphore.release()
+
+    async def drain(self, timeout: float) -> None:
+        self.accepting = False
+        if not self._tasks:
+            return
+        logger.info("Draining %s in-flight updates", len(self._tasks))
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("Cancelled %s updates after drain timeout", len(pending))
+
+
+class WebhookServer(uvicorn.Server):
+    """
+    Сервер uvicorn, який перестає приймати оновлення одразу при SIGTERM/SIGINT.
+
+    Поки uvicorn чекає на завершення відкритих з'єднань (graceful shutdown),
+    webhook вже відповідає 503, а /healthz повідомляє, що репліка не готова,
+    тож Telegram і балансувальник переводять доставку на інші репліки.
+    """
+
+    def __init__(self, config: uvicorn.Config, processor: UpdateProcessor):
+        super().__init__(config)
+        self.processor = processor
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        self.processor.accepting = False
+        super().handle_exit(sig, frame)
+
+
+def create_webhook_app(
+    dp: Dispatcher,
+    bot: Bot,
+    webhook_config: WebhookConfig,
+    allowed_updates: list[str],
+) -> FastAPI:
+    """
+    FastAPI застосунок для прийому оновлень. Кілька реплік можуть працювати за одним
+    URL: стан FSM та блокування подій зберігаються в Redis.
+    """
+    processor = UpdateProcessor(dp, bot, webhook_config.max_concurrent_updates)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """Lifespan for FastAPI app"""
+        # set_webhook ідемпотентний, тож його можуть викликати всі репліки
+        await bot.set_webhook(
+            url=f"{webhook_config.base_url.rstrip('/')}{webhook_config.path}",
+            secret_token=webhook_config.secret_token or None,
+            allowed_updates=allowed_updates,
+            max_connections=min(
+                webhook_config.max_concurrent_updates, TELEGRAM_MAX_CONNECTIONS
+            ),
+        )
+        workflow_data = {"dispatcher": dp, "bots": [bot], **dp.workflow_data}
+        await dp.emit_startup(bot=bot, **workflow_data)
+        yield
+        await processor.drain(webhook_config.drain_timeout)
+        await dp.emit_shutdown(bot=bot, **workflow_data)
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.update_processor = processor
+
+    @app.post(webhook_config.path)
+    async def telegram_webhook(
+        request: Request,
+        x_telegram_bot_api_secret_token: str | None = Header(default=None),
+    ) -> Response:
+        if (
+            webhook_config.secret_token
+            and x_telegram_bot_api_secret_token != webhook_config.secret_token
+        ):
+            return Response(status_code=401)
+        if not processor.accepting:
+            # Telegram повторить доставку, можливо на іншу репліку
+            return Response(status_code=503)
+        update = Update.model_validate(await request.json(), context={"bot": bot})
+        await processor.submit(update)
+        return Response(status_code=200)
+
+    @app.get("/healthz")
+    async def healthz() -> Response:
+        # 503 під час зупинки: перевірка готовності прибирає репліку з балансування
+        return JSONResponse(
+            {"accepting": processor.accepting, "in_flight": processor.in_flight},
+            status_code=200 if processor.accepting else 503,
+        )
+
+    return app
@@ -0,0 +1,111 @@
+"""
+Генератор навантаження на webhook: надсилає синтетичні оновлення Telegram
+з заданою кількістю одночасних запитів і виводить коди відповідей та затримки.
+
+    python -m bot.webhook_load --url http://localhost:8080/webhook \
+        --secret-token "$WEBHOOK_CONFIG__SECRET_TOKEN" --user-id 123456789 \
+        --updates 2000 --concurrency 100
+
+Оновлення - текстові повідомлення від --user-id, тож бот відповідатиме в цей чат:
+запускати на тестовому боті. Під час зупинки репліки (SIGTERM) частка 503
+показує, скільки оновлень Telegram доставив би повторно.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import statistics
+import time
+from collections import Counter
+
+import aiohttp
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def synthetic_update(update_id: int, user_id: int, text: str) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Load"},
+            "text": text,
+        },
+    }
+
+
+async def run_load(
+    url: str,
+    secret_token: str,
+    user_id: int,
+    updates: int,
+    concurrency: int,
+    text: str,
+) -> tuple[Counter, list[float], float]:
+    """
+    :return: Кількість відповідей за кодом, затримки запитів (секунди) і загальний час.
+    """
+    statuses: Counter = Counter()
+    latencies: list[float] = []
+    update_ids = itertools.count(int(time.time()))
+    remaining = iter(range(updates))
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret_token} if secret_token else {}
+
+    async def worker(session: aiohttp.ClientSession) -> None:
+        for _ in remaining:
+            update = synthetic_update(next(update_ids), user_id, text)
+            started = time.perf_counter()
+            try:
+                async with session.post(url, json=update, headers=headers) as response:
+                    statuses[response.status] += 1
+            except aiohttp.ClientError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+    return statuses, latencies, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Webhook load generator")
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--secret-token", default="")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--text", default="load test")
+    args = parser.parse_args()
+    statuses, latencies, elapsed = asyncio.run(
+        run_load(
+            args.url,
+            args.secret_token,
+            args.user_id,
+            args.updates,
+            args.concurrency,
+            args.text,
+        )
+    )
+    logger.info("Statuses: %s", dict(statuses))
+    logger.info(
+        "%s updates in %.1f s (%.0f/s)", len(latencies), elapsed, len(latencies) / elapsed
+    )
+    if len(latencies) >= 2:
+        percentiles = statistics.quantiles(latencies, n=100)
+        logger.info(
+            "Latency ms: p50=%.0f p95=%.0f p99=%.0f max=%.0f",
+            percentiles[49] * 1000,
+            percentiles[94] * 1000,
+            percentiles[98] * 1000,
+            max(latencies) * 1000,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ from pathlib import Path
 from zoneinfo import ZoneInfo
 
 from arq.connections import RedisSettings
-from pydantic import PostgresDsn
+from pydantic import BaseModel, PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 BASE_PATH = Path(__file__).parent
@@ -36,6 +36,20 @@ class DBConfig(BaseSettings):
     redis_password: str
 
 
+class WebhookConfig(BaseModel):
+    """Webhook configuration. The bot uses long polling when disabled."""
+
+    enabled: bool = False
+    base_url: str = ""
+    path: str = "/webhook"
+    secret_token: str = ""
+    host: str = "0.0.0.0"
+    port: int = 8080
+    # Also limits concurrent update handling in long polling mode
+    max_concurrent_updates: int = 100
+    drain_timeout: float = 30.0
+
+
 class Config(BaseSettings):
     """Main configuration"""
 
@@ -51,6 +65,7 @@ class Config(BaseSettings):
     admin_panel_login: str
     admin_panel_password: str
     admin_panel_session_secret: str
+    webhook_config: WebhookConfig = WebhookConfig()
 
     model_config = SettingsConfigDict(
         env_file=".env",
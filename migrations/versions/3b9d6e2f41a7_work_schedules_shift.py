@@ -0,0 +1,41 @@
+"""work_schedules.shift with GiST (user_id, shift) index
+
+Revision ID: 3b9d6e2f41a7
+Revises:
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9d6e2f41a7"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # IF NOT EXISTS: на нових базах усе це вже створив create_all
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE work_schedules ADD COLUMN IF NOT EXISTS shift tstzrange "
+        "GENERATED ALWAYS AS (tstzrange("
+        "timezone('Europe/Kyiv', date + start_time), "
+        "timezone('Europe/Kyiv', date + end_time + CASE WHEN end_time < start_time "
+        "THEN interval '1 day' ELSE interval '0 days' END), "
+        "'[]')) STORED NOT NULL"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_work_schedules_user_id_shift "
+        "ON work_schedules USING gist (user_id, shift)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_work_schedules_user_id_shift")
+    op.execute("ALTER TABLE work_schedules DROP COLUMN IF EXISTS shift")
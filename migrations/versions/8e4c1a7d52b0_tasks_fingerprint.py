@@ -0,0 +1,70 @@
+"""tasks.fingerprint with unique partial index uq_tasks_fingerprint, import_batch_id
+
+Revision ID: 8e4c1a7d52b0
+Revises: 3b9d6e2f41a7
+Create Date: 2026-10-19 10:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4c1a7d52b0"
+down_revision: Union[str, Sequence[str], None] = "3b9d6e2f41a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Пакет імпорту CSV для tasks і regular_tasks (скасування імпорту одним запитом)
+    for table in ("tasks", "regular_tasks"):
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS import_batch_id varchar(32)"
+        )
+    # Той самий вираз, що й Task.fingerprint у models.py та task_fingerprint() у repo.py
+    op.execute(
+        "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS fingerprint varchar(32) "
+        "GENERATED ALWAYS AS (md5("
+        "executor_id::text || E'\\x1f' || "
+        "floor(extract(epoch FROM timezone('UTC', start_datetime)))::bigint::text || E'\\x1f' || "
+        "floor(extract(epoch FROM timezone('UTC', end_datetime)))::bigint::text || E'\\x1f' || "
+        "title || E'\\x1f' || "
+        "coalesce(description, '') || E'\\x1f' || "
+        "coalesce(category_id::text, ''))) STORED NOT NULL"
+    )
+    # З кожної групи активних дублікатів лишається найстаріше завдання, решта скасовуються.
+    # updated_at оновлюється, щоб refresh_task_daily_stats перерахував їхні дні
+    op.execute(
+        "UPDATE tasks SET status = 'CANCELED', updated_at = now() "
+        "WHERE id IN ("
+        "SELECT id FROM ("
+        "SELECT id, row_number() OVER (PARTITION BY fingerprint ORDER BY id) AS duplicate_number "
+        "FROM tasks WHERE status <> 'CANCELED'"
+        ") AS duplicates WHERE duplicate_number > 1"
+        ")"
+    )
+    # CONCURRENTLY не працює в транзакції і не блокує запис у tasks під час побудови
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_tasks_fingerprint "
+            "ON tasks (fingerprint) WHERE status <> 'CANCELED'"
+        )
+        for table in ("tasks", "regular_tasks"):
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_import_batch_id "
+                f"ON {table} (import_batch_id)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_tasks_fingerprint")
+        for table in ("tasks", "regular_tasks"):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_import_batch_id")
+    op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS fingerprint")
+    for table in ("tasks", "regular_tasks"):
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS import_batch_id")
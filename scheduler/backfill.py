@@ -0,0 +1,52 @@
+"""
+Перерахунок task_daily_stats за період.
+
+    python -m scheduler.backfill --date-from 2025-01-01 --date-to 2025-06-30
+    python -m scheduler.backfill  # вся історія завдань
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+
+from bot.services.task_daily_stats_service import refresh_task_daily_stats_days
+from bot.utils.unitofwork import UnitOfWork
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def backfill_task_daily_stats(
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+) -> int:
+    if date_from and date_to:
+        days = [
+            date_from + datetime.timedelta(days=offset)
+            for offset in range((date_to - date_from).days + 1)
+        ]
+    else:
+        uow = UnitOfWork()
+        async with uow:
+            days = await uow.task_daily_stats.get_changed_days()
+        days = [
+            day
+            for day in days
+            if (date_from is None or day >= date_from)
+            and (date_to is None or day <= date_to)
+        ]
+    return await refresh_task_daily_stats_days(days)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill task_daily_stats rollup")
+    parser.add_argument("--date-from", type=datetime.date.fromisoformat)
+    parser.add_argument("--date-to", type=datetime.date.fromisoformat)
+    args = parser.parse_args()
+    refreshed = asyncio.run(backfill_task_daily_stats(args.date_from, args.date_to))
+    logger.info("task_daily_stats: backfilled %s days", refreshed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import datetime
+import math
+import time
+from typing import Iterable, NamedTuple
+
+from arq import ArqRedis
+
+from bot.db.repositories.repo import as_kyiv
+from scheduler.jobs import NOTIFICATION_SUBJECTS
+
+# Дедлайни всіх завдань: елемент "<task_id>:<тема>", оцінка - час сповіщення (unix, секунди)
+TASK_DEADLINES_KEY = "task_deadlines"
+# Забрані воркером дедлайни до підтвердження надсилання: елемент "<task_id>:<тема>@<час>",
+# оцінка - кінець оренди. Дедлайни воркера, що впав, після оренди повертаються в набір
+TASK_DEADLINES_PROCESSING_KEY = "task_deadlines:processing"
+DEADLINE_SUBJECTS: tuple[NOTIFICATION_SUBJECTS, ...] = (
+    "task_started",
+    "task_ending_soon",
+    "task_overdue",
+)
+TASK_ENDING_SOON_BEFORE = datetime.timedelta(minutes=30)
+# Як часто воркер перевіряє дедлайни, і скільки їх забирає за раз
+DEADLINE_TICK_SECONDS = 10
+DEADLINE_BATCH_SIZE = 200
+DEADLINE_LEASE_SECONDS = 120
+# Одночасні надсилання - як max_jobs воркера arq за замовчуванням, щоб не впертись в ліміти Telegram
+DEADLINE_SEND_CONCURRENCY = 10
+# Невдале надсилання повторюється, доки сповіщення запізнюється не більше ніж на стільки
+DEADLINE_RETRY_WINDOW = datetime.timedelta(minutes=15)
+
+# Атомарно: повертає в набір дедлайни з простроченою орендою, потім переносить дедлайни,
+# час яких настав, з набору в processing - кілька воркерів не заберуть один дедлайн двічі.
+# ZADD NX: якщо завдання вже переплановано, новий час дедлайну не перезаписується
+CLAIM_DUE_DEADLINES_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for i = 1, #expired do
+    local member, due = string.match(expired[i], '^(.*)@(%d+)$')
+    redis.call('ZADD', KEYS[1], 'NX', due, member)
+    redis.call('ZREM', KEYS[2], expired[i])
+end
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, ARGV[2])
+local lease_until = tonumber(ARGV[1]) + tonumber(ARGV[3])
+for i = 1, #due, 2 do
+    redis.call('ZREM', KEYS[1], due[i])
+    redis.call('ZADD', KEYS[2], lease_until, due[i] .. '@' .. math.floor(tonumber(due[i + 1])))
+end
+return due
+"""
+
+
+class Deadline(NamedTuple):
+    task_id: int
+    notification_subject: NOTIFICATION_SUBJECTS
+    due: int
+
+
+def deadline_member(task_id: int, notification_subject: NOTIFICATION_SUBJECTS) -> str:
+    return f"{task_id}:{notification_subject}"
+
+
+def processing_member(deadline: Deadline) -> str:
+    member = deadline_member(deadline.task_id, deadline.notification_subject)
+    return f"{member}@{deadline.due}"
+
+
+def task_deadlines(
+    task_id: int,
+    start_datetime: datetime.datetime,
+    end_datetime: datetime.datetime,
+) -> list[Deadline]:
+    """Ті самі сповіщення, що раніше ставились окремими відкладеними завданнями arq."""
+    start = as_kyiv(start_datetime)
+    end = as_kyiv(end_datetime)
+    return [
+        Deadline(task_id, "task_started", math.floor(start.timestamp())),
+        Deadline(
+            task_id,
+            "task_ending_soon",
+            math.floor((end - TASK_ENDING_SOON_BEFORE).timestamp()),
+        ),
+        Deadline(task_id, "task_overdue", math.floor(end.timestamp())),
+    ]
+
+
+async def schedule_task_deadlines(
+    arq: ArqRedis,
+    tasks: Iterable[tuple[int, datetime.datetime, datetime.datetime]],
+) -> int:
+    """
+    Додає дедлайни завдань або переносить їх, якщо вони вже є (ZADD оновлює оцінку),
+    одним конвеєром команд. Дедлайни, час яких уже минув, прибираються:
+    як і раніше, запізнілі сповіщення не надсилаються.
+
+    :param tasks: (task_id, start_datetime, end_datetime) для кожного завдання.
+    :return: Кількість запланованих дедлайнів.
+    """
+    now = time.time()
+    upcoming: dict[str, int] = {}
+    past: list[str] = []
+    for task_id, start_datetime, end_datetime in tasks:
+        for deadline in task_deadlines(task_id, start_datetime, end_datetime):
+            member = deadline_member(task_id, deadline.notification_subject)
+            if deadline.due < now:
+                past.append(member)
+            else:
+                upcoming[member] = deadline.due
+    async with arq.pipeline(transaction=False) as pipe:
+        if upcoming:
+            pipe.zadd(TASK_DEADLINES_KEY, upcoming)
+        if past:
+            pipe.zrem(TASK_DEADLINES_KEY, *past)
+        await pipe.execute()
+    return len(upcoming)
+
+
+async def cancel_task_deadlines(arq: ArqRedis, task_ids: Iterable[int]) -> None:
+    """Прибирає всі дедлайни завдань (видалених або скасованих) одним ZREM."""
+    members = [
+        deadline_member(task_id, notification_subject)
+        for task_id in task_ids
+        for notification_subject in DEADLINE_SUBJECTS
+    ]
+    if members:
+        await arq.zrem(TASK_DEADLINES_KEY, *members)
+
+
+async def claim_due_deadlines(
+    arq: ArqRedis, limit: int = DEADLINE_BATCH_SIZE
+) -> list[Deadline]:
+    """
+    Забирає з набору до limit дедлайнів, час яких настав, найстаріші першими.
+    Вони залишаються в processing на DEADLINE_LEASE_SECONDS: після надсилання їх
+    треба підтвердити (ack_deadlines) або повернути (release_deadlines), інакше
+    після оренди їх забере наступний запуск.
+    """
+    claim = arq.register_script(CLAIM_DUE_DEADLINES_SCRIPT)
+    due = await claim(
+        keys=[TASK_DEADLINES_KEY, TASK_DEADLINES_PROCESSING_KEY],
+        args=[math.floor(time.time()), limit, DEADLINE_LEASE_SECONDS],
+    )
+    deadlines = []
+    for member, score in zip(due[::2], due[1::2]):
+        task_id, notification_subject = member.decode().split(":", 1)
+        deadlines.append(
+            Deadline(int(task_id), notification_subject, int(float(score)))
+        )
+    return deadlines
+
+
+async def ack_deadlines(arq: ArqRedis, deadlines: Iterable[Deadline]) -> None:
+    """Прибирає оброблені дедлайни з processing."""
+    members = [processing_member(deadline) for deadline in deadlines]
+    if members:
+        await arq.zrem(TASK_DEADLINES_PROCESSING_KEY, *members)
+
+
+async def release_deadlines(arq: ArqRedis, deadlines: Iterable[Deadline]) -> None:
+    """
+    Повертає дедлайни в набір з їх часом, щоб наступний запуск надіслав їх знову.
+    Дедлайн, який вже переплановано, не перезаписується.
+    """
+    deadlines = list(deadlines)
+    if not deadlines:
+        return
+    async with arq.pipeline(transaction=True) as pipe:
+        pipe.zadd(
+            TASK_DEADLINES_KEY,
+            {
+                deadline_member(
+                    deadline.task_id, deadline.notification_subject
+                ): deadline.due
+                for deadline in deadlines
+            },
+            nx=True,
+        )
+        pipe.zrem(
+            TASK_DEADLINES_PROCESSING_KEY,
+            *(processing_member(deadline) for deadline in deadlines),
+        )
+        await pipe.execute()
@@ -1,13 +1,30 @@
+import asyncio
 import datetime
 import logging
 
 from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
 
 from bot.entities.shared import TaskReadExtended
-from bot.services.ai_agent.tools import TaskTools
+from bot.services.csv_import_service import run_csv_import
+from bot.services.task_daily_stats_service import (
+    reconcile_task_daily_stats,
+    refresh_changed_task_daily_stats,
+)
 from bot.utils.enum import TaskStatus
 from bot.utils.unitofwork import UnitOfWork
 from configreader import KYIV
+from scheduler.deadlines import (
+    DEADLINE_BATCH_SIZE,
+    DEADLINE_RETRY_WINDOW,
+    DEADLINE_SEND_CONCURRENCY,
+    Deadline,
+    ack_deadlines,
+    claim_due_deadlines,
+    release_deadlines,
+    schedule_task_deadlines,
+    task_deadlines,
+)
 from scheduler.jobs import NOTIFICATION_FOR, NOTIFICATION_SUBJECTS
 from scheduler.services import (
     send_task_ending_soon_notification,
@@ -107,15 +124,20 @@ async def create_task_from_regular(ctx):
             month=month, year=year
         )
         now = datetime.datetime.now(KYIV)
-        for task in all_regulars_tasks:
+        # Доступність виконавців перевіряється одним запитом для всіх завдань
+        availability = await uow.work_schedules.check_availability_many(
+            [
+                (
+                    task.executor_id,
+                    datetime.datetime.combine(now.date(), task.start_time),
+                    datetime.datetime.combine(now.date(), task.end_time),
+                )
+                for task in all_regulars_tasks
+            ]
+        )
+        for task, is_user_work in zip(all_regulars_tasks, availability):
             task_start_date = datetime.datetime.combine(now.date(), task.start_time)
             task_end_date = datetime.datetime.combine(now.date(), task.end_time)
-            is_user_work = await uow.work_schedules.is_user_work_in_this_time(
-                user_id=task.executor_id,
-                date=task_start_date.date(),
-                time_from=task_start_date.time(),
-                time_to=task_end_date.time(),
-            )
             if not is_user_work:
                 continue
             task_start_date = datetime.datetime.combine(
@@ -136,26 +158,169 @@ async def create_task_from_regular(ctx):
                 video_required=task.video_required,
                 file_required=task.file_required,
             )
-            task_id = await uow.tasks.add_one(task_create)
-
-            # Add task to database
-            task_tools = TaskTools(
-                uow=uow,
-                arq=ctx["redis"],
-                user_id=task.executor_id,
-            )
+            # Повторний запуск (run_at_startup) не створює завдання вдруге
+            task_id = await uow.tasks.add_one_if_new(task_create)
+            if task_id is None:
+                continue
 
             await uow.session.flush()
             await uow.session.commit()
-            await task_tools.create_notification_task_started(
-                task_id,
-                _defer_until=task_start_date,
+            await schedule_task_deadlines(
+                ctx["redis"], [(task_id, task_start_date, task_end_date)]
+            )
+
+
+async def dispatch_task_deadlines(ctx):
+    """
+    Надсилає сповіщення за дедлайнами завдань, час яких настав,
+    пакетами по DEADLINE_BATCH_SIZE, доки не розбере всі.
+    """
+    while deadlines := await claim_due_deadlines(ctx["redis"]):
+        await send_deadline_notifications(ctx, deadlines)
+        if len(deadlines) < DEADLINE_BATCH_SIZE:
+            break
+
+
+async def send_deadline_notifications(ctx: dict, deadlines: list[Deadline]):
+    """
+    Завдання пакета читаються одним запитом, сповіщення надсилаються паралельно.
+    Видалені, завершені та скасовані завдання пропускаються; дедлайн перенесеного
+    завдання, яке ще не оновили в наборі, планується заново за поточним часом завдання.
+
+    Доставка - принаймні один раз: дедлайн підтверджується після надсилання, а при
+    тимчасовій помилці Telegram повертається в набір і надсилається знову наступним
+    запуском, поки не мине DEADLINE_RETRY_WINDOW. Сповіщення про прострочення йде
+    двом отримувачам, тож при повторі один з них може отримати його двічі.
+    """
+    bot: Bot = ctx["bot"]
+    core = ctx["core"]
+    async with UnitOfWork() as uow:
+        tasks = await uow.tasks.get_tasks_by_ids(
+            list({deadline.task_id for deadline in deadlines})
+        )
+
+    to_send: list[tuple[Deadline, TaskReadExtended]] = []
+    handled: list[Deadline] = []
+    moved: dict[int, TaskReadExtended] = {}
+    for deadline in deadlines:
+        task = tasks.get(deadline.task_id)
+        if task is None or task.status in [TaskStatus.COMPLETED, TaskStatus.CANCELED]:
+            handled.append(deadline)
+            continue
+        current = {
+            current.notification_subject: current.due
+            for current in task_deadlines(
+                task.id, task.start_datetime, task.end_datetime
+            )
+        }
+        if current[deadline.notification_subject] != deadline.due:
+            moved[task.id] = task
+            handled.append(deadline)
+            continue
+        to_send.append((deadline, task))
+    if moved:
+        await schedule_task_deadlines(
+            ctx["redis"],
+            [
+                (task.id, task.start_datetime, task.end_datetime)
+                for task in moved.values()
+            ],
+        )
+
+    semaphore = asyncio.Semaphore(DEADLINE_SEND_CONCURRENCY)
+
+    # Час уже перевірено за дедлайном, тож перевірка поточної хвилини не потрібна
+    async def deliver(deadline: Deadline, task: TaskReadExtended) -> None:
+        async with semaphore:
+            if deadline.notification_subject == "task_started":
+                await send_task_started_notification(
+                    task_model_extended=task,
+                    core=core,
+                    bot=bot,
+                    check_time=False,
+                    raise_errors=True,
+                )
+            elif deadline.notification_subject == "task_ending_soon":
+                await send_task_ending_soon_notification(
+                    task_model_extended=task,
+                    core=core,
+                    bot=bot,
+                    check_time=False,
+                    raise_errors=True,
+                )
+            else:
+                for notification_for in ("executor", "creator"):
+                    await send_task_overdue_notification(
+                        task_model_extended=task,
+                        notification_for=notification_for,
+                        locale="uk",
+                        core=core,
+                        bot=bot,
+                        check_time=False,
+                        raise_errors=True,
+                    )
+
+    results = await asyncio.gather(
+        *(deliver(deadline, task) for deadline, task in to_send),
+        return_exceptions=True,
+    )
+    retry: list[Deadline] = []
+    retry_after = datetime.datetime.now(KYIV) - DEADLINE_RETRY_WINDOW
+    for (deadline, task), result in zip(to_send, results):
+        if not isinstance(result, Exception):
+            handled.append(deadline)
+        elif isinstance(result, (TelegramBadRequest, TelegramForbiddenError)):
+            # Бот заблокований або чат не знайдено - повтор не допоможе
+            logger.error(
+                f"Dropped {deadline.notification_subject} notification"
+                f" for task {task.id}: {result}"
             )
-            await task_tools.create_notification_task_is_overdue(
-                task_id,
-                _defer_until=task_end_date,
+            handled.append(deadline)
+        elif deadline.due < retry_after.timestamp():
+            logger.error(
+                f"Gave up {deadline.notification_subject} notification"
+                f" for task {task.id} after {DEADLINE_RETRY_WINDOW}: {result}"
             )
-            await task_tools.create_notification_task_ending_soon(
-                task_id,
-                _defer_until=task_end_date - datetime.timedelta(minutes=30),
+            handled.append(deadline)
+        else:
+            logger.warning(
+                f"Retrying {deadline.notification_subject} notification"
+                f" for task {task.id}: {result}"
             )
+            retry.append(deadline)
+    await release_deadlines(ctx["redis"], retry)
+    await ack_deadlines(ctx["redis"], handled)
+
+
+async def refresh_task_daily_stats(ctx):
+    """Incrementally refreshes the task_daily_stats rollup from tasks changed since the last run."""
+    await refresh_changed_task_daily_stats()
+
+
+async def reconcile_task_daily_stats_job(ctx):
+    """Recomputes recent days of the rollup to pick up deleted/moved tasks and new overdue ones."""
+    await reconcile_task_daily_stats()
+
+
+async def import_tasks_csv(
+    ctx: dict,
+    import_id: str,
+    user_id: int,
+    chat_id: int,
+    message_id: int,
+    file_id: str,
+    is_regular: bool,
+    manifest_id: str,
+):
+    """Imports tasks from an uploaded CSV file, reporting progress to the user."""
+    await run_csv_import(
+        ctx["bot"],
+        ctx["redis"],
+        import_id=import_id,
+        user_id=user_id,
+        chat_id=chat_id,
+        message_id=message_id,
+        file_id=file_id,
+        is_regular=is_regular,
+        manifest_id=manifest_id,
+    )
@@ -1,11 +1,15 @@
 import datetime
 import logging
-from typing import Literal, TypeAlias
+from typing import Literal, NamedTuple, Sequence, TypeAlias
+from uuid import uuid4
 
 from arq import ArqRedis
-from arq.jobs import Job
+from arq.constants import abort_jobs_ss, job_key_prefix
+from arq.jobs import Job, serialize_job
+from arq.utils import timestamp_ms, to_unix_ms
 
 from bot.db.redis import redis
+from bot.db.repositories.repo import as_kyiv
 from bot.services.log_service import LogService
 from configreader import KYIV
 
@@ -17,6 +21,25 @@ NOTIFICATION_SUBJECTS: TypeAlias = Literal[
 
 NOTIFICATION_FOR: TypeAlias = Literal["creator", "executor"]
 
+# Набори ID сповіщень (завдання, пакета імпорту) живуть довше за найвіддаленіше відкладене сповіщення
+NOTIFICATION_JOBS_TTL = datetime.timedelta(days=400)
+
+
+def import_batch_jobs_key(import_batch_id: str) -> str:
+    return f"import_batch:{import_batch_id}:jobs"
+
+
+def task_jobs_key(task_id: int) -> str:
+    return f"task:{task_id}:notification_jobs"
+
+
+class NotificationJob(NamedTuple):
+    task_id: int
+    notification_for: NOTIFICATION_FOR
+    notification_subject: NOTIFICATION_SUBJECTS
+    # None - надіслати відразу
+    defer_until: datetime.datetime | None = None
+
 
 async def create_notification_job(
     arq: ArqRedis,
@@ -26,6 +49,7 @@ async def create_notification_job(
     _defer_until: datetime.datetime | None = None,
     _defer_by: datetime.timedelta | None = None,
     update_notification: bool = False,
+    import_batch_id: str | None = None,
 ) -> str | None:
     """
     Створює завдання для надсилання сповіщення користувачу по задач
@@ -46,11 +70,13 @@ async def create_notification_job(
             Якщо вказано, то завдання буде виконано через цей проміжок часу.
         update_notification (bool): Якщо True, то оновлює існуюче сповіщення, якщо воно вже є.
             Якщо False, то створює нове сповіщення. Якщо сповіщення вже існує - нове сповіщення не буде створено.
+        import_batch_id (str | None): Пакет імпорту CSV; ID сповіщення запам'ятовується,
+            щоб abort_import_batch_jobs скасував його разом з усім пакетом.
     """
     log_service = LogService()
-    datetime_now = datetime.datetime.now().replace(tzinfo=KYIV)
+    datetime_now = datetime.datetime.now(KYIV)
     if _defer_until:
-        _defer_until = _defer_until.replace(tzinfo=KYIV)
+        _defer_until = as_kyiv(_defer_until)
     if _defer_until and datetime_now > _defer_until:
         await log_service.warning(
             "Завдання не може бути створено, оскільки час відкладання вже минув.",
@@ -87,7 +113,7 @@ async def create_notification_job(
     #             extra_info={"JOB_ID": job_id},
     #         )
     try:
-        await arq.enqueue_job(
+        job = await arq.enqueue_job(
             "send_notification",
             # _job_id=job_id,
             _defer_until=_defer_until if _defer_until else None,
@@ -96,6 +122,15 @@ async def create_notification_job(
             notification_for=notification_for,
             notification_subject=notification_subject,
         )
+        if job is not None:
+            keys = [task_jobs_key(task_id)]
+            if import_batch_id is not None:
+                keys.append(import_batch_jobs_key(import_batch_id))
+            async with arq.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.sadd(key, job.job_id)
+                    pipe.expire(key, NOTIFICATION_JOBS_TTL)
+                await pipe.execute()
     except Exception as e:
         logger.error(
             f"Failed to create notification job {job_id} for task {task_id}: {e}"
@@ -113,6 +148,69 @@ async def create_notification_job(
         raise e
 
 
+async def enqueue_notification_jobs(
+    arq: ArqRedis,
+    notifications: Sequence[NotificationJob],
+    import_batch_id: str | None = None,
+) -> list[str]:
+    """
+    Ставить у чергу кілька сповіщень одним конвеєром команд Redis замість окремого
+    enqueue_job (WATCH + транзакція) на кожне. Записує завдання arq так само, як enqueue_job;
+    ID випадкові, тож перевірка на вже існуюче завдання не потрібна.
+    Сповіщення, час яких уже минув, пропускаються, як і в create_notification_job.
+
+    Returns:
+        list[str]: ID поставлених у чергу завдань arq.
+    """
+    datetime_now = datetime.datetime.now(KYIV)
+    enqueue_time_ms = timestamp_ms()
+    job_ids = []
+    skipped = 0
+    async with arq.pipeline(transaction=False) as pipe:
+        for notification in notifications:
+            if notification.defer_until is None:
+                score = enqueue_time_ms
+            else:
+                defer_until = as_kyiv(notification.defer_until)
+                if datetime_now > defer_until:
+                    skipped += 1
+                    continue
+                score = to_unix_ms(defer_until)
+            job_id = uuid4().hex
+            job = serialize_job(
+                "send_notification",
+                (),
+                dict(
+                    task_id=notification.task_id,
+                    notification_for=notification.notification_for,
+                    notification_subject=notification.notification_subject,
+                ),
+                None,
+                enqueue_time_ms,
+                serializer=arq.job_serializer,
+            )
+            pipe.psetex(
+                job_key_prefix + job_id,
+                score - enqueue_time_ms + arq.expires_extra_ms,
+                job,
+            )
+            pipe.zadd(arq.default_queue_name, {job_id: score})
+            key = task_jobs_key(notification.task_id)
+            pipe.sadd(key, job_id)
+            pipe.expire(key, NOTIFICATION_JOBS_TTL)
+            job_ids.append(job_id)
+        if job_ids and import_batch_id is not None:
+            key = import_batch_jobs_key(import_batch_id)
+            pipe.sadd(key, *job_ids)
+            pipe.expire(key, NOTIFICATION_JOBS_TTL)
+        await pipe.execute()
+    if skipped:
+        logger.warning(
+            f"Skipped {skipped} notification jobs: their time has already passed"
+        )
+    return job_ids
+
+
 async def abort_jobs(task_id: int):
     """
     Скасовує всі завдання, пов'язані з певним завданням.
@@ -135,3 +233,52 @@ async def abort_jobs(task_id: int):
             await job.abort()
 
 
+async def _abort_job_ids(arq: ArqRedis, job_ids, *keys: str) -> None:
+    """
+    Те саме, що Job.abort() для кожного завдання, одним конвеєром і без очікування результатів:
+    відкладені завдання переносяться на початок черги, і воркер відразу завершує їх як скасовані.
+    keys - набори ID, які видаляються разом зі скасуванням.
+    """
+    aborted_at = timestamp_ms()
+    async with arq.pipeline(transaction=True) as pipe:
+        if job_ids:
+            pipe.zadd(arq.default_queue_name, {job_id: 1 for job_id in job_ids}, xx=True)
+            pipe.zadd(abort_jobs_ss, {job_id: aborted_at for job_id in job_ids})
+        if keys:
+            pipe.delete(*keys)
+        await pipe.execute()
+
+
+async def abort_import_batch_jobs(arq: ArqRedis, import_batch_id: str) -> int:
+    """
+    Скасовує всі сповіщення пакета імпорту.
+
+    Returns:
+        int: Кількість скасованих сповіщень.
+    """
+    key = import_batch_jobs_key(import_batch_id)
+    job_ids = await arq.smembers(key)
+    if not job_ids:
+        return 0
+    await _abort_job_ids(arq, job_ids, key)
+    return len(job_ids)
+
+
+async def abort_task_notification_jobs(arq: ArqRedis, task_ids: Sequence[int]) -> int:
+    """
+    Скасовує всі заплановані сповіщення завдань (наприклад, перед переплануванням
+    або після видалення) за два звернення до Redis незалежно від кількості завдань.
+
+    Returns:
+        int: Кількість скасованих сповіщень.
+    """
+    if not task_ids:
+        return 0
+    keys = [task_jobs_key(task_id) for task_id in task_ids]
+    async with arq.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.smembers(key)
+        members = await pipe.execute()
+    job_ids = set().union(*members)
+    await _abort_job_ids(arq, job_ids, *keys)
+    return len(job_ids)
@@ -2,12 +2,22 @@ import logging
 
 from aiogram import Bot
 from aiogram.client.default import DefaultBotProperties
-from aiogram_i18n.cores import FluentRuntimeCore
 from arq import cron
+from arq.worker import func
 
+from bot.i18n.utils.catalog import FluentCatalogCore
+from bot.services.csv_import_service import CSV_IMPORT_JOB_TIMEOUT
 from bot.utils.unitofwork import UnitOfWork
 from configreader import config, RedisConfig
-from scheduler.func import send_notification, create_task_from_regular
+from scheduler.deadlines import DEADLINE_TICK_SECONDS
+from scheduler.func import (
+    send_notification,
+    dispatch_task_deadlines,
+    create_task_from_regular,
+    refresh_task_daily_stats,
+    reconcile_task_daily_stats_job,
+    import_tasks_csv,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -26,7 +36,7 @@ async def startup(ctx):
         token=config.bot_config.token,
         default=DefaultBotProperties(parse_mode=config.bot_config.parse_mode),
     )
-    core = FluentRuntimeCore(path=config.path_to_locales)
+    core = FluentCatalogCore(path=config.path_to_locales)
     ctx["core"] = core
     await core.startup()
 
@@ -40,13 +50,37 @@ class WorkerSettings:
     redis_settings = RedisConfig.pool_settings
     on_startup = startup
     on_shutdown = shutdown
-    functions = [send_notification, create_task_from_regular]
+    functions = [
+        send_notification,
+        dispatch_task_deadlines,
+        create_task_from_regular,
+        refresh_task_daily_stats,
+        reconcile_task_daily_stats_job,
+        func(import_tasks_csv, timeout=CSV_IMPORT_JOB_TIMEOUT),
+    ]
     cron_jobs = [
+        cron(
+            "scheduler.func.dispatch_task_deadlines",
+            second=set(range(0, 60, DEADLINE_TICK_SECONDS)),
+            run_at_startup=True,
+            unique=True,
+        ),
         cron(
             "scheduler.func.create_task_from_regular",
             hour=0,
             minute=0,
             run_at_startup=True,
-        )
+        ),
+        cron(
+            "scheduler.func.refresh_task_daily_stats",
+            minute=set(range(0, 60, 5)),
+            run_at_startup=True,
+            unique=True,
+        ),
+        cron(
+            "scheduler.func.reconcile_task_daily_stats_job",
+            hour=3,
+            minute=30,
+        ),
     ]
     allow_abort_jobs = True
@@ -19,6 +19,8 @@ async def send_task_ending_soon_notification(
     task_model_extended: TaskReadExtended,
     core: FluentRuntimeCore,
     bot: Bot,
+    check_time: bool = True,
+    raise_errors: bool = False,
 ):
     if task_model_extended.status != TaskStatus.IN_PROGRESS:
         logger.info(f"Unnecessary notification for task {task_model_extended.id} ")
@@ -34,17 +36,17 @@ async def send_task_ending_soon_notification(
         tzinfo=KYIV
     ) - datetime.timedelta(minutes=30)
 
-    if forecast_task_date.date() != datetime_now.date():
+    if check_time and forecast_task_date.date() != datetime_now.date():
         logger.info(
             f"Task {task_model_extended.id} end time is in the past, skipping notification."
         )
         return
-    if forecast_task_date.time().hour != datetime_now.hour:
+    if check_time and forecast_task_date.time().hour != datetime_now.hour:
         logger.info(
             f"Task {task_model_extended.id} end time is not in the current hour, skipping notification."
         )
         return
-    if forecast_task_date.time().minute != datetime_now.minute:
+    if check_time and forecast_task_date.time().minute != datetime_now.minute:
         logger.info(
             f"Task {task_model_extended.id} end time is not in the current minute, skipping notification."
         )
@@ -54,6 +56,7 @@ async def send_task_ending_soon_notification(
         task_model_extended.executor_id,
         message_text,
         reply_markup=create_end_task_kb(task_id=task_model_extended.id),
+        raise_errors=raise_errors,
     )
 
 
@@ -63,21 +66,23 @@ async def send_task_overdue_notification(
     locale: str,
     core: FluentRuntimeCore,
     bot: Bot,
+    check_time: bool = True,
+    raise_errors: bool = False,
 ):
     datetime_now = datetime.datetime.now(KYIV)
     forecast_task_date = task_model_extended.end_datetime.replace(tzinfo=KYIV)
 
-    if forecast_task_date.date() != datetime_now.date():
+    if check_time and forecast_task_date.date() != datetime_now.date():
         logger.info(
             f"Task {task_model_extended.id} end time is in the past, skipping notification."
         )
         return
-    if forecast_task_date.time().hour != datetime_now.hour:
+    if check_time and forecast_task_date.time().hour != datetime_now.hour:
         logger.info(
             f"Task {task_model_extended.id} end time is not in the current hour, skipping notification."
         )
         return
-    if forecast_task_date.time().minute != datetime_now.minute:
+    if check_time and forecast_task_date.time().minute != datetime_now.minute:
         logger.info(
             f"Task {task_model_extended.id} end time is not in the current minute, skipping notification."
         )
@@ -125,6 +130,7 @@ async def send_task_overdue_notification(
         user_id_mapper[notification_for],
         message_text,
         reply_markup=create_show_task_kb(task_id=task_model_extended.id),
+        raise_errors=raise_errors,
     )
 
 
@@ -132,21 +138,23 @@ async def send_task_started_notification(
     task_model_extended: TaskReadExtended,
     core: FluentRuntimeCore,
     bot: Bot,
+    check_time: bool = True,
+    raise_errors: bool = False,
 ):
     datetime_now = datetime.datetime.now(KYIV)
     forecast_job_date = task_model_extended.start_datetime.replace(tzinfo=KYIV)
 
-    if forecast_job_date.date() != datetime_now.date():
+    if check_time and forecast_job_date.date() != datetime_now.date():
         logger.info(
             f"Task {task_model_extended.id} end time is in the past, skipping notification."
         )
         return
-    if forecast_job_date.time().hour != datetime_now.hour:
+    if check_time and forecast_job_date.time().hour != datetime_now.hour:
         logger.info(
             f"Task {task_model_extended.id} end time is not in the current hour, skipping notification."
         )
         return
-    if forecast_job_date.time().minute != datetime_now.minute:
+    if check_time and forecast_job_date.time().minute != datetime_now.minute:
         logger.info(
             f"Task {task_model_extended.id} end time is not in the current minute, skipping notification."
         )
@@ -165,6 +173,7 @@ async def send_task_started_notification(
         task_model_extended.executor_id,
         message_text,
         reply_markup=create_show_task_kb(task_id=task_model_extended.id),
+        raise_errors=raise_errors,
     )
 
 